@@ -57,6 +57,7 @@ module core
             fetch_stage
             #(
                 .PC_WIDTH(32)
+                // todo: EARLY_BRANCH needs the hazard unit (stalls, forward selects) and the D_E handshake first
             )
             fetch_stage_i
             (
@@ -66,6 +67,7 @@ module core
 
                 // Control input signals
                     .PC_source_E(PC_source_E), // todo
+                    .PC_source_D(2'b00), // EARLY_BRANCH only
                     .enable_fetch(pc_ready_in),
                     .prediction_source_D(prediction_source_D), // todo
 
@@ -73,6 +75,7 @@ module core
                     .PC_plus_4_E(PC_plus_4_E), // todo
                     .ALU_result_E(ALU_result_E), // todo
                     .predicted_PC_D(predicted_PC_D), // todo
+                    .branch_target_D('0), // EARLY_BRANCH only
 
                 // Data output signals
                     .PC_F(PC_F),
@@ -146,6 +149,10 @@ module core
             // Control
                 logic [4:0] rf_write_addr_W;
                 logic rf_write_enable_W;
+                mux_forward_A_enum mux_forward_A_select_D;
+                mux_forward_B_enum mux_forward_B_select_D;
+                assign mux_forward_A_select_D = MUX_F_A_RS1_DATA_D; // todo: hazard unit
+                assign mux_forward_B_select_D = MUX_F_B_RS2_DATA_D; // todo: hazard unit
                 logic 
             // Data
                 logic 
@@ -166,17 +173,26 @@ module core
             // Control input signals
                 .rf_write_addr_W(rf_write_addr_W),
                 .rf_write_enable_W(rf_write_enable_W),
+                // Early branch forwarding
+                    .mux_forward_A_select_D(mux_forward_A_select_D),
+                    .mux_forward_B_select_D(mux_forward_B_select_D),
             // Data input signals
                 .instruction(pipe_FD_q.instruction),
                 // Regfile
                     .rf_write_data_W(),
                 // Prediction
-                    .PC_D(),
+                    .PC_D(pipe_FD_q.PC_F),
+                // Early branch forwarding
+                    .ALU_result_M(), // todo
+                    .ALU_result_W(), // todo
             // Control output signals
                 // Jumping
                     .jump_D(),
                     .i_jump_D(),
                     .branch_D(),
+                // Early branch
+                    .PC_source_D(),
+                    .fk_go_back_D(),
                 // Execute
                     .cond_code_D(),
                     .mux_ALU_operand_A_select_D(),
@@ -201,7 +217,9 @@ module core
                 // MUX_ALU_OPERAND_B_IMMEDIATE
                     .immediate_D(),
                 // Prediction
-                    .predicted_PC_addr_D()
+                    .predicted_PC_addr_D(),
+                // Early branch
+                    .branch_target_D()
         );
 
 
@@ -0,0 +1,53 @@
+# Bubble sort of 32 signed words from xorshift32, with early exit when a pass swaps nothing
+# Result: the sorted array
+
+    .equ N, 32
+    .equ SEED, 0x2545f491
+
+    .data
+result:
+    .space 128              # N words
+result_end:
+
+    .text
+    la   a0, result
+    li   a1, N
+    li   t0, SEED
+fill:
+    slli t1, t0, 13
+    xor  t0, t0, t1
+    srli t1, t0, 17
+    xor  t0, t0, t1
+    slli t1, t0, 5
+    xor  t0, t0, t1
+    sw   t0, 0(a0)
+    addi a0, a0, 4
+    addi a1, a1, -1
+    bnez a1, fill
+
+    li   s0, N - 1          # Pairs to compare in this pass
+pass:
+    la   a0, result
+    mv   a1, s0
+    li   s1, 0              # Swapped anything
+inner:
+    lw   t0, 0(a0)
+    lw   t1, 4(a0)
+    ble  t0, t1, next
+    sw   t1, 0(a0)
+    sw   t0, 4(a0)
+    li   s1, 1
+next:
+    addi a0, a0, 4
+    addi a1, a1, -1
+    bnez a1, inner
+    beqz s1, done
+    addi s0, s0, -1
+    bnez s0, pass
+
+done:
+    li   t0, TOHOST
+    li   t1, 1
+    sw   t1, 0(t0)
+halt:
+    j    halt
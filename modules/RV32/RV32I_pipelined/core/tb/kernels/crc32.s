@@ -0,0 +1,58 @@
+# Bitwise CRC-32 (IEEE, reflected, poly 0xedb88320) of 128 xorshift32 bytes
+# Result: the CRC
+
+    .equ LEN, 128
+    .equ SEED, 0xdeadbeef
+
+    .data
+data:
+    .space 128              # LEN bytes
+result:
+    .space 4
+result_end:
+
+    .text
+    la   a0, data
+    li   a1, 32             # LEN / 4 words
+    li   t0, SEED
+fill:
+    slli t1, t0, 13
+    xor  t0, t0, t1
+    srli t1, t0, 17
+    xor  t0, t0, t1
+    slli t1, t0, 5
+    xor  t0, t0, t1
+    sw   t0, 0(a0)
+    addi a0, a0, 4
+    addi a1, a1, -1
+    bnez a1, fill
+
+    la   a0, data
+    li   a1, LEN
+    li   a3, -1             # crc
+    li   a4, 0xedb88320
+byte:
+    lbu  t0, 0(a0)
+    xor  a3, a3, t0
+    li   t1, 8
+bit:
+    andi t2, a3, 1
+    srli a3, a3, 1
+    beqz t2, skip
+    xor  a3, a3, a4
+skip:
+    addi t1, t1, -1
+    bnez t1, bit
+    addi a0, a0, 1
+    addi a1, a1, -1
+    bnez a1, byte
+
+    not  a3, a3
+    la   t0, result
+    sw   a3, 0(t0)
+
+    li   t0, TOHOST
+    li   t1, 1
+    sw   t1, 0(t0)
+halt:
+    j    halt
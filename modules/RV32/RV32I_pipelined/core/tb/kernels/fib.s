@@ -0,0 +1,59 @@
+# Fibonacci: recursive fib(15) on the stack, then an iterative table of fib(0..31)
+# Result: fib(15) followed by the table
+
+    .equ N, 15
+    .equ TABLE, 32
+
+    .data
+result:
+    .space 4
+table:
+    .space 128              # TABLE words
+result_end:
+
+    .text
+    li   a0, N
+    call fib
+    la   t0, result
+    sw   a0, 0(t0)
+
+    la   a0, table
+    li   t0, 0
+    li   t1, 1
+    li   a1, TABLE
+iter:
+    sw   t0, 0(a0)
+    add  t2, t0, t1
+    mv   t0, t1
+    mv   t1, t2
+    addi a0, a0, 4
+    addi a1, a1, -1
+    bnez a1, iter
+
+    li   t0, TOHOST
+    li   t1, 1
+    sw   t1, 0(t0)
+halt:
+    j    halt
+
+# a0 = fib(a0), recursive
+fib:
+    li   t0, 2
+    blt  a0, t0, fib_base
+    addi sp, sp, -12
+    sw   ra, 0(sp)
+    sw   s0, 4(sp)
+    sw   s1, 8(sp)
+    mv   s0, a0
+    addi a0, s0, -1
+    call fib
+    mv   s1, a0
+    addi a0, s0, -2
+    call fib
+    add  a0, a0, s1
+    lw   ra, 0(sp)
+    lw   s0, 4(sp)
+    lw   s1, 8(sp)
+    addi sp, sp, 12
+fib_base:
+    ret
@@ -0,0 +1,129 @@
+# Branchy tokenizer: a state machine over 512 xorshift32 bytes folded into a small alphabet
+# (digits, letters, space, punctuation, control) counting tokens by kind
+# Result: numbers, words, punctuation, control bytes, longest word
+
+    .equ LEN, 512
+    .equ SEED, 0x31415926
+
+    .data
+text:
+    .space 512              # LEN bytes
+result:
+    .space 20
+result_end:
+
+    .text
+    la   a0, text
+    li   a1, 128            # LEN / 4 words
+    li   t0, SEED
+fill:
+    slli t1, t0, 13
+    xor  t0, t0, t1
+    srli t1, t0, 17
+    xor  t0, t0, t1
+    slli t1, t0, 5
+    xor  t0, t0, t1
+    sw   t0, 0(a0)
+    addi a0, a0, 4
+    addi a1, a1, -1
+    bnez a1, fill
+
+    # Fold each byte into 0x00..0x7f: bit 7 set means a space, so spaces are common
+    la   a0, text
+    li   a1, LEN
+    li   a2, 0x20
+fold:
+    lbu  t0, 0(a0)
+    andi t1, t0, 0x80
+    beqz t1, fold_keep
+    mv   t0, a2
+fold_keep:
+    sb   t0, 0(a0)
+    addi a0, a0, 1
+    addi a1, a1, -1
+    bnez a1, fold
+
+    # s0 state (0 idle, 1 number, 2 word); s1..s4 counts; s5 word length; s6 longest
+    li   s0, 0
+    li   s1, 0
+    li   s2, 0
+    li   s3, 0
+    li   s4, 0
+    li   s5, 0
+    li   s6, 0
+    la   a0, text
+    li   a1, LEN
+scan:
+    lbu  t0, 0(a0)
+    li   t1, 0x20           # Control: below space or DEL
+    blt  t0, t1, ctrl
+    li   t1, 0x7f
+    beq  t0, t1, ctrl
+    li   t1, 0x20
+    beq  t0, t1, space
+    li   t1, 0x30           # Digit
+    blt  t0, t1, punct
+    li   t1, 0x3a
+    blt  t0, t1, digit
+    li   t1, 0x41           # Upper case
+    blt  t0, t1, punct
+    li   t1, 0x5b
+    blt  t0, t1, letter
+    li   t1, 0x61           # Lower case
+    blt  t0, t1, punct
+    li   t1, 0x7b
+    blt  t0, t1, letter
+punct:
+    addi s3, s3, 1
+    j    end_token
+ctrl:
+    addi s4, s4, 1
+space:
+end_token:
+    li   t1, 2              # Leaving a word: track the longest
+    bne  s0, t1, to_idle
+    ble  s5, s6, to_idle
+    mv   s6, s5
+to_idle:
+    li   s0, 0
+    j    next
+digit:
+    bnez s0, digit_in       # Digits continue numbers and words
+    addi s1, s1, 1
+    li   s0, 1
+    j    next
+digit_in:
+    li   t1, 2
+    bne  s0, t1, next
+    addi s5, s5, 1
+    j    next
+letter:
+    li   t1, 2
+    beq  s0, t1, letter_in
+    addi s2, s2, 1          # Starts a word, also right after a number
+    li   s0, 2
+    li   s5, 0
+letter_in:
+    addi s5, s5, 1
+next:
+    addi a0, a0, 1
+    addi a1, a1, -1
+    bnez a1, scan
+
+    li   t1, 2              # Word running at the end
+    bne  s0, t1, store
+    ble  s5, s6, store
+    mv   s6, s5
+store:
+    la   t0, result
+    sw   s1, 0(t0)
+    sw   s2, 4(t0)
+    sw   s3, 8(t0)
+    sw   s4, 12(t0)
+    sw   s6, 16(t0)
+
+    li   t0, TOHOST
+    li   t1, 1
+    sw   t1, 0(t0)
+halt:
+    j    halt
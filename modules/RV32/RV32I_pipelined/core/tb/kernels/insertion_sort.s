@@ -0,0 +1,51 @@
+# Insertion sort of 64 signed words from xorshift32
+# Result: the sorted array
+
+    .equ N, 64
+    .equ SEED, 0x9e3779b9
+
+    .data
+result:
+    .space 256              # N words
+result_end:
+
+    .text
+    la   a0, result
+    li   a1, N
+    li   t0, SEED
+fill:
+    slli t1, t0, 13
+    xor  t0, t0, t1
+    srli t1, t0, 17
+    xor  t0, t0, t1
+    slli t1, t0, 5
+    xor  t0, t0, t1
+    sw   t0, 0(a0)
+    addi a0, a0, 4
+    addi a1, a1, -1
+    bnez a1, fill
+
+    la   s0, result         # Base
+    li   s1, 1              # i
+outer:
+    slli t0, s1, 2
+    add  a0, s0, t0         # &a[i]
+    lw   t2, 0(a0)          # key
+shift:
+    beq  a0, s0, place
+    lw   t1, -4(a0)
+    ble  t1, t2, place
+    sw   t1, 0(a0)
+    addi a0, a0, -4
+    j    shift
+place:
+    sw   t2, 0(a0)
+    addi s1, s1, 1
+    li   t0, N
+    blt  s1, t0, outer
+
+    li   t0, TOHOST
+    li   t1, 1
+    sw   t1, 0(t0)
+halt:
+    j    halt
@@ -0,0 +1,90 @@
+# 8x8 signed matrix multiply C = A * B with a shift-add multiply (RV32I has no mul)
+# A and B hold small signed xorshift32 values (-128..127)
+# Result: C, row major
+
+    .equ N, 8
+    .equ SEED, 0x0badc0de
+
+    .data
+a:
+    .space 256              # N * N words
+b:
+    .space 256
+result:
+    .space 256
+result_end:
+
+    .text
+    la   a0, a
+    li   a1, 128            # A and B are contiguous
+    li   t0, SEED
+fill:
+    slli t1, t0, 13
+    xor  t0, t0, t1
+    srli t1, t0, 17
+    xor  t0, t0, t1
+    slli t1, t0, 5
+    xor  t0, t0, t1
+    slli t2, t0, 24         # Low byte, sign-extended
+    srai t2, t2, 24
+    sw   t2, 0(a0)
+    addi a0, a0, 4
+    addi a1, a1, -1
+    bnez a1, fill
+
+    la   s5, result
+    li   s0, 0              # i
+row:
+    li   s1, 0              # j
+col:
+    li   s3, 0              # Sum
+    li   s2, 0              # k
+dot:
+    slli t0, s0, 3          # A[i][k]
+    add  t0, t0, s2
+    slli t0, t0, 2
+    la   t1, a
+    add  t0, t0, t1
+    lw   a0, 0(t0)
+    slli t0, s2, 3          # B[k][j]
+    add  t0, t0, s1
+    slli t0, t0, 2
+    la   t1, b
+    add  t0, t0, t1
+    lw   a1, 0(t0)
+    call mul
+    add  s3, s3, a0
+    addi s2, s2, 1
+    li   t0, N
+    blt  s2, t0, dot
+    sw   s3, 0(s5)
+    addi s5, s5, 4
+    addi s1, s1, 1
+    li   t0, N
+    blt  s1, t0, col
+    addi s0, s0, 1
+    blt  s0, t0, row
+
+    li   t0, TOHOST
+    li   t1, 1
+    sw   t1, 0(t0)
+halt:
+    j    halt
+
+# a0 = a0 * a1 (low 32 bits), clobbers t0-t2
+mul:
+    li   t0, 0
+    mv   t1, a0
+    mv   t2, a1
+mul_loop:
+    beqz t2, mul_done
+    andi a0, t2, 1
+    beqz a0, mul_skip
+    add  t0, t0, t1
+mul_skip:
+    slli t1, t1, 1
+    srli t2, t2, 1
+    j    mul_loop
+mul_done:
+    mv   a0, t0
+    ret
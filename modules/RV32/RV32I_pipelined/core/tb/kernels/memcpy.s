@@ -0,0 +1,44 @@
+# memcpy: 256 bytes copied byte by byte from a xorshift32-filled source
+# Result: the destination buffer
+
+    .equ SEED, 0x12345678
+
+    .data
+src:
+    .space 256
+result:
+    .space 256
+result_end:
+
+    .text
+    la   a0, src
+    li   a1, 64
+    li   t0, SEED
+fill:
+    slli t1, t0, 13         # xorshift32
+    xor  t0, t0, t1
+    srli t1, t0, 17
+    xor  t0, t0, t1
+    slli t1, t0, 5
+    xor  t0, t0, t1
+    sw   t0, 0(a0)
+    addi a0, a0, 4
+    addi a1, a1, -1
+    bnez a1, fill
+
+    la   a0, src
+    la   a1, result
+    li   a2, 256
+copy:
+    lbu  t0, 0(a0)
+    sb   t0, 0(a1)
+    addi a0, a0, 1
+    addi a1, a1, 1
+    addi a2, a2, -1
+    bnez a2, copy
+
+    li   t0, TOHOST
+    li   t1, 1
+    sw   t1, 0(t0)
+halt:
+    j    halt
@@ -0,0 +1,25 @@
+# memset: 256 bytes with byte stores, unrolled 4x
+# Result: the buffer, every byte 0x5a
+
+    .data
+result:
+    .space 256
+result_end:
+
+    .text
+    la   a0, result
+    li   a1, 0x5a
+    addi a3, a0, 256
+loop:
+    sb   a1, 0(a0)
+    sb   a1, 1(a0)
+    sb   a1, 2(a0)
+    sb   a1, 3(a0)
+    addi a0, a0, 4
+    bne  a0, a3, loop
+
+    li   t0, TOHOST
+    li   t1, 1
+    sw   t1, 0(t0)
+halt:
+    j    halt
@@ -0,0 +1,36 @@
+import cocotb
+from cocotb.clock import Clock
+
+import os
+import random
+SEED = int(os.environ.get("COCOTB_RANDOM_SEED", 666))
+random.seed(SEED)
+
+from pathlib import Path
+from svtb.kernels import REPORT_ENV, names, run_kernel, write_report
+from svtb.timing import kernel_trace, simulate
+DMEM_TIMING = dict(accept_cycles=1, read_latency=1) # Single-cycle SRAM: CPI is the pipeline's alone
+REPORT = Path(os.environ.get(REPORT_ENV, "bench/kernels.json"))
+RESULTS = {} # kernel -> result, this run only
+
+
+# --- Helpers ---
+def record(dut, name, result): # Add a kernel's result to the run's report
+    RESULTS[name] = result
+    params = {p: int(getattr(dut, p).value) for p in ("PC_WIDTH", "DATA_WIDTH")}
+    write_report(REPORT, RESULTS, params, DMEM_TIMING)
+
+
+# --- Tests ---
+@cocotb.test()
+@cocotb.parametrize(kernel=names())
+async def test_kernel(dut, kernel): # Run a kernel image to its TOHOST store, check its result region, report CPI
+    cocotb.start_soon(Clock(dut.clk, 2, unit="ns").start())
+    result = await run_kernel(dut, kernel, DMEM_TIMING)
+    result["model_cycles"] = simulate(kernel_trace(kernel), DMEM_TIMING)["cycles"] # svtb.timing on the same kernel
+    dut._log.info(
+        f"{kernel}: {result['cycles']} cycles, {result['instret']} instret, CPI {result['cpi']:.3f}, "
+        f"{result['ips']:.0f} instr/s, timing model {result['model_cycles']} cycles "
+        f"({100 * (result['model_cycles'] - result['cycles']) / result['cycles']:+.1f}%)"
+    )
+    record(dut, kernel, result)
@@ -0,0 +1,66 @@
+module regfile_bypass
+#(
+    parameter int unsigned DATA_WIDTH = 32,
+    parameter int unsigned ADDR_WIDTH = 5,
+    parameter int unsigned READ_PORTS = 2,
+    parameter bit RESET_STORAGE = 1 // 0: registers power up undefined, no reset tree on the storage
+)
+(
+    // Secuential input signals
+    input logic clk,
+    input logic async_rst_n,
+
+    // Write ports
+    input logic write_enable,
+    input logic [ADDR_WIDTH-1:0] write_addr,
+    input logic [DATA_WIDTH-1:0] write_data,
+
+    // Read ports
+    input logic [READ_PORTS-1:0][ADDR_WIDTH-1:0] read_addr,
+    output logic [READ_PORTS-1:0][DATA_WIDTH-1:0] read_data
+);
+
+localparam int unsigned POSSIBLE_REG_COUNT = 2**ADDR_WIDTH;
+localparam int unsigned REAL_REG_COUNT = POSSIBLE_REG_COUNT - 1; // Register x0 is hardwired to 0
+
+logic [REAL_REG_COUNT-1:0][DATA_WIDTH-1:0] rf;
+logic write_valid;
+assign write_valid = write_enable && (write_addr != '0);
+
+// Full cycle for the write path: registers update on posedge, the bypass below makes the
+// value visible to readers in the cycle it is written, as the negedge regfile did
+generate
+    if (RESET_STORAGE) begin : g_reset_storage
+        always_ff @(posedge clk or negedge async_rst_n) begin
+            if (!async_rst_n) begin
+                for (int i = 0; i < REAL_REG_COUNT; i++) begin
+                    rf[i] <= '0;
+                end
+            end
+            else if (write_valid) begin
+                rf[write_addr - 1] <= write_data;
+            end
+        end
+    end
+    else begin : g_resetless_storage
+        always_ff @(posedge clk) begin
+            if (write_valid) begin
+                rf[write_addr - 1] <= write_data;
+            end
+        end
+    end
+endgenerate
+
+// Write-first read ports
+always_comb begin
+    for (int p = 0; p < READ_PORTS; p++) begin
+        if (read_addr[p] == '0)
+            read_data[p] = '0;
+        else if (write_valid && write_addr == read_addr[p])
+            read_data[p] = write_data;
+        else
+            read_data[p] = rf[read_addr[p] - 1];
+    end
+end
+
+endmodule
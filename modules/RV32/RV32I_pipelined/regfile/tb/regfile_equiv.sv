@@ -0,0 +1,67 @@
+// Equivalence wrapper: regfile_bypass next to the negedge regfile, same writes, same read
+// addresses. The reference has two read ports, so one copy is instantiated per port pair.
+module regfile_equiv
+#(
+    parameter int unsigned DATA_WIDTH = 32,
+    parameter int unsigned ADDR_WIDTH = 5,
+    parameter int unsigned READ_PORTS = 2,
+    parameter bit RESET_STORAGE = 1
+)
+(
+    input logic clk,
+    input logic async_rst_n,
+
+    input logic write_enable,
+    input logic [ADDR_WIDTH-1:0] write_addr,
+    input logic [DATA_WIDTH-1:0] write_data,
+
+    input logic [READ_PORTS-1:0][ADDR_WIDTH-1:0] read_addr,
+    output logic [READ_PORTS-1:0][DATA_WIDTH-1:0] ref_data, // regfile
+    output logic [READ_PORTS-1:0][DATA_WIDTH-1:0] dut_data  // regfile_bypass
+);
+    localparam int unsigned REF_COUNT = (READ_PORTS + 1) / 2;
+
+    regfile_bypass
+    #(
+        .DATA_WIDTH(DATA_WIDTH),
+        .ADDR_WIDTH(ADDR_WIDTH),
+        .READ_PORTS(READ_PORTS),
+        .RESET_STORAGE(RESET_STORAGE)
+    )
+    dut_i
+    (
+        .clk(clk),
+        .async_rst_n(async_rst_n),
+        .write_enable(write_enable),
+        .write_addr(write_addr),
+        .write_data(write_data),
+        .read_addr(read_addr),
+        .read_data(dut_data)
+    );
+
+    for (genvar g = 0; g < REF_COUNT; g++) begin : g_ref
+        logic [DATA_WIDTH-1:0] rs2_data;
+
+        regfile
+        #(
+            .DATA_WIDTH(DATA_WIDTH),
+            .ADDR_WIDTH(ADDR_WIDTH)
+        )
+        ref_i
+        (
+            .clk(clk),
+            .async_rst_n(async_rst_n),
+            .write_enable(write_enable),
+            .write_addr(write_addr),
+            .write_data(write_data),
+            .rs1_addr(read_addr[2*g]),
+            .rs2_addr(read_addr[2*g + 1 < READ_PORTS ? 2*g + 1 : 2*g]),
+            .rs1_data(ref_data[2*g]),
+            .rs2_data(rs2_data)
+        );
+
+        if (2*g + 1 < READ_PORTS) begin : g_rs2
+            assign ref_data[2*g + 1] = rs2_data;
+        end
+    end
+endmodule
@@ -0,0 +1,107 @@
+import cocotb
+from cocotb.clock import Clock
+from cocotb.triggers import FallingEdge, ReadOnly, RisingEdge, Timer
+
+import os
+import random
+SEED = int(os.environ.get("COCOTB_RANDOM_SEED", 666))
+random.seed(SEED)
+CYCLES = 2000
+
+import pytest
+
+
+# --- Helpers ---
+def ports(dut):
+    return int(dut.READ_PORTS.value)
+
+def unpack(value, count, width): # Packed array -> list, element 0 first
+    return [(value >> (width * i)) & ((1 << width) - 1) for i in range(count)]
+
+def pack(values, width):
+    return sum(v << (width * i) for i, v in enumerate(values))
+
+async def reset(dut): # Asynchronous reset with every input idle
+    dut.async_rst_n.value = 0
+    dut.write_enable.value = 0
+    dut.write_addr.value = 0
+    dut.write_data.value = 0
+    dut.read_addr.value = 0
+    await RisingEdge(dut.clk)
+    dut.async_rst_n.value = 1
+
+async def fill(dut): # Write every register once: reset-less storage starts undefined
+    for r in range(1, 32):
+        await RisingEdge(dut.clk)
+        dut.write_enable.value = 1
+        dut.write_addr.value = r
+        dut.write_data.value = random.getrandbits(32)
+    await RisingEdge(dut.clk)
+    dut.write_enable.value = 0
+
+async def check_cycle(dut, write_enable, write_addr, write_data, read_addrs): # Drive one cycle, compare at its end
+    await RisingEdge(dut.clk)
+    dut.write_enable.value = write_enable
+    dut.write_addr.value = write_addr
+    dut.write_data.value = write_data
+    dut.read_addr.value = pack(read_addrs, 5)
+    await FallingEdge(dut.clk) # The reference writes here, the second half of the cycle is what decode samples
+    await ReadOnly()
+    ref = unpack(int(dut.ref_data.value), len(read_addrs), 32)
+    got = unpack(int(dut.dut_data.value), len(read_addrs), 32)
+    for p, addr in enumerate(read_addrs):
+        assert got[p] == ref[p], (
+            f"port {p} x{addr} (write x{write_addr}={write_data:#010x} en {write_enable}): {got[p]:#010x} != {ref[p]:#010x}"
+        )
+
+
+# --- Tests ---
+@cocotb.test()
+async def test_random_equivalence(dut): # Random writes and reads, reads often hitting the register being written
+    cocotb.start_soon(Clock(dut.clk, 2, unit="ns").start())
+    await reset(dut)
+    if not int(dut.RESET_STORAGE.value):
+        await fill(dut)
+    for _ in range(CYCLES):
+        write_addr = random.choice([0, random.randrange(32)])
+        reads = [write_addr if random.random() < 0.3 else random.randrange(32) for _ in range(ports(dut))]
+        await check_cycle(dut, random.random() < 0.6, write_addr, random.getrandbits(32), reads)
+
+
+@cocotb.test()
+async def test_write_first_bypass(dut): # The written value is readable before the clock edge that stores it
+    cocotb.start_soon(Clock(dut.clk, 2, unit="ns").start())
+    await reset(dut)
+    for r in range(1, 32):
+        value = random.getrandbits(32)
+        await RisingEdge(dut.clk)
+        dut.write_enable.value = 1
+        dut.write_addr.value = r
+        dut.write_data.value = value
+        dut.read_addr.value = pack([r] * ports(dut), 5)
+        await Timer(1, "ps") # First half of the cycle: nothing stored yet
+        assert unpack(int(dut.dut_data.value), ports(dut), 32) == [value] * ports(dut), f"x{r} not bypassed"
+    await RisingEdge(dut.clk)
+    dut.write_enable.value = 0
+
+
+@cocotb.test()
+async def test_x0_hardwired(dut): # Writes to x0 are dropped and never bypassed
+    cocotb.start_soon(Clock(dut.clk, 2, unit="ns").start())
+    await reset(dut)
+    for _ in range(8):
+        await check_cycle(dut, 1, 0, random.getrandbits(32) | 1, [0] * ports(dut))
+        assert unpack(int(dut.dut_data.value), ports(dut), 32) == [0] * ports(dut)
+
+
+@cocotb.test()
+async def test_reset_clears(dut): # With reset storage every register reads 0 after reset, as in regfile
+    cocotb.start_soon(Clock(dut.clk, 2, unit="ns").start())
+    if not int(dut.RESET_STORAGE.value): # sim_reset_less/ build
+        pytest.skip("RESET_STORAGE=0: registers are undefined after reset")
+    await reset(dut)
+    await fill(dut)
+    await reset(dut)
+    for r in range(0, 32, ports(dut)):
+        await check_cycle(dut, 0, 0, 0, [(r + p) % 32 for p in range(ports(dut))])
+        assert unpack(int(dut.dut_data.value), ports(dut), 32) == [0] * ports(dut)
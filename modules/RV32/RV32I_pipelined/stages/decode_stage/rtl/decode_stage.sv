@@ -1,6 +1,7 @@
 module decode_stage
 #(
-    parameter DATA_WIDTH = 32
+    parameter DATA_WIDTH = 32,
+    parameter bit EARLY_BRANCH = 0 // Resolve branches and jumps here instead of in execute_stage
 )
 (
     // --- Secuential input signals ---
@@ -10,6 +11,9 @@ module decode_stage
     // --- Control input signals ---
     input logic [4:0] rf_write_addr_W,
     input logic rf_write_enable_W,
+    // Early branch forwarding (EARLY_BRANCH)
+    input rv32i_types_pkg::mux_forward_A_enum mux_forward_A_select_D,
+    input rv32i_types_pkg::mux_forward_B_enum mux_forward_B_select_D,
 
     // --- Data input signals ---
     input logic [DATA_WIDTH-1:0] instruction,
@@ -17,6 +21,9 @@ module decode_stage
     input logic [DATA_WIDTH-1:0] rf_write_data_W,
     // Prediction
     input logic [DATA_WIDTH-1:0] PC_D,
+    // Early branch forwarding (EARLY_BRANCH)
+    input logic [DATA_WIDTH-1:0] ALU_result_M,
+    input logic [DATA_WIDTH-1:0] ALU_result_W,
 
 
     // --- Control output signals ---
@@ -24,6 +31,9 @@ module decode_stage
     output logic jump_D,
     output logic i_jump_D,
     output logic branch_D,
+        // [Early branch] (EARLY_BRANCH, 0 otherwise)
+    output logic [1:0] PC_source_D,
+    output logic fk_go_back_D,
         // [EXECUTE]
     output rv32i_types_pkg::cond_code_enum cond_code_D,
     output rv32i_types_pkg::mux_ALU_operand_A_enum mux_ALU_operand_A_select_D,
@@ -48,7 +58,9 @@ module decode_stage
         // MUX_ALU_OPERAND_B_IMMEDIATE
     output logic [DATA_WIDTH-1:0]    immediate_D,
         // Prediction
-    output logic [DATA_WIDTH-1:0]    predicted_PC_addr_D
+    output logic [DATA_WIDTH-1:0]    predicted_PC_addr_D,
+        // Early branch
+    output logic [DATA_WIDTH-1:0]    branch_target_D
 );
     import rv32i_types_pkg::*;
 
@@ -77,6 +89,14 @@ module decode_stage
                 0 -> Jump
                 1 -> No jump
 
+    [Early branch control signals] (EARLY_BRANCH, execute_stage then never redirects)
+        PC_source_D : Selects the next PC of a fetch_stage built with EARLY_BRANCH, in place of PC_source_E;
+                      channel 2 of its mux_PC_source is then branch_target_D and its predictor is off
+            00 -> No redirect
+            10 -> Taken branch, JAL or JALR: fetch branch_target_D
+
+        fk_go_back_D : Flushes the F_D pipe, the instruction fetched behind a taken transfer
+
     [Execute control signals]
         operands muxes:
             PC_to_ALU : Selects between rs1_data from rf or PC to set ALU input A
@@ -459,4 +479,55 @@ module decode_stage
     // Predicted PC address
     assign predicted_PC_addr_D = PC_D + immediate_D;
 
+    // Early branch forward mux A
+    logic [DATA_WIDTH-1:0] mux_forward_A_out_D;
+    always_comb begin
+        unique case (mux_forward_A_select_D)
+            MUX_F_A_RS1_DATA_D:     mux_forward_A_out_D = rs1_data_D;
+            MUX_F_A_ALU_RESULT_M:   mux_forward_A_out_D = ALU_result_M;
+            MUX_F_A_ALU_RESULT_W:   mux_forward_A_out_D = ALU_result_W;
+            MUX_F_A_NONE:           mux_forward_A_out_D = '0;
+            default:                mux_forward_A_out_D = '0;
+        endcase
+    end
+
+    // Early branch forward mux B
+    logic [DATA_WIDTH-1:0] mux_forward_B_out_D;
+    always_comb begin
+        unique case (mux_forward_B_select_D)
+            MUX_F_B_RS2_DATA_D:     mux_forward_B_out_D = rs2_data_D;
+            MUX_F_B_ALU_RESULT_M:   mux_forward_B_out_D = ALU_result_M;
+            MUX_F_B_ALU_RESULT_W:   mux_forward_B_out_D = ALU_result_W;
+            MUX_F_B_NONE:           mux_forward_B_out_D = '0;
+            default:                mux_forward_B_out_D = '0;
+        endcase
+    end
+
+    // Early branch comparison unit
+    logic cmp_taken_D;
+    always_comb begin
+        cmp_taken_D = 1'b0;
+        unique case (cond_code_D)
+            COND_EQUALS:                    cmp_taken_D = mux_forward_A_out_D == mux_forward_B_out_D;
+            COND_NOT_EQUALS:                cmp_taken_D = mux_forward_A_out_D != mux_forward_B_out_D;
+            COND_LOWER:                     cmp_taken_D = $signed(mux_forward_A_out_D) < $signed(mux_forward_B_out_D);
+            COND_GREATER_OR_EQUAL:          cmp_taken_D = $signed(mux_forward_A_out_D) >= $signed(mux_forward_B_out_D);
+            COND_LOWER_UNSIGNED:            cmp_taken_D = $unsigned(mux_forward_A_out_D) < $unsigned(mux_forward_B_out_D);
+            COND_GREATER_OR_EQUAL_UNSIGNED: cmp_taken_D = $unsigned(mux_forward_A_out_D) >= $unsigned(mux_forward_B_out_D);
+            COND_NONE:                      cmp_taken_D = 1'b0;
+            default:                        cmp_taken_D = 1'b0;
+        endcase
+    end
+
+    // Early branch target: rs1 + imm with bit 0 cleared for JALR, PC + imm for branches and JAL
+    logic [DATA_WIDTH-1:0] jalr_target_D;
+    assign jalr_target_D = mux_forward_A_out_D + immediate_D;
+    assign branch_target_D = i_jump_D ? {jalr_target_D[DATA_WIDTH-1:1], 1'b0} : predicted_PC_addr_D;
+
+    always_comb begin
+        PC_source_D = 2'b00;
+        if (EARLY_BRANCH && (jump_D || i_jump_D || (branch_D && cmp_taken_D))) PC_source_D = 2'b10;
+    end
+    assign fk_go_back_D = PC_source_D != 2'b00;
+
 endmodule
\ No newline at end of file
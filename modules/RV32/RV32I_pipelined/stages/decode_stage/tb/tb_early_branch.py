@@ -0,0 +1,100 @@
+import cocotb
+from cocotb.clock import Clock
+from cocotb.triggers import FallingEdge, RisingEdge, Timer
+
+import os
+import random
+SEED = int(os.environ.get("COCOTB_RANDOM_SEED", 666))
+random.seed(SEED)
+
+from pathlib import Path
+from svtb import rv32i
+from svtb.fuzz import steps
+from svtb.kernels import initial_memory, load, write_report
+from svtb.timing import kernel_trace, simulate
+KERNELS = ["bubble_sort", "insertion_sort", "crc32", "fsm", "fib"]
+RESOLUTION = { # svtb.timing pipelines compared by the benchmark: its CPI is model output, not measured in RTL
+    "execute": dict(predictor="taken", resolve_stage="E"), # PC_source_E after a taken prediction through mux_predictor
+    "decode": dict(predictor="not_taken", resolve_stage="D"), # EARLY_BRANCH: PC_source_D into reg_PC
+}
+REPORT = Path(os.environ.get("EARLY_BRANCH_REPORT_OUT", "bench/early_branch.json"))
+RESULTS = {} # kernel -> result, this run only
+
+
+# --- Helpers ---
+def clear_inputs(dut): # Regfile out of reset and not written
+    dut.async_rst_n.value = 1
+    dut.rf_write_enable_W.value = 0
+    dut.rf_write_addr_W.value = 0
+    dut.rf_write_data_W.value = 0
+    dut.PC_D.value = 0
+
+async def write_register(dut, rd, value): # The regfile writes on the falling edge
+    await RisingEdge(dut.clk)
+    dut.rf_write_enable_W.value = int(rd != 0)
+    dut.rf_write_addr_W.value = rd
+    dut.rf_write_data_W.value = value
+    await FallingEdge(dut.clk)
+    dut.rf_write_enable_W.value = 0
+
+async def drive_operands(dut, step): # rs1/rs2 values of an ISS step, each from the regfile or a random forwarding source
+    sources = {}
+    for port, rs, value in (("A", rv32i.rs1(step["instr"]), step["a"]), ("B", rv32i.rs2(step["instr"]), step["b"])):
+        source = random.choice(["RS", "ALU_RESULT_M", "ALU_RESULT_W"])
+        if source in sources and sources[source] != value: # That forwarding port already carries the other operand
+            source = "RS"
+        if source == "RS" and rs:
+            await write_register(dut, rs, value)
+        sources.setdefault(source, value)
+        data = "RS1_DATA_D" if port == "A" else "RS2_DATA_D"
+        getattr(dut, f"mux_forward_{port}_select_D").value = rv32i.ENUMS[f"mux_forward_{port}_enum"][f"MUX_F_{port}_{data if source == 'RS' else source}"]
+    dut.ALU_result_M.value = sources.get("ALU_RESULT_M", random.getrandbits(32))
+    dut.ALU_result_W.value = sources.get("ALU_RESULT_W", random.getrandbits(32))
+
+def record(dut, name, result): # Add a kernel's result to the run's report
+    RESULTS[name] = result
+    write_report(REPORT, RESULTS, {"EARLY_BRANCH": int(dut.EARLY_BRANCH.value)}, cpi_source="svtb.timing model", resolution=RESOLUTION)
+
+
+# --- Tests ---
+@cocotb.test()
+@cocotb.parametrize(kernel=KERNELS)
+async def test_early_branch_kernel(dut, kernel): # Resolve a kernel's branches and jumps in decode against the ISS, report modelled CPI of both resolution stages
+    # Run by the sim_early_branch/ build (COMPILE_ARGS += -Pdecode_stage.EARLY_BRANCH=1, part of the regression):
+    # every control instruction must redirect exactly when the ISS takes it; without EARLY_BRANCH PC_source_D stays 0
+    clear_inputs(dut)
+    cocotb.start_soon(Clock(dut.clk, 2, unit="ns").start())
+    early = int(dut.EARLY_BRANCH.value)
+    words, expected = load(kernel)
+
+    controls = taken = 0
+    for step in steps(words, expected["instret"], initial_memory(expected)):
+        if step["class"] not in ("branch", "jal", "jalr"):
+            continue
+        dut.instruction.value = step["instr"]
+        dut.PC_D.value = step["pc"]
+        await drive_operands(dut, step)
+        await Timer(1, "ps")
+        decoded = rv32i.decode_reference(step["instr"])
+        pc_source = rv32i.PC_source_D_reference(decoded["jump"], decoded["i_jump"], decoded["branch"], decoded["cond_code"], step["a"], step["b"], early)
+        where = f"{kernel} pc {step['pc']:#x} ({step['instr']:#010x})"
+        assert int(dut.PC_source_D.value) == pc_source, f"{where}: PC_source_D"
+        assert int(dut.fk_go_back_D.value) == int(pc_source != 0b00), f"{where}: fk_go_back_D"
+        if early:
+            assert bool(pc_source) == step["taken"], f"{where}: redirect {pc_source:#04b}, ISS taken {step['taken']}"
+        if step["taken"]:
+            assert int(dut.branch_target_D.value) == step["next_pc"], f"{where}: branch_target_D {int(dut.branch_target_D.value):#010x}, ISS {step['next_pc']:#010x}"
+        controls += 1
+        taken += step["taken"]
+
+    trace = kernel_trace(kernel)
+    result = {"instret": len(trace), "controls": controls, "taken": taken, "checked_in_rtl": bool(early)}
+    for name, params in RESOLUTION.items():
+        model = simulate(trace, params)
+        result[name] = {"cycles": model["cycles"], "cpi": model["cpi"], "stalls": model["stalls"]}
+    change = 100 * (result["decode"]["cpi"] - result["execute"]["cpi"]) / result["execute"]["cpi"]
+    dut._log.info(
+        f"{kernel}: {controls} control instructions ({taken} taken), svtb.timing model CPI: "
+        f"execute {result['execute']['cpi']:.3f}, decode {result['decode']['cpi']:.3f} ({change:+.1f}%)"
+    )
+    record(dut, kernel, result)
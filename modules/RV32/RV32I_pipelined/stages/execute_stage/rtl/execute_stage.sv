@@ -1,6 +1,7 @@
 module execute_stage
 #(
-    parameter DATA_WIDTH = 32
+    parameter DATA_WIDTH = 32,
+    parameter bit EARLY_BRANCH = 0 // decode_stage resolves branches and jumps: no redirect from here
 )
 (
     // Inputs
@@ -99,11 +100,11 @@ module execute_stage
                     cmp_taken = 1'b1;
             end
             COND_LOWER: begin
-                if (mux_forward_A_out_E < mux_forward_B_out_E)
+                if ($signed(mux_forward_A_out_E) < $signed(mux_forward_B_out_E))
                     cmp_taken = 1'b1;
             end
             COND_GREATER_OR_EQUAL: begin
-                if (mux_forward_A_out_E >= mux_forward_B_out_E)
+                if ($signed(mux_forward_A_out_E) >= $signed(mux_forward_B_out_E))
                     cmp_taken = 1'b1;
             end
             COND_LOWER_UNSIGNED: begin
@@ -123,10 +124,11 @@ module execute_stage
 
     always_comb begin
         PC_source_E = 2'b00;
-        if (jump_E || i_jump_E)             PC_source_E = 2'b10;
+        if (EARLY_BRANCH)                   PC_source_E = 2'b00; // Resolved in decode_stage
+        else if (jump_E || i_jump_E)        PC_source_E = 2'b10;
         else if (branch_E && !cmp_taken)    PC_source_E = 2'b01; // Do branch
     end
-    assign fk_go_back_E = PC_source_E == 2'b00; // Resets F_D and D_E pipes
+    assign fk_go_back_E = !EARLY_BRANCH && PC_source_E == 2'b00; // Resets F_D and D_E pipes
 
     ALU
     #(
@@ -0,0 +1,172 @@
+import cocotb
+from cocotb.triggers import Timer
+
+import os
+import random
+SEED = int(os.environ.get("COCOTB_RANDOM_SEED", 666))
+random.seed(SEED)
+ITERATIONS = 32
+
+from pathlib import Path
+import pytest
+from svtb import rv32i
+from svtb.fuzz import CAMPAIGN_ENV, load_corpus, steps
+from svtb.golden import golden, golden_path
+from svtb.stimulus import CoverageDirected, execute_space
+TB_DIR = Path(__file__).parent
+EXECUTE_INPUTS = ["ALU_op_E", "cond_code_E", "branch_E", "rs1_data_E", "rs2_data_E"]
+EXECUTE_OUTPUTS = ["ALU_result_E", "mux_forward_B_out_E", "PC_source_E", "fk_go_back_E"]
+
+
+# --- Helpers ---
+def early_branch(dut): # EARLY_BRANCH build (sim_early_branch/): decode_stage redirects, this stage never does
+    return int(dut.EARLY_BRANCH.value)
+
+def clear_inputs(dut): # Operands straight from the regfile, no jumps
+    dut.jump_E.value = 0
+    dut.i_jump_E.value = 0
+    dut.branch_E.value = 0
+    dut.ALU_op_E.value = rv32i.ALU_OPS["ALU_ADD"]
+    dut.cond_code_E.value = rv32i.COND_CODES["COND_NONE"]
+    dut.mux_forward_A_select_E.value = rv32i.ENUMS["mux_forward_A_enum"]["MUX_F_A_RS1_DATA_D"]
+    dut.mux_forward_B_select_E.value = rv32i.ENUMS["mux_forward_B_enum"]["MUX_F_B_RS2_DATA_D"]
+    dut.mux_ALU_operand_A_select_E.value = rv32i.ENUMS["mux_ALU_operand_A_enum"]["MUX_ALU_OPERAND_A_RS1"]
+    dut.mux_ALU_operand_B_select_E.value = rv32i.ENUMS["mux_ALU_operand_B_enum"]["MUX_ALU_OPERAND_B_RS2"]
+    dut.rs1_data_E.value = 0
+    dut.rs2_data_E.value = 0
+    dut.ALU_result_M.value = 0
+    dut.ALU_result_W.value = 0
+    dut.PC_E.value = 0
+    dut.immediate_E.value = 0
+
+async def apply_and_check(dut, alu_op, cond_code, a, b): # Drive one operation and compare against the reference
+    branch = int(cond_code != rv32i.COND_CODES["COND_NONE"])
+    dut.ALU_op_E.value = alu_op
+    dut.cond_code_E.value = cond_code
+    dut.branch_E.value = branch
+    dut.rs1_data_E.value = a
+    dut.rs2_data_E.value = b
+    await Timer(1, "ps")
+
+    assert int(dut.ALU_result_E.value) == rv32i.alu_reference(alu_op, a, b)
+    assert int(dut.mux_forward_B_out_E.value) == b
+    early = early_branch(dut)
+    pc_source = rv32i.PC_source_reference(0, 0, branch, cond_code, a, b, early)
+    assert int(dut.PC_source_E.value) == pc_source
+    assert int(dut.fk_go_back_E.value) == int(pc_source == 0b00 and not early)
+
+async def apply_step(dut, step): # Drive one ISS-retired instruction with its decoded controls and operands, check against the ISS
+    decoded = rv32i.decode_reference(step["instr"])
+    for name in ("jump", "i_jump", "branch", "ALU_op", "cond_code", "mux_ALU_operand_A_select", "mux_ALU_operand_B_select", "immediate"):
+        getattr(dut, f"{name}_E").value = decoded[name]
+    dut.rs1_data_E.value = step["a"]
+    dut.rs2_data_E.value = step["b"]
+    dut.PC_E.value = step["pc"]
+    await Timer(1, "ps")
+
+    where = f"pc {step['pc']:#x} ({step['instr']:#010x})"
+    result = int(dut.ALU_result_E.value)
+    if step["class"] == "alu" and step["value"] is not None:
+        assert result == step["value"], f"{where}: ALU_result_E {result:#010x}, ISS {step['value']:#010x}"
+    elif step["class"] in ("load", "store"):
+        assert result == step["addr"], f"{where}: address {result:#010x}, ISS {step['addr']:#010x}"
+    elif step["class"] in ("jal", "jalr") or (step["class"] == "branch" and step["taken"]):
+        assert result & ~1 == step["next_pc"], f"{where}: target {result:#010x}, ISS {step['next_pc']:#010x}"
+    if step["class"] == "branch":
+        assert rv32i.compare_reference(decoded["cond_code"], step["a"], step["b"]) == step["taken"]
+    pc_source = rv32i.PC_source_reference(decoded["jump"], decoded["i_jump"], decoded["branch"], decoded["cond_code"], step["a"], step["b"], early_branch(dut))
+    assert int(dut.PC_source_E.value) == pc_source, f"{where}: PC_source_E"
+    assert int(dut.mux_forward_B_out_E.value) == step["b"], f"{where}: mux_forward_B_out_E"
+
+
+# --- Tests ---
+@cocotb.test()
+async def test_alu_random(dut): # Every ALU operation on random operands
+    clear_inputs(dut)
+
+    for alu_op in rv32i.ALU_OPS.values():
+        for _ in range(ITERATIONS):
+            a = random.getrandbits(32)
+            b = random.getrandbits(32)
+            await apply_and_check(dut, alu_op, rv32i.COND_CODES["COND_NONE"], a, b)
+
+
+@cocotb.test()
+async def test_jump_selects_ALU_result(dut): # Jumps always redirect to the ALU result (never with EARLY_BRANCH)
+    clear_inputs(dut)
+    expected = 0b00 if early_branch(dut) else 0b10
+
+    dut.jump_E.value = 1
+    await Timer(1, "ps")
+    assert int(dut.PC_source_E.value) == expected
+
+    dut.jump_E.value = 0
+    dut.i_jump_E.value = 1
+    await Timer(1, "ps")
+    assert int(dut.PC_source_E.value) == expected
+
+
+@cocotb.test()
+async def test_signed_compare(dut): # COND_LOWER/COND_GREATER_OR_EQUAL order operands by sign, the *_UNSIGNED ones do not
+    clear_inputs(dut)
+
+    for a, b in [(0xFFFF_FFFF, 0), (0, 0xFFFF_FFFF), (0x8000_0000, 0x7FFF_FFFF), (0x7FFF_FFFF, 0x8000_0000), (0x8000_0000, 0x8000_0000)]:
+        lower = rv32i.to_signed(a) < rv32i.to_signed(b)
+        for cond, taken in [("COND_LOWER", lower), ("COND_GREATER_OR_EQUAL", not lower), ("COND_LOWER_UNSIGNED", a < b), ("COND_GREATER_OR_EQUAL_UNSIGNED", a >= b)]:
+            cond_code = rv32i.COND_CODES[cond]
+            assert rv32i.compare_reference(cond_code, a, b) == taken, f"reference {cond} {a:#010x} {b:#010x}"
+            await apply_and_check(dut, rv32i.ALU_OPS["ALU_ADD"], cond_code, a, b)
+
+
+@cocotb.test()
+async def test_coverage_directed(dut): # Close execute-space coverage with solved stimuli
+    clear_inputs(dut)
+
+    cg = rv32i.execute_covergroup()
+    engine = CoverageDirected(cg, execute_space(), budget=4096, seed=cocotb.RANDOM_SEED)
+    for stim in engine:
+        await apply_and_check(dut, stim["ALU_op"], stim["cond_code"], stim["operand_A"], stim["operand_B"])
+        cg.sample(
+            int(dut.ALU_op_E.value),
+            int(dut.cond_code_E.value),
+            int(dut.rs1_data_E.value),
+            int(dut.rs2_data_E.value),
+        )
+
+    cg.save(f"coverage_execute_{cocotb.RANDOM_SEED}.json")
+    dut._log.info(f"{engine.generated} stimuli\n" + cg.report())
+    assert cg.goals_met()
+
+
+@cocotb.test()
+async def test_golden_vectors(dut): # Replay recorded ALU/compare vectors (GOLDEN=record to refresh them)
+    clear_inputs(dut)
+
+    async def record(recorder):
+        for stim in CoverageDirected(rv32i.execute_covergroup(), execute_space(), budget=4096, seed=SEED):
+            await apply_and_check(dut, stim["ALU_op"], stim["cond_code"], stim["operand_A"], stim["operand_B"])
+            recorder.sample()
+        for alu_op in rv32i.ALU_OPS.values():
+            for cond_code in rv32i.COND_CODES.values():
+                for _ in range(ITERATIONS):
+                    await apply_and_check(dut, alu_op, cond_code, random.getrandbits(32), random.getrandbits(32))
+                    recorder.sample()
+
+    name = "execute_early_branch" if early_branch(dut) else "execute" # Redirect outputs differ per build
+    await golden(dut, golden_path(TB_DIR, name), EXECUTE_INPUTS, EXECUTE_OUTPUTS, record)
+
+
+@cocotb.test()
+async def test_fuzz_corpus(dut): # ALU results, addresses, targets and branch outcomes of the fuzz corpus against the ISS (python -m svtb.fuzz)
+    campaign = os.environ.get(CAMPAIGN_ENV)
+    corpus = load_corpus(campaign=int(campaign) if campaign else None)
+    if not corpus:
+        pytest.skip("empty fuzz corpus: grow it with python -m svtb.fuzz run")
+    clear_inputs(dut)
+
+    instructions = 0
+    for entry in corpus:
+        for step in steps(entry["words"]):
+            await apply_step(dut, step)
+            instructions += 1
+    dut._log.info(f"{len(corpus)} programs, {instructions} instructions")
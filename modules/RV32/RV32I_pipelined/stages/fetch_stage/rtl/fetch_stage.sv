@@ -1,6 +1,7 @@
 module fetch_stage
 #(
-    parameter PC_WIDTH = 32
+    parameter PC_WIDTH = 32,
+    parameter bit EARLY_BRANCH = 0 // Redirects from decode_stage (PC_source_D, branch_target_D), no prediction
 )
 (
     // Secuential input signals
@@ -9,6 +10,7 @@ module fetch_stage
 
     // Control input signals
     input logic [1:0] PC_source_E,
+    input logic [1:0] PC_source_D,
     input logic enable_fetch,
     input logic prediction_source_D,
 
@@ -16,6 +18,7 @@ module fetch_stage
     input logic [PC_WIDTH-1:0]    PC_plus_4_E,
     input logic [PC_WIDTH-1:0]    ALU_result_E,
     input logic [PC_WIDTH-1:0]    predicted_PC_D,
+    input logic [PC_WIDTH-1:0]    branch_target_D,
 
     // Data output signals
     output logic [PC_WIDTH-1:0]    PC_F,
@@ -25,6 +28,15 @@ module fetch_stage
     logic [PC_WIDTH-1:0] mux_PC_source_out;
     logic [PC_WIDTH-1:0] reg_PC_out;
 
+    // EARLY_BRANCH: decode_stage resolves every transfer exactly, so its redirect replaces
+    // execute_stage's and nothing is predicted (a predicted-taken fall-through would never be undone)
+    logic [1:0] PC_source;
+    logic [PC_WIDTH-1:0] redirect_target;
+    logic prediction_source;
+    assign PC_source = EARLY_BRANCH ? PC_source_D : PC_source_E;
+    assign redirect_target = EARLY_BRANCH ? branch_target_D : ALU_result_E;
+    assign prediction_source = !EARLY_BRANCH && prediction_source_D;
+
     mux_generic
     #(
         .CHANNELS_COUNT(4),
@@ -32,12 +44,12 @@ module fetch_stage
     )
     mux_PC_source
     (
-        .select(PC_source_E),
+        .select(PC_source),
         .channels
         (
             {
                 '0,             // 3
-                ALU_result_E,   // 2
+                redirect_target,// 2
                 PC_plus_4_E,    // 1
                 PC_plus_4_F     // 0
             }
@@ -65,7 +77,7 @@ module fetch_stage
     )
     mux_predictor
     (
-        .select(prediction_source_D),
+        .select(prediction_source),
         .channels
         (
             {
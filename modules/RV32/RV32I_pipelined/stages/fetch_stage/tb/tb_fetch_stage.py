@@ -2,13 +2,29 @@ import cocotb
 from cocotb.clock import Clock
 from cocotb.triggers import RisingEdge, FallingEdge, ReadOnly, NextTimeStep, Timer
 
+import os
 import random
-SEED = 666
+SEED = int(os.environ.get("COCOTB_RANDOM_SEED", 666))
 random.seed(SEED)
 ITERATIONS = 32
+CHECKPOINT_SEEDS = 8
+
+import pytest
+from svtb.checkpoint import run_from_checkpoint
+from svtb.waves import capture_on_failure, PC_SIGNALS
+from svtb.watchdog import watchdog
+FETCH_SIGNALS = PC_SIGNALS + ["enable_fetch", "prediction_source_D", "PC_source_D", "mux_PC_source.channel_out", "reg_PC.q"]
+WATCHDOG = dict(sim_time=(10, "us"), wall_s=60, stall_cycles=64, progress=["PC_F"]) # PC_F must keep moving
 
 
 # --- Helpers ---
+def early_branch(dut): # EARLY_BRANCH build (sim_early_branch/): PC_source_D and branch_target_D redirect, no prediction
+    return int(dut.EARLY_BRANCH.value)
+
+def skip_if_early_branch(dut): # PC_source_E and the predictor are ignored in the EARLY_BRANCH build
+    if early_branch(dut):
+        pytest.skip("execute_stage redirect and prediction checks: not used with EARLY_BRANCH")
+
 def generate_channels(channels_count): # Generate distinct channel values
     return [i + 1 for i in range(channels_count)]
 
@@ -27,7 +43,9 @@ async def async_reset(dut): # Helper to perform an asynchronous reset
 async def clear_stage_start(dut):
     # Start clock
     cocotb.start_soon(Clock(dut.clk, 2, unit="ns").start())
+    await reset_stage(dut)
 
+async def reset_stage(dut): # Inputs to their start values and reset, with the clock already running
     # Get parameters
     pc_width = int(dut.PC_WIDTH.value)
 
@@ -39,13 +57,15 @@ async def clear_stage_start(dut):
 
     ## Control signals
     dut.PC_source_E.value = 0b00
-    dut.enable_fetch_H.value = 0b0
+    dut.PC_source_D.value = 0b00
+    dut.enable_fetch.value = 0b0
     dut.prediction_source_D.value = 0b0
 
     ## Data signals
     dut.PC_plus_4_E.value = random.randint(0, (1 << pc_width) - 1)
     dut.ALU_result_E.value = 0x2
     dut.predicted_PC_D.value = 0x3
+    dut.branch_target_D.value = 0x5
 
 
     # Initial reset
@@ -53,12 +73,8 @@ async def clear_stage_start(dut):
     # From here, stage is cleared and ready for testing
 
 
-# --- Tests ---
-@cocotb.test()
-async def test_PC_counting_manually(dut):
-    await clear_stage_start(dut)
-
-    dut.enable_fetch_H.value = 0b1
+async def check_PC_counting_manually(dut):
+    dut.enable_fetch.value = 0b1
 
     # Check PC and PC_plus_4
     assert int(dut.PC_F.value) == 0x0
@@ -80,11 +96,8 @@ async def test_PC_counting_manually(dut):
     assert int(dut.PC_plus_4_F.value) == 0x10
 
 
-@cocotb.test()
-async def test_PC_counting(dut):
-    await clear_stage_start(dut)
-
-    dut.enable_fetch_H.value = 0b1
+async def check_PC_counting(dut):
+    dut.enable_fetch.value = 0b1
 
     # Check PC and PC_plus_4
     assert int(dut.PC_F.value) == 0x0
@@ -100,11 +113,8 @@ async def test_PC_counting(dut):
         pc += 4
 
 
-@cocotb.test()
-async def test_PC_source_E_selects_PC_plus_4_E(dut): # Verify that PC_source_E selects PC_plus_4_E correctly
-    await clear_stage_start(dut)
-
-    dut.enable_fetch_H.value = 0b1
+async def check_PC_source_E_selects_PC_plus_4_E(dut): # Verify that PC_source_E selects PC_plus_4_E correctly
+    dut.enable_fetch.value = 0b1
 
     # Check PC and PC_plus_4
     assert int(dut.PC_F.value) == 0x0
@@ -132,11 +142,8 @@ async def test_PC_source_E_selects_PC_plus_4_E(dut): # Verify that PC_source_E s
     assert int(dut.PC_plus_4_F.value) == target + 4
 
 
-@cocotb.test()
-async def test_PC_source_E_selects_ALU_result_E(dut): # Verify that PC_source_E selects ALU_result_E correctly
-    await clear_stage_start(dut)
-
-    dut.enable_fetch_H.value = 0b1
+async def check_PC_source_E_selects_ALU_result_E(dut): # Verify that PC_source_E selects ALU_result_E correctly
+    dut.enable_fetch.value = 0b1
 
     # Check PC and PC_plus_4
     assert int(dut.PC_F.value) == 0x0
@@ -164,11 +171,8 @@ async def test_PC_source_E_selects_ALU_result_E(dut): # Verify that PC_source_E
     assert int(dut.PC_plus_4_F.value) == target + 4
 
 
-@cocotb.test()
-async def test_PC_source_E_selects_fixed_zero(dut): # Verify that PC_source_E selects fixed zero correctly
-    await clear_stage_start(dut)
-
-    dut.enable_fetch_H.value = 0b1
+async def check_PC_source_E_selects_fixed_zero(dut): # Verify that PC_source_E selects fixed zero correctly
+    dut.enable_fetch.value = 0b1
 
     # Check PC and PC_plus_4
     assert int(dut.PC_F.value) == 0x0
@@ -196,11 +200,8 @@ async def test_PC_source_E_selects_fixed_zero(dut): # Verify that PC_source_E se
     assert int(dut.PC_plus_4_F.value) == target + 4
 
 
-@cocotb.test()
-async def test_mux_predictor(dut): # Verify that PC_source_E selects fixed zero correctly
-    await clear_stage_start(dut)
-
-    dut.enable_fetch_H.value = 0b1
+async def check_mux_predictor(dut): # Verify that PC_source_E selects fixed zero correctly
+    dut.enable_fetch.value = 0b1
 
     # Check PC and PC_plus_4
     assert int(dut.PC_F.value) == 0x0
@@ -226,3 +227,98 @@ async def test_mux_predictor(dut): # Verify that PC_source_E selects fixed zero
     await ReadOnly()
     assert int(dut.PC_F.value) == target
     assert int(dut.PC_plus_4_F.value) == target + 4
+
+
+async def check_random_redirects(dut): # Random PC sources, predictions and stalls against a model of reg_PC and the predictor mux
+    mask = (1 << int(dut.PC_WIDTH.value)) - 1
+    early = early_branch(dut)
+    reg_pc = int(dut.PC_F.value) # No prediction yet: PC_F is reg_PC
+    for _ in range(4 * ITERATIONS):
+        await FallingEdge(dut.clk)
+        enable = random.random() < 0.8
+        source_E, source_D = random.randrange(4), random.choice([0b00, 0b10])
+        predict = random.random() < 0.2
+        plus_4_E, alu_E, predicted, target_D = (random.getrandbits(32) & mask & ~3 for _ in range(4))
+        dut.enable_fetch.value = int(enable)
+        dut.PC_source_E.value = source_E
+        dut.PC_source_D.value = source_D
+        dut.prediction_source_D.value = int(predict)
+        dut.PC_plus_4_E.value = plus_4_E
+        dut.ALU_result_E.value = alu_E
+        dut.predicted_PC_D.value = predicted
+        dut.branch_target_D.value = target_D
+
+        source = source_D if early else source_E
+        predict = predict and not early # EARLY_BRANCH forces the predictor mux to reg_PC
+        pc = predicted if predict else reg_pc # The predictor mux sits after reg_PC
+        if enable:
+            reg_pc = [(pc + 4) & mask, plus_4_E, target_D if early else alu_E, 0][source]
+        await RisingEdge(dut.clk)
+        await ReadOnly()
+        pc = predicted if predict else reg_pc
+        assert int(dut.PC_F.value) == pc, f"source {source} predict {int(predict)} enable {int(enable)}"
+        assert int(dut.PC_plus_4_F.value) == (pc + 4) & mask
+
+
+# --- Tests ---
+@cocotb.test()
+@capture_on_failure(FETCH_SIGNALS)
+@watchdog(**WATCHDOG)
+async def test_PC_counting_manually(dut):
+    await clear_stage_start(dut)
+    await check_PC_counting_manually(dut)
+
+
+@cocotb.test()
+@capture_on_failure(FETCH_SIGNALS)
+@watchdog(**WATCHDOG)
+async def test_PC_counting(dut):
+    await clear_stage_start(dut)
+    await check_PC_counting(dut)
+
+
+@cocotb.test()
+@capture_on_failure(FETCH_SIGNALS)
+@watchdog(**WATCHDOG)
+async def test_PC_source_E_selects_PC_plus_4_E(dut): # Verify that PC_source_E selects PC_plus_4_E correctly
+    skip_if_early_branch(dut)
+    await clear_stage_start(dut)
+    await check_PC_source_E_selects_PC_plus_4_E(dut)
+
+
+@cocotb.test()
+@capture_on_failure(FETCH_SIGNALS)
+@watchdog(**WATCHDOG)
+async def test_PC_source_E_selects_ALU_result_E(dut): # Verify that PC_source_E selects ALU_result_E correctly
+    skip_if_early_branch(dut)
+    await clear_stage_start(dut)
+    await check_PC_source_E_selects_ALU_result_E(dut)
+
+
+@cocotb.test()
+@capture_on_failure(FETCH_SIGNALS)
+@watchdog(**WATCHDOG)
+async def test_PC_source_E_selects_fixed_zero(dut): # Verify that PC_source_E selects fixed zero correctly
+    skip_if_early_branch(dut)
+    await clear_stage_start(dut)
+    await check_PC_source_E_selects_fixed_zero(dut)
+
+
+@cocotb.test()
+@capture_on_failure(FETCH_SIGNALS)
+@watchdog(**WATCHDOG)
+async def test_mux_predictor(dut): # Verify that PC_source_E selects fixed zero correctly
+    skip_if_early_branch(dut)
+    await clear_stage_start(dut)
+    await check_mux_predictor(dut)
+
+
+@cocotb.test()
+@watchdog(**dict(WATCHDOG, sim_time=(100, "us")))
+async def test_branches_from_reset_checkpoint(dut): # Every check above plus random seeds, forked from one reset (svtb.checkpoint)
+    cocotb.start_soon(Clock(dut.clk, 2, unit="ns").start())
+    branches = {name[len("check_"):]: check for name, check in globals().items() if name.startswith("check_")}
+    if early_branch(dut): # Only the counting and random checks apply to the EARLY_BRANCH build
+        branches = {name: check for name, check in branches.items() if name.startswith("PC_counting")}
+    branches.update({f"random_redirects_{i}": check_random_redirects for i in range(CHECKPOINT_SEEDS)})
+    await run_from_checkpoint(dut, reset_stage, branches)
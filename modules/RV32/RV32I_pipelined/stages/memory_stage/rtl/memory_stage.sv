@@ -0,0 +1,254 @@
+module memory_stage
+#(
+    parameter int unsigned DATA_WIDTH = 32,
+    parameter bit STORE_BUFFER_EN = 1,  // Stores retire into the buffer instead of waiting for DMEM
+    parameter int unsigned SB_DEPTH = 4,
+    parameter bit WRITE_COMBINING = 1   // Stores to the youngest buffered word merge into it
+)
+(
+    // Secuential input signals
+        input logic clk,
+        input logic async_rst_n,
+
+    // Control input signals
+        input logic memory_transaction_M,
+        input logic mem_write_M,
+        input rv32i_types_pkg::width_type_enum width_type_M,
+
+    // Data input signals
+        input logic [DATA_WIDTH-1:0] ALU_result_M, // Byte address
+        input logic [DATA_WIDTH-1:0] write_data_M,
+
+    // E/M pipe handshake
+        input logic valid_in, // prev_valid
+        output logic ready_out, // current_ready
+    // M/W pipe handshake
+        output logic valid_out, // current_valid
+        input logic ready_in, // next_ready
+
+    // Data output signals
+        output logic [DATA_WIDTH-1:0] read_data_M, // Extended load result, valid with valid_out
+        output logic misaligned_M, // Access crosses the word: bytes past it are dropped
+        output logic store_buffer_empty,
+
+    // DMEM interface
+        // Sending data
+            output logic write_enable,
+
+            output logic [DATA_WIDTH-1:0] addr, // Word aligned
+            output logic [DATA_WIDTH-1:0] data_to_dmem,
+            output logic [DATA_WIDTH/8-1:0] byte_enablers,
+
+            input logic data_to_dmem_ready_in, // next_ready
+            output logic data_to_dmem_valid_out, // current_valid
+        // Recieving data
+            input logic [DATA_WIDTH-1:0] data_from_dmem,
+
+            output logic data_from_dmem_ready_out, // current_ready
+            input logic data_from_dmem_valid_in // prev_valid
+);
+    import rv32i_types_pkg::*;
+
+    localparam int unsigned BYTES = DATA_WIDTH / 8;
+    localparam int unsigned OFFSET_WIDTH = $clog2(BYTES);
+    localparam int unsigned WORD_ADDR_WIDTH = DATA_WIDTH - OFFSET_WIDTH;
+    localparam int unsigned COUNT_WIDTH = $clog2(SB_DEPTH + 1);
+
+
+    // Byte enables and alignment
+    logic [OFFSET_WIDTH-1:0] offset_M;
+    logic [WORD_ADDR_WIDTH-1:0] word_addr_M;
+    logic [BYTES-1:0] byte_enablers_M;
+    logic [DATA_WIDTH-1:0] write_data_aligned_M;
+    assign offset_M = ALU_result_M[OFFSET_WIDTH-1:0];
+    assign word_addr_M = ALU_result_M[DATA_WIDTH-1:OFFSET_WIDTH];
+    assign write_data_aligned_M = write_data_M << {offset_M, 3'b000};
+
+    always_comb begin
+        unique case (width_type_M)
+            WT_BYTE, WT_BYTE_UNSIGNED: begin
+                byte_enablers_M = BYTES'(1) << offset_M;
+                misaligned_M = 1'b0;
+            end
+            WT_HALF_WORD, WT_HALF_WORD_UNSIGNED: begin
+                byte_enablers_M = BYTES'(2'b11) << offset_M;
+                misaligned_M = offset_M[0];
+            end
+            WT_WORD: begin
+                byte_enablers_M = {BYTES{1'b1}} << offset_M;
+                misaligned_M = offset_M != '0;
+            end
+            default: begin
+                byte_enablers_M = '0;
+                misaligned_M = 1'b0;
+            end
+        endcase
+    end
+
+    logic is_load_M, is_store_M;
+    assign is_load_M = valid_in && memory_transaction_M && !mem_write_M;
+    assign is_store_M = valid_in && memory_transaction_M && mem_write_M;
+
+
+    // Store buffer: entry 0 is the oldest and the one drained to DMEM
+    logic [COUNT_WIDTH-1:0] sb_count_q;
+    logic [SB_DEPTH-1:0][WORD_ADDR_WIDTH-1:0] sb_addr_q;
+    logic [SB_DEPTH-1:0][DATA_WIDTH-1:0] sb_data_q;
+    logic [SB_DEPTH-1:0][BYTES-1:0] sb_be_q;
+    assign store_buffer_empty = !STORE_BUFFER_EN || sb_count_q == '0;
+
+    // Load forwarding: youngest buffered byte per lane of the load's word
+    logic [DATA_WIDTH-1:0] forward_data_M;
+    logic [BYTES-1:0] forward_lanes_M;
+    logic [DATA_WIDTH-1:0] forward_mask_M;
+    logic forward_hit_M; // Every byte the load needs is buffered
+    logic sb_head_on_port; // Entry 0 is on the DMEM port and may drain on any edge: not forwarded from
+    always_comb begin
+        forward_data_M = '0;
+        forward_lanes_M = '0;
+        for (int i = 0; i < SB_DEPTH; i++) begin
+            if (i < sb_count_q && sb_addr_q[i] == word_addr_M && !(i == 0 && sb_head_on_port)) begin
+                for (int b = 0; b < BYTES; b++) begin
+                    if (sb_be_q[i][b]) begin
+                        forward_data_M[8*b +: 8] = sb_data_q[i][8*b +: 8];
+                        forward_lanes_M[b] = 1'b1;
+                    end
+                end
+            end
+        end
+        for (int b = 0; b < BYTES; b++) forward_mask_M[8*b +: 8] = {8{forward_lanes_M[b]}};
+    end
+    assign forward_hit_M = STORE_BUFFER_EN && byte_enablers_M != '0 && (forward_lanes_M & byte_enablers_M) == byte_enablers_M;
+
+
+    // DMEM port arbitration: an offer stays on the port until DMEM takes it (ready/valid contract)
+    typedef enum logic [1:0]
+    {
+        PORT_NONE,
+        PORT_LOAD,         // Read for the load in this stage
+        PORT_STORE,        // Unbuffered store in this stage
+        PORT_STORE_BUFFER  // Oldest buffered store
+    } port_source_enum;
+
+    port_source_enum port_source, hold_source_q;
+    logic hold_q; // Offer not taken yet
+    logic load_issued_q; // Waiting for the read data
+    logic store_done_q; // Unbuffered store written, waiting for M/W
+    always_comb begin
+        port_source = PORT_NONE;
+        if (hold_q)
+            port_source = hold_source_q;
+        else if (!load_issued_q) begin
+            // Loads bypass buffered stores: the buffer is frozen until the read returns, so forwarding stays exact
+            if (is_load_M && !forward_hit_M)                    port_source = PORT_LOAD;
+            // A load served by the buffer keeps its entries until M/W takes it: valid_out must not drop
+            else if (STORE_BUFFER_EN && sb_count_q != '0 && !(is_load_M && forward_hit_M && !ready_in))
+                port_source = PORT_STORE_BUFFER;
+            else if (is_store_M && !STORE_BUFFER_EN && !store_done_q) port_source = PORT_STORE;
+        end
+    end
+
+    logic port_fire, sb_drain, load_return;
+    assign data_to_dmem_valid_out = port_source != PORT_NONE;
+    assign write_enable = port_source == PORT_STORE || port_source == PORT_STORE_BUFFER;
+    assign addr = {port_source == PORT_STORE_BUFFER ? sb_addr_q[0] : word_addr_M, OFFSET_WIDTH'(0)};
+    assign data_to_dmem = port_source == PORT_STORE_BUFFER ? sb_data_q[0] : (port_source == PORT_STORE ? write_data_aligned_M : '0);
+    assign byte_enablers = port_source == PORT_STORE_BUFFER ? sb_be_q[0] : byte_enablers_M;
+    assign port_fire = data_to_dmem_valid_out && data_to_dmem_ready_in;
+    assign sb_drain = port_fire && port_source == PORT_STORE_BUFFER;
+    assign sb_head_on_port = hold_q && hold_source_q == PORT_STORE_BUFFER;
+
+    assign data_from_dmem_ready_out = load_issued_q && ready_in;
+    assign load_return = data_from_dmem_valid_in && data_from_dmem_ready_out;
+
+
+    // Store buffer push / write combining
+    logic sb_combine, sb_push, store_accept;
+    always_comb begin
+        sb_combine = 1'b0;
+        if (WRITE_COMBINING && STORE_BUFFER_EN && is_store_M && sb_count_q != '0)
+            // Not into an entry on the port: its data must hold until DMEM takes it
+            sb_combine = sb_addr_q[sb_count_q - 1'b1] == word_addr_M
+                         && !(sb_count_q == COUNT_WIDTH'(1) && port_source == PORT_STORE_BUFFER);
+    end
+    assign store_accept = STORE_BUFFER_EN && (sb_combine || sb_count_q != COUNT_WIDTH'(SB_DEPTH) || sb_drain);
+    assign sb_push = is_store_M && ready_in && store_accept && !sb_combine;
+
+
+    // Completion
+    logic done_M;
+    always_comb begin
+        done_M = 1'b1;
+        if (is_load_M)          done_M = forward_hit_M || load_return;
+        else if (is_store_M)    done_M = STORE_BUFFER_EN ? store_accept : store_done_q || (port_source == PORT_STORE && port_fire);
+    end
+    assign ready_out = ready_in && done_M;
+    assign valid_out = valid_in && done_M;
+
+
+    // Load data: buffered bytes over the DMEM word, then extension
+    logic [DATA_WIDTH-1:0] load_word_M, load_shifted_M;
+    assign load_word_M = (forward_data_M & forward_mask_M) | (data_from_dmem & ~forward_mask_M);
+    assign load_shifted_M = load_word_M >> {offset_M, 3'b000};
+    always_comb begin
+        unique case (width_type_M)
+            WT_BYTE:                read_data_M = {{(DATA_WIDTH-8){load_shifted_M[7]}}, load_shifted_M[7:0]};
+            WT_BYTE_UNSIGNED:       read_data_M = {{(DATA_WIDTH-8){1'b0}}, load_shifted_M[7:0]};
+            WT_HALF_WORD:           read_data_M = {{(DATA_WIDTH-16){load_shifted_M[15]}}, load_shifted_M[15:0]};
+            WT_HALF_WORD_UNSIGNED:  read_data_M = {{(DATA_WIDTH-16){1'b0}}, load_shifted_M[15:0]};
+            default:                read_data_M = load_shifted_M;
+        endcase
+    end
+
+
+    always_ff @(posedge clk or negedge async_rst_n) begin
+        if (!async_rst_n) begin
+            hold_q <= 1'b0;
+            hold_source_q <= PORT_NONE;
+            load_issued_q <= 1'b0;
+            store_done_q <= 1'b0;
+            sb_count_q <= '0;
+            for (int i = 0; i < SB_DEPTH; i++) begin
+                sb_addr_q[i] <= '0;
+                sb_data_q[i] <= '0;
+                sb_be_q[i] <= '0;
+            end
+        end
+        else begin
+            hold_q <= data_to_dmem_valid_out && !data_to_dmem_ready_in;
+            hold_source_q <= port_source;
+            if (port_fire && port_source == PORT_LOAD) load_issued_q <= 1'b1;
+            if (load_return) load_issued_q <= 1'b0;
+            if (port_fire && port_source == PORT_STORE) store_done_q <= 1'b1;
+            if (valid_in && ready_out) store_done_q <= 1'b0;
+
+            if (STORE_BUFFER_EN) begin
+                // Drain shifts the queue, push and combine then land on the shifted positions
+                if (sb_drain) begin
+                    for (int i = 0; i < SB_DEPTH - 1; i++) begin
+                        sb_addr_q[i] <= sb_addr_q[i + 1];
+                        sb_data_q[i] <= sb_data_q[i + 1];
+                        sb_be_q[i] <= sb_be_q[i + 1];
+                    end
+                    sb_be_q[SB_DEPTH - 1] <= '0;
+                end
+                if (sb_push) begin
+                    sb_addr_q[sb_count_q - sb_drain] <= word_addr_M;
+                    sb_data_q[sb_count_q - sb_drain] <= write_data_aligned_M;
+                    sb_be_q[sb_count_q - sb_drain] <= byte_enablers_M;
+                end
+                if (sb_combine && ready_in) begin
+                    for (int b = 0; b < BYTES; b++) begin
+                        if (byte_enablers_M[b])
+                            sb_data_q[sb_count_q - 1'b1 - sb_drain][8*b +: 8] <= write_data_aligned_M[8*b +: 8];
+                        else
+                            sb_data_q[sb_count_q - 1'b1 - sb_drain][8*b +: 8] <= sb_data_q[sb_count_q - 1'b1][8*b +: 8];
+                    end
+                    sb_be_q[sb_count_q - 1'b1 - sb_drain] <= sb_be_q[sb_count_q - 1'b1] | byte_enablers_M;
+                    sb_addr_q[sb_count_q - 1'b1 - sb_drain] <= word_addr_M;
+                end
+                sb_count_q <= sb_count_q + sb_push - sb_drain;
+            end
+        end
+    end
+endmodule
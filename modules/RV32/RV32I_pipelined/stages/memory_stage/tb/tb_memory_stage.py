@@ -0,0 +1,206 @@
+import cocotb
+from cocotb.clock import Clock
+from cocotb.triggers import FallingEdge, ReadOnly, RisingEdge
+
+import os
+import random
+SEED = int(os.environ.get("COCOTB_RANDOM_SEED", 666))
+random.seed(SEED)
+OPS = 400
+
+import json
+from pathlib import Path
+from svtb import rv32i
+from svtb.dmem import BENCH_DMEM, BENCH_ENV, SIZES, DmemModel, Memory, byte_enablers, kernels
+from svtb.handshake import protocol_checked
+from svtb.watchdog import watchdog
+WATCHDOG = dict(sim_time=(200, "us"), wall_s=120, stall_cycles=512) # Progress = handshakes on either pipe side
+# DMEM request ports are off the X_* convention; read_data_M only means something for loads (checked against the reference)
+PROTOCOL_DATA = {"out": ["misaligned_M"], "data_to_dmem": ["write_enable", "addr", "data_to_dmem", "byte_enablers"]}
+STORE_WIDTHS = ["WT_BYTE", "WT_HALF_WORD", "WT_WORD"]
+
+
+# --- Helpers ---
+async def reset(dut): # Asynchronous reset with every input idle
+    dut.async_rst_n.value = 0
+    dut.valid_in.value = 0
+    dut.ready_in.value = 0
+    dut.memory_transaction_M.value = 0
+    dut.mem_write_M.value = 0
+    dut.width_type_M.value = rv32i.WIDTH_TYPES["WT_WORD"]
+    dut.ALU_result_M.value = 0
+    dut.write_data_M.value = 0
+    await RisingEdge(dut.clk)
+    dut.async_rst_n.value = 1
+
+def drive(dut, op): # One op of svtb.dmem's kernel format on the E/M side, None = bubble
+    dut.valid_in.value = int(op is not None)
+    kind = op[0] if op else "alu"
+    dut.memory_transaction_M.value = int(kind != "alu")
+    dut.mem_write_M.value = int(kind == "store")
+    if kind != "alu":
+        dut.ALU_result_M.value = op[1]
+        dut.width_type_M.value = rv32i.WIDTH_TYPES[op[2]]
+    dut.write_data_M.value = op[3] if kind == "store" else 0
+
+async def run_ops(dut, dmem, ops, reference, ready_prob=1.0): # -> cycles until the last op retired and DMEM has every store
+    cycles = 0
+    i = 0
+    while True:
+        await FallingEdge(dut.clk)
+        op = ops[i] if i < len(ops) else None
+        drive(dut, op)
+        dut.ready_in.value = int(random.random() < ready_prob)
+
+        await ReadOnly()
+        if op is None and int(dut.store_buffer_empty.value) and not dmem.responses:
+            break
+        if op is not None and int(dut.ready_out.value):
+            assert int(dut.valid_out.value) == 1
+            if op[0] != "alu":
+                assert int(dut.misaligned_M.value) == int(op[1] % SIZES[op[2]] != 0), f"op {i} {op}: misaligned_M"
+            if op[0] == "load":
+                expected = reference.load(op[1], op[2])
+                got = int(dut.read_data_M.value)
+                assert got == expected, f"op {i} {op}: read {got:#010x}, expected {expected:#010x}"
+            elif op[0] == "store":
+                reference.store(op[1], op[2], op[3])
+            i += 1
+        cycles += 1
+        await RisingEdge(dut.clk)
+
+    await RisingEdge(dut.clk) # Let the DMEM model finish the cycle
+    assert not reference.diff(dmem.memory), f"DMEM differs from the reference: {reference.diff(dmem.memory)}"
+    return cycles
+
+def random_ops(n, window=16): # Narrow address window: forwarding, combining and partial overlaps all happen
+    ops = []
+    for _ in range(n):
+        kind = random.choices(["store", "load", "alu"], weights=[4, 4, 2])[0]
+        if kind == "alu":
+            ops.append(("alu",))
+            continue
+        width = random.choice(STORE_WIDTHS if kind == "store" else list(SIZES))
+        addr = 0x40 + random.randrange(window)
+        if random.random() < 0.9: # Mostly aligned
+            addr -= addr % SIZES[width]
+        ops.append((kind, addr, width, random.getrandbits(32)) if kind == "store" else (kind, addr, width))
+    return ops
+
+
+# --- Tests ---
+@cocotb.test()
+@watchdog(**WATCHDOG)
+@protocol_checked(data=PROTOCOL_DATA)
+async def test_random_ops(dut): # Random loads/stores against a byte-level reference, random DMEM timing and backpressure
+    cocotb.start_soon(Clock(dut.clk, 2, unit="ns").start())
+    for accept_cycles, read_latency, stall_prob, ready_prob in [(1, 1, 0.0, 1.0), (3, 2, 0.3, 0.7), (2, 4, 0.5, 0.5)]:
+        await reset(dut)
+        dmem = DmemModel(dut, accept_cycles=accept_cycles, read_latency=read_latency, stall_prob=stall_prob).start()
+        await run_ops(dut, dmem, random_ops(OPS), Memory(), ready_prob)
+        dmem.stop()
+
+
+@cocotb.test()
+@watchdog(**WATCHDOG)
+@protocol_checked(data=PROTOCOL_DATA)
+async def test_byte_enables(dut): # Every width and offset reaches DMEM with its lanes and shifted data
+    cocotb.start_soon(Clock(dut.clk, 2, unit="ns").start())
+    await reset(dut)
+    dmem = DmemModel(dut).start()
+    reference = Memory()
+    for width in STORE_WIDTHS:
+        for offset in range(4):
+            addr = 0x80 + offset
+            value = random.getrandbits(32)
+            await run_ops(dut, dmem, [("store", addr, width, value)], reference)
+            write, word_addr, data, enables = dmem.requests[-1]
+            assert write == 1 and word_addr == 0x80
+            assert enables == byte_enablers(addr, width), f"{width} at +{offset}: byte_enablers {enables:04b}"
+            mask = sum(0xFF << (8 * b) for b in range(4) if enables >> b & 1)
+            assert data & mask == (value << (8 * offset)) & mask, f"{width} at +{offset}: data {data:#010x}"
+    dmem.stop()
+
+
+@cocotb.test()
+@watchdog(**WATCHDOG)
+@protocol_checked(data=PROTOCOL_DATA)
+async def test_store_retires_without_dmem(dut): # Buffered stores retire while DMEM stalls, loads forward from them
+    cocotb.start_soon(Clock(dut.clk, 2, unit="ns").start())
+    await reset(dut)
+    if not int(dut.STORE_BUFFER_EN.value):
+        dut._log.info("STORE_BUFFER_EN=0: nothing to check")
+        return
+    dmem = DmemModel(dut, stall_prob=1.0).start() # Never ready
+    depth = int(dut.SB_DEPTH.value)
+    stores = [("store", 0x100 + 4 * i, "WT_WORD", random.getrandbits(32)) for i in range(depth)]
+    for cycle, op in enumerate(stores + [("load", 0x100 + 4 * (depth - 1), "WT_WORD")]):
+        await FallingEdge(dut.clk)
+        drive(dut, op)
+        dut.ready_in.value = 1
+        await ReadOnly()
+        assert int(dut.ready_out.value) == 1, f"{op} stalled with {cycle} stores buffered"
+        if op[0] == "load":
+            assert int(dut.read_data_M.value) == stores[-1][3]
+        await RisingEdge(dut.clk)
+
+    await FallingEdge(dut.clk) # Full: the next store waits for DMEM
+    drive(dut, ("store", 0x200, "WT_WORD", 0))
+    await ReadOnly()
+    assert int(dut.ready_out.value) == 0
+    assert dmem.writes == 0
+    dmem.stop()
+
+
+@cocotb.test()
+@watchdog(**WATCHDOG)
+@protocol_checked(data=PROTOCOL_DATA)
+async def test_forwarded_load_holds(dut): # A load served by the buffer stays offered while M/W stalls and DMEM could drain
+    cocotb.start_soon(Clock(dut.clk, 2, unit="ns").start())
+    await reset(dut)
+    if not int(dut.STORE_BUFFER_EN.value):
+        dut._log.info("STORE_BUFFER_EN=0: nothing to check")
+        return
+    dmem = DmemModel(dut).start() # Always ready: any offered entry drains at once
+    value = random.getrandbits(32)
+    for op in [("store", 0x180, "WT_WORD", value), ("load", 0x180, "WT_WORD")]:
+        await FallingEdge(dut.clk)
+        drive(dut, op)
+        dut.ready_in.value = int(op[0] == "store")
+        await RisingEdge(dut.clk)
+
+    for cycle in range(8): # The load sits in M with M/W stalled
+        await ReadOnly()
+        assert int(dut.valid_out.value) == 1, f"valid_out dropped after {cycle} stalled cycles"
+        assert int(dut.read_data_M.value) == value
+        await RisingEdge(dut.clk)
+    assert dmem.writes == 0, "the forwarding entry drained under the stalled load"
+
+    await FallingEdge(dut.clk) # M/W takes the load, then the store drains
+    dut.ready_in.value = 1
+    reference = Memory()
+    reference.store(0x180, "WT_WORD", value)
+    await run_ops(dut, dmem, [], reference)
+    assert dmem.writes == 1
+    dmem.stop()
+
+
+@cocotb.test()
+@watchdog(sim_time=(1, "ms"), wall_s=300, stall_cycles=512)
+@protocol_checked(data=PROTOCOL_DATA)
+async def test_kernel_benchmark(dut): # memset/memcpy cycles against a slow DMEM (python -m svtb.dmem bench)
+    cocotb.start_soon(Clock(dut.clk, 2, unit="ns").start())
+    results = {}
+    for name, (initial, ops) in kernels().items():
+        await reset(dut)
+        dmem = DmemModel(dut, memory=initial.copy(), **BENCH_DMEM).start()
+        cycles = await run_ops(dut, dmem, ops, initial.copy())
+        dmem.stop()
+        results[name] = {"ops": len(ops), "cycles": cycles, "writes": dmem.writes, "reads": dmem.reads}
+        dut._log.info(f"{name}: {cycles} cycles, {dmem.writes} DMEM writes, {dmem.reads} reads")
+
+    out = os.environ.get(BENCH_ENV)
+    if out:
+        params = {p: int(getattr(dut, p).value) for p in ("STORE_BUFFER_EN", "SB_DEPTH", "WRITE_COMBINING")}
+        Path(out).parent.mkdir(parents=True, exist_ok=True)
+        Path(out).write_text(json.dumps({"params": params, "dmem": BENCH_DMEM, "kernels": results}, indent=1))
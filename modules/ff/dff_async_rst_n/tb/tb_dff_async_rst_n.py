@@ -2,12 +2,16 @@ import cocotb
 from cocotb.clock import Clock
 from cocotb.triggers import RisingEdge, FallingEdge, Timer
 
+from svtb.profiler import profiled
+
+import os
 import random
-SEED = 666
+SEED = int(os.environ.get("COCOTB_RANDOM_SEED", 666))
 random.seed(SEED)
 
 
 @cocotb.test()
+@profiled
 async def store_min(dut):
     cocotb.start_soon(Clock(dut.clk, 2, unit="ns").start())
     dut.async_rst_n.value = 0
@@ -28,6 +32,7 @@ async def store_min(dut):
 
 
 @cocotb.test()
+@profiled
 async def store_random(dut):
     cocotb.start_soon(Clock(dut.clk, 2, unit="ns").start())
     dut.async_rst_n.value = 0
@@ -48,6 +53,7 @@ async def store_random(dut):
 
 
 @cocotb.test()
+@profiled
 async def store_max(dut):
     cocotb.start_soon(Clock(dut.clk, 2, unit="ns").start())
     dut.async_rst_n.value = 0
@@ -68,6 +74,7 @@ async def store_max(dut):
 
 
 @cocotb.test()
+@profiled
 async def fall_reset(dut):
     cocotb.start_soon(Clock(dut.clk, 2, unit="ns").start())
     dut.async_rst_n.value = 0
@@ -94,6 +101,7 @@ async def fall_reset(dut):
 
 
 @cocotb.test()
+@profiled
 async def rise_reset(dut):
     cocotb.start_soon(Clock(dut.clk, 2, unit="ns").start())
     dut.async_rst_n.value = 0
@@ -121,6 +129,7 @@ async def rise_reset(dut):
 
 
 @cocotb.test()
+@profiled
 async def rewrite(dut):
     cocotb.start_soon(Clock(dut.clk, 2, unit="ns").start())
     dut.async_rst_n.value = 0
@@ -146,6 +155,7 @@ async def rewrite(dut):
 
 
 @cocotb.test()
+@profiled
 async def store_while_rst(dut):
     cocotb.start_soon(Clock(dut.clk, 2, unit="ns").start())
     dut.async_rst_n.value = 0
@@ -173,6 +183,7 @@ async def store_while_rst(dut):
 
 
 @cocotb.test()
+@profiled
 async def store_in_negedge(dut):
     cocotb.start_soon(Clock(dut.clk, 2, unit="ns").start())
     dut.async_rst_n.value = 0
@@ -2,8 +2,9 @@ import cocotb
 from cocotb.clock import Clock
 from cocotb.triggers import RisingEdge, FallingEdge, Timer, ReadOnly, NextTimeStep
 
+import os
 import random
-SEED = 666
+SEED = int(os.environ.get("COCOTB_RANDOM_SEED", 666))
 random.seed(SEED)
 
 
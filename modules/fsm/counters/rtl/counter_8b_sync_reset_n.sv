@@ -9,12 +9,8 @@ module counter_8b_sync_reset_n
 always_ff @(posedge clk)
 begin
     if(!sync_rst)
-    {
         q <= 8'b0;
-    }
     else
-    {
         q <= q+1;
-    }
 end
 endmodule
\ No newline at end of file
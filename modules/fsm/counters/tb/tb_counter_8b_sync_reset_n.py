@@ -0,0 +1,58 @@
+import cocotb
+from cocotb.clock import Clock
+from cocotb.triggers import RisingEdge, ReadOnly, NextTimeStep
+
+import os
+import random
+SEED = int(os.environ.get("COCOTB_RANDOM_SEED", 666))
+random.seed(SEED)
+
+
+# --- Helpers ---
+async def sync_reset(dut): # Hold the active-low reset for one posedge
+    dut.sync_rst.value = 0
+    await RisingEdge(dut.clk)
+    await ReadOnly()
+    assert int(dut.q.value) == 0
+    await NextTimeStep()
+    dut.sync_rst.value = 1
+
+
+# --- Tests ---
+@cocotb.test()
+async def test_count(dut): # Counts up by one every posedge after reset
+    cocotb.start_soon(Clock(dut.clk, 2, unit="ns").start())
+    await sync_reset(dut)
+
+    cycles = random.randint(1, 200)
+    for i in range(cycles):
+        await RisingEdge(dut.clk)
+        await ReadOnly()
+        assert int(dut.q.value) == i + 1
+        await NextTimeStep()
+
+
+@cocotb.test()
+async def test_wrap(dut): # Wraps from 255 back to 0
+    cocotb.start_soon(Clock(dut.clk, 2, unit="ns").start())
+    await sync_reset(dut)
+
+    for _ in range(256):
+        await RisingEdge(dut.clk)
+    await ReadOnly()
+    assert int(dut.q.value) == 0
+
+
+@cocotb.test()
+async def test_reset_mid_count(dut): # Reset is sampled on the posedge only
+    cocotb.start_soon(Clock(dut.clk, 2, unit="ns").start())
+    await sync_reset(dut)
+
+    for _ in range(random.randint(1, 100)):
+        await RisingEdge(dut.clk)
+    await NextTimeStep()
+
+    await sync_reset(dut)
+    await RisingEdge(dut.clk)
+    await ReadOnly()
+    assert int(dut.q.value) == 1
@@ -13,7 +13,7 @@ typedef enum logic [1:0]
     S0 = 2'b00,
     S1 = 2'b01,
     S2 = 2'b10,
-    S3 = 2'b11,
+    S3 = 2'b11
 }state_t;
 
 state_t current_state, next_state;
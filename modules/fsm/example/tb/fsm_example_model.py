@@ -0,0 +1,57 @@
+# Generated by `python -m svtb.fsm modules/fsm/example/rtl/fsm_example.sv`, regenerate instead of editing
+# fsm_example: 4 reachable states, 8 transitions, transition tour of 8 cycles
+TOP = 'fsm_example'
+CLOCK = 'clk'
+INPUTS = {'sync_rst': 1, 'in': 1}
+OUTPUTS = {'done': 1}
+RESET = ('sync_rst', 0) # (input, asserted value)
+STATE_SIGNALS = ['current_state']
+
+STATES = { # label -> state register values
+    'S0': (0,),
+    'S1': (1,),
+    'S2': (2,),
+    'S3': (3,),
+}
+RESET_STATE = 'S0'
+
+TRANSITIONS = [ # (state, next state) with reset deasserted
+    ('S0', 'S0'),
+    ('S0', 'S1'),
+    ('S1', 'S1'),
+    ('S1', 'S2'),
+    ('S2', 'S2'),
+    ('S2', 'S3'),
+    ('S3', 'S0'),
+    ('S3', 'S3'),
+]
+
+TABLE = { # (state, inputs) -> (next state, outputs)
+    ('S0', (0, 0)): ('S0', (0,)),
+    ('S0', (0, 1)): ('S0', (0,)),
+    ('S0', (1, 0)): ('S0', (0,)),
+    ('S0', (1, 1)): ('S1', (0,)),
+    ('S1', (0, 0)): ('S0', (0,)),
+    ('S1', (0, 1)): ('S0', (0,)),
+    ('S1', (1, 0)): ('S1', (0,)),
+    ('S1', (1, 1)): ('S2', (0,)),
+    ('S2', (0, 0)): ('S0', (0,)),
+    ('S2', (0, 1)): ('S0', (0,)),
+    ('S2', (1, 0)): ('S2', (0,)),
+    ('S2', (1, 1)): ('S3', (0,)),
+    ('S3', (0, 0)): ('S0', (1,)),
+    ('S3', (0, 1)): ('S0', (1,)),
+    ('S3', (1, 0)): ('S0', (1,)),
+    ('S3', (1, 1)): ('S3', (1,)),
+}
+
+TOUR = [ # Inputs per cycle after reset, every transition at least once
+    (1, 1), # S0 -> S1
+    (1, 0), # S1 -> S1
+    (1, 1), # S1 -> S2
+    (1, 0), # S2 -> S2
+    (1, 1), # S2 -> S3
+    (1, 1), # S3 -> S3
+    (1, 0), # S3 -> S0
+    (1, 0), # S0 -> S0
+]
@@ -0,0 +1,58 @@
+# Generated by `python -m svtb.fsm trasteo/fsm_interview_1.sv`, regenerate instead of editing
+# fsm_interview_1: 3 reachable states, 5 transitions, transition tour of 5 cycles
+TOP = 'fsm_interview_1'
+CLOCK = 'clk'
+INPUTS = {'sync_rst': 1, 'ip_enable': 1, 'req_disable': 1}
+OUTPUTS = {'ack': 1, 'idle': 1}
+RESET = ('sync_rst', 0) # (input, asserted value)
+STATE_SIGNALS = ['current']
+
+STATES = { # label -> state register values
+    'IDLE': (0,),
+    'ENABLE': (1,),
+    'DISABLE': (2,),
+}
+RESET_STATE = 'IDLE'
+
+TRANSITIONS = [ # (state, next state) with reset deasserted
+    ('IDLE', 'IDLE'),
+    ('IDLE', 'ENABLE'),
+    ('ENABLE', 'ENABLE'),
+    ('ENABLE', 'DISABLE'),
+    ('DISABLE', 'IDLE'),
+]
+
+TABLE = { # (state, inputs) -> (next state, outputs)
+    ('IDLE', (0, 0, 0)): ('IDLE', (0, 1)),
+    ('IDLE', (0, 0, 1)): ('IDLE', (0, 1)),
+    ('IDLE', (0, 1, 0)): ('IDLE', (0, 1)),
+    ('IDLE', (0, 1, 1)): ('IDLE', (0, 1)),
+    ('IDLE', (1, 0, 0)): ('IDLE', (0, 1)),
+    ('IDLE', (1, 0, 1)): ('IDLE', (0, 1)),
+    ('IDLE', (1, 1, 0)): ('ENABLE', (0, 1)),
+    ('IDLE', (1, 1, 1)): ('ENABLE', (0, 1)),
+    ('ENABLE', (0, 0, 0)): ('IDLE', (0, 0)),
+    ('ENABLE', (0, 0, 1)): ('IDLE', (0, 0)),
+    ('ENABLE', (0, 1, 0)): ('IDLE', (0, 0)),
+    ('ENABLE', (0, 1, 1)): ('IDLE', (0, 0)),
+    ('ENABLE', (1, 0, 0)): ('ENABLE', (0, 0)),
+    ('ENABLE', (1, 0, 1)): ('DISABLE', (0, 0)),
+    ('ENABLE', (1, 1, 0)): ('ENABLE', (0, 0)),
+    ('ENABLE', (1, 1, 1)): ('DISABLE', (0, 0)),
+    ('DISABLE', (0, 0, 0)): ('IDLE', (1, 0)),
+    ('DISABLE', (0, 0, 1)): ('IDLE', (1, 0)),
+    ('DISABLE', (0, 1, 0)): ('IDLE', (1, 0)),
+    ('DISABLE', (0, 1, 1)): ('IDLE', (1, 0)),
+    ('DISABLE', (1, 0, 0)): ('IDLE', (1, 0)),
+    ('DISABLE', (1, 0, 1)): ('IDLE', (1, 0)),
+    ('DISABLE', (1, 1, 0)): ('IDLE', (1, 0)),
+    ('DISABLE', (1, 1, 1)): ('IDLE', (1, 0)),
+}
+
+TOUR = [ # Inputs per cycle after reset, every transition at least once
+    (1, 1, 0), # IDLE -> ENABLE
+    (1, 0, 0), # ENABLE -> ENABLE
+    (1, 0, 1), # ENABLE -> DISABLE
+    (1, 0, 0), # DISABLE -> IDLE
+    (1, 0, 0), # IDLE -> IDLE
+]
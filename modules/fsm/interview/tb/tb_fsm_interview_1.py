@@ -0,0 +1,33 @@
+import cocotb
+from cocotb.clock import Clock
+
+import os
+import random
+SEED = int(os.environ.get("COCOTB_RANDOM_SEED", 666))
+random.seed(SEED)
+RANDOM_CYCLES = 512
+
+import fsm_interview_1_model
+from svtb.fsm import FsmModel, drive_fsm
+
+
+# --- Helpers ---
+def random_inputs(): # Reset now and then, any input combination otherwise
+    name, asserted = fsm_interview_1_model.RESET
+    inputs = [random.getrandbits(width) for width in fsm_interview_1_model.INPUTS.values()]
+    inputs[list(fsm_interview_1_model.INPUTS).index(name)] = asserted if random.random() < 0.05 else 1 - asserted
+    return tuple(inputs)
+
+
+# --- Tests ---
+@cocotb.test()
+async def test_transition_tour(dut): # Shortest input sequence taking every transition, checked against the model
+    cocotb.start_soon(Clock(dut.clk, 2, unit="ns").start())
+    cov = await drive_fsm(dut, FsmModel(fsm_interview_1_model), fsm_interview_1_model.TOUR)
+    assert cov.goals_met(), f"uncovered: {cov.holes()}"
+
+
+@cocotb.test()
+async def test_random_inputs(dut): # Random walk with occasional resets
+    cocotb.start_soon(Clock(dut.clk, 2, unit="ns").start())
+    await drive_fsm(dut, FsmModel(fsm_interview_1_model), [random_inputs() for _ in range(RANDOM_CYCLES)])
@@ -2,9 +2,15 @@ import cocotb
 from cocotb.clock import Clock
 from cocotb.triggers import RisingEdge, FallingEdge, ReadOnly, NextTimeStep, Timer
 
+import os
 import random
-SEED = 666
+SEED = int(os.environ.get("COCOTB_RANDOM_SEED", 666))
 random.seed(SEED)
+ITERATIONS = 32
+
+from pathlib import Path
+from svtb.golden import golden, golden_path
+TB_DIR = Path(__file__).parent
 
 
 # --- Helpers ---
@@ -32,3 +38,22 @@ async def test_select_channel(dut): # Test selecting channels
         dut.select.value = i
         await Timer(1, "ps")
         assert int(dut.channel_out.value) == channels[i]
+
+
+@cocotb.test()
+async def test_golden_vectors(dut): # Replay recorded select/channel vectors (GOLDEN=record to refresh them)
+    channels_count = int(dut.CHANNELS_COUNT.value)
+    channels_width = int(dut.CHANNELS_WIDTH.value)
+
+    async def record(recorder):
+        for _ in range(ITERATIONS):
+            channels = [random.getrandbits(channels_width) for _ in range(channels_count)]
+            dut.channels.value = get_packed_array(channels, channels_width)
+            for i in range(1 << len(dut.select)): # Out-of-range selects included
+                dut.select.value = i
+                await Timer(1, "ps")
+                assert int(dut.channel_out.value) == (channels[i] if i < channels_count else 0)
+                recorder.sample()
+
+    path = golden_path(TB_DIR, f"mux_{channels_count}x{channels_width}")
+    await golden(dut, path, ["select", "channels"], ["channel_out"], record)
@@ -0,0 +1,2 @@
+# svtb: shared verification helpers for the svlib testbenches
+# Makefiles put tools/ on PYTHONPATH, so testbenches can `import svtb.<module>`
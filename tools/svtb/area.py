@@ -0,0 +1,133 @@
+# Yosys area / logic depth comparison
+#
+# Synthesizes RTL variants to one generic gate library (ABC onto AND/NAND/OR/NOR/XOR/XNOR/MUX)
+# and reports cells, flip-flops by kind and the longest combinational path in gates
+# (`ltp -noff`), so alternatives can be compared on the same footing. Not a timing or silicon
+# area number: a relative measure between designs synthesized the same way. Flip-flops of every
+# kind count as one cell, so e.g. reset vs reset-less storage only shows up through the logic
+# ABC builds around them, not as a cheaper flop.
+#
+#   python -m svtb.area regfile regfile_bypass regfile_bypass:RESET_STORAGE=0 regfile_bypass:READ_PORTS=4
+#   python -m svtb.area ALU execute_stage --json area.json
+#
+# Yosys comes from `yosys` on PATH, otherwise `yowasp-yosys` (see svtb.netlist).
+import argparse
+import hashlib
+import json
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+from svtb import netlist, rtl
+from svtb.regress import file_hash
+
+
+CACHE_DIR = rtl.REPO_ROOT / ".netlist_cache"
+GATES = "AND,NAND,OR,NOR,XOR,XNOR,MUX"
+
+_REGFILE = rtl.RV32I_DIR / "regfile" / "rtl"
+TARGETS = dict(netlist.TARGETS, **{ # name -> (top, sources)
+    "regfile": ("regfile", [_REGFILE / "regfile.sv"]),
+    "regfile_bypass": ("regfile_bypass", [_REGFILE / "regfile_bypass.sv"]),
+    "memory_stage": ("memory_stage", [rtl.TYPES_PKG, rtl.RV32I_DIR / "stages" / "memory_stage" / "rtl" / "memory_stage.sv"]),
+})
+
+_CELL_RE = [re.compile(r"^\s*(\d+)\s+(\$\w+)\s*$"), re.compile(r"^\s*(\$\w+)\s+(\d+)\s*$")] # Both `stat` layouts
+
+
+def parse_spec(spec): # "regfile_bypass:READ_PORTS=4,RESET_STORAGE=0" -> (target, {READ_PORTS: 4, ...})
+    name, _, params = spec.partition(":")
+    if name not in TARGETS:
+        raise ValueError(f"unknown target {name!r}, one of {', '.join(sorted(TARGETS))}")
+    return name, dict(p.split("=", 1) for p in params.split(",") if p)
+
+def _parse(log): # Output of `stat; ltp -noff` -> measures
+    cells = {}
+    for line in log.splitlines():
+        for i, regex in enumerate(_CELL_RE):
+            m = regex.match(line)
+            if m:
+                count, kind = (m.group(1), m.group(2)) if i == 0 else (m.group(2), m.group(1))
+                cells[kind] = int(count)
+    depth = re.findall(r"Longest topological path in \S+ \(length=(\d+)\)", log)
+    flops = {k: v for k, v in cells.items() if "DFF" in k or "DLATCH" in k}
+    return {
+        "cells": sum(cells.values()),
+        "gates": sum(v for k, v in cells.items() if k not in flops),
+        "flops": sum(flops.values()),
+        "depth": int(depth[-1]) if depth else None,
+        "by_type": dict(sorted(cells.items())),
+    }
+
+def measure(target, params=None, cache_dir=CACHE_DIR): # -> {cells, gates, flops, depth, by_type} (cached)
+    top, sources = TARGETS[target]
+    params = params or {}
+    script = f"synth -flatten -top {top}; abc -g {GATES}; opt_clean"
+    h = hashlib.sha256(json.dumps([top, params, script]).encode())
+    for s in sources:
+        h.update(f"{Path(s).name}:{file_hash(s)}\n".encode())
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    cached = cache_dir / f"{top}_area_{h.hexdigest()[:16]}.json"
+    if cached.exists():
+        return json.loads(cached.read_text())
+
+    yosys = netlist.find_yosys()
+    log = cached.with_suffix(".log")
+    errors = []
+    for reader in netlist._readers(sources, top, params):
+        # Measures go through `tee -o`: yowasp-yosys loses its stdout once ABC has run
+        log.unlink(missing_ok=True)
+        measures = f"tee -q -a {log.name} stat; tee -q -a {log.name} ltp -noff"
+        proc = subprocess.run([yosys, "-q", "-p", f"{reader}; {script}; {measures}"], cwd=cache_dir, capture_output=True, text=True)
+        if proc.returncode == 0 and log.exists():
+            result = _parse(log.read_text())
+            log.unlink()
+            cached.write_text(json.dumps(result, indent=1))
+            return result
+        errors.append((proc.stdout + proc.stderr).strip().splitlines()[-1:] or ["?"])
+    raise RuntimeError(f"yosys failed for {top}: " + " / ".join(e[0] for e in errors))
+
+def report(results, baseline=None): # Table of the measures, change against the first spec
+    base = results[baseline or next(iter(results))]
+    lines = [f"{'design':44} {'cells':>7} {'gates':>7} {'flops':>6} {'depth':>6} {'cells vs base':>14}"]
+    for spec, r in results.items():
+        change = f"{100 * (r['cells'] - base['cells']) / base['cells']:+.1f}%" if base["cells"] else "-"
+        lines.append(f"{spec:44} {r['cells']:7} {r['gates']:7} {r['flops']:6} {r['depth'] if r['depth'] is not None else '-':>6} {change:>14}")
+    if len({_flop_kinds(r) for r in results.values()}) > 1:
+        lines.append(
+            "note: flop kinds differ between designs but every flop counts as one cell, so the cost of"
+            " reset/enable flops is not measured; the cell change comes from the logic around them (--types)"
+        )
+    return "\n".join(lines)
+
+def _flop_kinds(r):
+    return tuple(sorted(k for k in r["by_type"] if "DFF" in k or "DLATCH" in k))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m svtb.area")
+    parser.add_argument("specs", nargs="+", help="target[:PARAM=V,...]; the first one is the baseline")
+    parser.add_argument("--json", default=None, help="also write the measures here")
+    parser.add_argument("--types", action="store_true", help="print cell counts per type")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for spec in args.specs:
+        try:
+            name, params = parse_spec(spec)
+        except ValueError as e:
+            parser.error(str(e))
+        results[spec] = measure(name, params)
+    print(report(results))
+    if args.types:
+        for spec, r in results.items():
+            print(f"{spec}: " + ", ".join(f"{k} {v}" for k, v in r["by_type"].items()))
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=1))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
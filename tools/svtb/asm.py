@@ -0,0 +1,331 @@
+# Minimal RV32I assembler
+#
+# Two passes over GNU-style assembly: labels, .text/.data sections, .word/.half/.byte/.space/
+# .align/.equ, %hi()/%lo(), sym+offset expressions and the common pseudo-instructions
+# (li, la, mv, not, neg, seqz, snez, j, jr, ret, call, beqz, bnez, bgt, ble, ...). Only what
+# the pipeline decodes is accepted: no ecall/ebreak/fence/CSRs.
+#
+#   program = assemble(Path("fib.s").read_text())
+#   Path("fib.hex").write_text(hex_image(program.text))   # $readmemh image for imem.sv
+#
+#   python -m svtb.asm fib.s -o fib.hex
+import argparse
+import re
+import sys
+from pathlib import Path
+
+from svtb import rv32i
+
+
+TEXT_BASE = 0x0000_0000
+DATA_BASE = 0x0001_0000
+
+_ABI = ["zero", "ra", "sp", "gp", "tp", "t0", "t1", "t2", "s0", "s1"] + [f"a{i}" for i in range(8)] \
+    + [f"s{i}" for i in range(2, 12)] + ["t3", "t4", "t5", "t6"]
+REGISTERS = {**{f"x{i}": i for i in range(32)}, **{name: i for i, name in enumerate(_ABI)}, "fp": 8}
+
+_OP = rv32i.OPCODES
+R_TYPE = { # mnemonic -> (funct3, funct7)
+    "add": (0, 0x00), "sub": (0, 0x20), "sll": (1, 0x00), "slt": (2, 0x00), "sltu": (3, 0x00),
+    "xor": (4, 0x00), "srl": (5, 0x00), "sra": (5, 0x20), "or": (6, 0x00), "and": (7, 0x00),
+}
+I_ALU = {"addi": 0, "slti": 2, "sltiu": 3, "xori": 4, "ori": 6, "andi": 7}
+SHIFTS = {"slli": (1, 0x00), "srli": (5, 0x00), "srai": (5, 0x20)}
+LOADS = {"lb": 0, "lh": 1, "lw": 2, "lbu": 4, "lhu": 5}
+STORES = {"sb": 0, "sh": 1, "sw": 2}
+BRANCHES = {"beq": 0, "bne": 1, "blt": 4, "bge": 5, "bltu": 6, "bgeu": 7}
+SWAPPED_BRANCHES = {"bgt": "blt", "ble": "bge", "bgtu": "bltu", "bleu": "bgeu"} # Operands reversed
+ZERO_BRANCHES = { # pseudo -> (branch, zero operand first)
+    "beqz": ("beq", False), "bnez": ("bne", False), "bltz": ("blt", False),
+    "bgez": ("bge", False), "blez": ("bge", True), "bgtz": ("blt", True),
+}
+
+
+class AsmError(Exception):
+    pass
+
+
+class Program:
+    def __init__(self):
+        self.text = [] # Instruction words from TEXT_BASE
+        self.data = {} # Byte address -> byte
+        self.symbols = {}
+        self.lines = {} # Instruction address -> source line, for listings and traces
+
+    def word(self, addr): # Instruction word at a text address
+        return self.text[(addr - TEXT_BASE) // 4]
+
+
+# --- Expressions ---
+_TOKEN_RE = re.compile(r"\s*([+-])?\s*(%hi\(|%lo\()?\s*([A-Za-z_.$][\w.$]*|0[xX][0-9a-fA-F_]+|0[bB][01_]+|\d+|'.')\s*\)?")
+
+def _hi(value): # Upper 20 bits, rounded so that the sign-extended %lo adds back to value
+    return ((value + 0x800) >> 12) & 0xFFFFF
+
+def _lo(value):
+    return rv32i.to_signed(value & 0xFFF, 12)
+
+def value(expr, symbols, line=None): # "sym+4", "-0x10", "%lo(buf)" -> int
+    expr = expr.strip()
+    total, pos = 0, 0
+    while pos < len(expr):
+        m = _TOKEN_RE.match(expr, pos)
+        if not m or m.end() == pos:
+            raise AsmError(f"{line or expr}: cannot parse expression {expr!r}")
+        sign, func, atom = m.groups()
+        if atom.startswith("'"):
+            v = ord(atom[1])
+        elif atom[0].isdigit():
+            v = int(atom.replace("_", ""), 0)
+        elif atom in symbols:
+            v = symbols[atom]
+        else:
+            raise AsmError(f"{line or expr}: undefined symbol {atom!r}")
+        if func == "%hi(":
+            v = _hi(v)
+        elif func == "%lo(":
+            v = _lo(v)
+        total += -v if sign == "-" else v
+        pos = m.end()
+    return total
+
+def _is_literal(expr):
+    try:
+        value(expr, {})
+        return True
+    except AsmError:
+        return False
+
+
+# --- Operands ---
+def _reg(name, line):
+    try:
+        return REGISTERS[name.strip()]
+    except KeyError:
+        raise AsmError(f"{line}: unknown register {name.strip()!r}") from None
+
+def _mem(operand, symbols, line): # "imm(rs1)" -> (imm, rs1)
+    m = re.fullmatch(r"\s*(.*?)\s*\(\s*(\w+)\s*\)\s*", operand)
+    if not m:
+        raise AsmError(f"{line}: expected imm(reg), got {operand!r}")
+    return value(m.group(1) or "0", symbols, line), _reg(m.group(2), line)
+
+def _check(imm, bits, line, signed=True):
+    lo, hi = (-(1 << (bits - 1)), (1 << (bits - 1)) - 1) if signed else (0, (1 << bits) - 1)
+    if not lo <= imm <= hi:
+        raise AsmError(f"{line}: immediate {imm} does not fit in {bits} bits")
+    return imm
+
+
+# --- Instructions ---
+def _size(mnemonic, args): # Bytes an instruction takes, known in the first pass
+    if mnemonic == "li":
+        literal = _is_literal(args[1])
+        return 4 if literal and -2048 <= value(args[1], {}) < 2048 else 8
+    return 8 if mnemonic == "la" else 4
+
+def _expand(mnemonic, args, pc, symbols, line): # Pseudo-instructions -> [(mnemonic, args)]
+    if mnemonic == "nop":
+        return [("addi", ["zero", "zero", "0"])]
+    if mnemonic in ("li", "la"):
+        v = value(args[1], symbols, line) & 0xFFFF_FFFF
+        if _size(mnemonic, args) == 4:
+            return [("addi", [args[0], "zero", str(rv32i.to_signed(v))])]
+        return [("lui", [args[0], str(_hi(v))]), ("addi", [args[0], args[0], str(_lo(v))])]
+    if mnemonic == "mv":
+        return [("addi", [args[0], args[1], "0"])]
+    if mnemonic == "not":
+        return [("xori", [args[0], args[1], "-1"])]
+    if mnemonic == "neg":
+        return [("sub", [args[0], "zero", args[1]])]
+    if mnemonic == "seqz":
+        return [("sltiu", [args[0], args[1], "1"])]
+    if mnemonic == "snez":
+        return [("sltu", [args[0], "zero", args[1]])]
+    if mnemonic == "j":
+        return [("jal", ["zero", args[0]])]
+    if mnemonic == "jal" and len(args) == 1:
+        return [("jal", ["ra", args[0]])]
+    if mnemonic == "call":
+        return [("jal", ["ra", args[0]])]
+    if mnemonic == "jr":
+        return [("jalr", ["zero", f"0({args[0]})"])]
+    if mnemonic == "jalr" and len(args) == 1:
+        return [("jalr", ["ra", f"0({args[0]})"])]
+    if mnemonic == "jalr" and len(args) == 3: # jalr rd, rs1, imm
+        return [("jalr", [args[0], f"{args[2]}({args[1]})"])]
+    if mnemonic == "ret":
+        return [("jalr", ["zero", "0(ra)"])]
+    if mnemonic in SWAPPED_BRANCHES:
+        return [(SWAPPED_BRANCHES[mnemonic], [args[1], args[0], args[2]])]
+    if mnemonic in ZERO_BRANCHES:
+        branch, zero_first = ZERO_BRANCHES[mnemonic]
+        return [(branch, ["zero", args[0], args[1]] if zero_first else [args[0], "zero", args[1]])]
+    return [(mnemonic, args)]
+
+def encode(mnemonic, args, pc, symbols, line): # One base instruction -> word
+    n = len(args)
+    def need(count):
+        if n != count:
+            raise AsmError(f"{line}: {mnemonic} takes {count} operands, got {n}")
+    if mnemonic in R_TYPE:
+        need(3)
+        f3, f7 = R_TYPE[mnemonic]
+        return rv32i.encode(_OP["OPCODE_R"], _reg(args[0], line), f3, _reg(args[1], line), _reg(args[2], line), f7)
+    if mnemonic in I_ALU:
+        need(3)
+        imm = _check(value(args[2], symbols, line), 12, line)
+        return rv32i.encode_i(_OP["OPCODE_I_ALU"], _reg(args[0], line), I_ALU[mnemonic], _reg(args[1], line), imm)
+    if mnemonic in SHIFTS:
+        need(3)
+        f3, f7 = SHIFTS[mnemonic]
+        shamt = _check(value(args[2], symbols, line), 5, line, signed=False)
+        return rv32i.encode_i(_OP["OPCODE_I_ALU"], _reg(args[0], line), f3, _reg(args[1], line), (f7 << 5) | shamt)
+    if mnemonic in LOADS:
+        need(2)
+        imm, rs1 = _mem(args[1], symbols, line)
+        return rv32i.encode_i(_OP["OPCODE_I_LOAD"], _reg(args[0], line), LOADS[mnemonic], rs1, _check(imm, 12, line))
+    if mnemonic in STORES:
+        need(2)
+        imm, rs1 = _mem(args[1], symbols, line)
+        return rv32i.encode_s(_OP["OPCODE_S"], STORES[mnemonic], rs1, _reg(args[0], line), _check(imm, 12, line))
+    if mnemonic in BRANCHES:
+        need(3)
+        offset = _check(value(args[2], symbols, line) - pc, 13, line)
+        return rv32i.encode_b(_OP["OPCODE_B"], BRANCHES[mnemonic], _reg(args[0], line), _reg(args[1], line), offset)
+    if mnemonic == "jal":
+        need(2)
+        offset = _check(value(args[1], symbols, line) - pc, 21, line)
+        return rv32i.encode_j(_OP["OPCODE_J"], _reg(args[0], line), offset)
+    if mnemonic == "jalr":
+        need(2)
+        imm, rs1 = _mem(args[1], symbols, line)
+        return rv32i.encode_i(_OP["OPCODE_I_JUMP"], _reg(args[0], line), 0, rs1, _check(imm, 12, line))
+    if mnemonic in ("lui", "auipc"):
+        need(2)
+        imm = _check(value(args[1], symbols, line), 20, line, signed=False)
+        return rv32i.encode_u(_OP["OPCODE_U" if mnemonic == "lui" else "OPCODE_U_PC"], _reg(args[0], line), imm << 12)
+    raise AsmError(f"{line}: unknown instruction {mnemonic!r}")
+
+
+# --- Assembler ---
+def _split(text): # -> [(line number, label or None, mnemonic or None, args)]
+    items = []
+    for number, raw in enumerate(text.splitlines(), 1):
+        code = re.split(r"#|//|;", raw, maxsplit=1)[0].strip()
+        while code:
+            m = re.match(r"([A-Za-z_.$][\w.$]*)\s*:\s*", code)
+            if not m:
+                break
+            items.append((number, m.group(1), None, []))
+            code = code[m.end():]
+        if code:
+            parts = code.split(None, 1)
+            args = [a.strip() for a in re.split(r",(?![^(]*\))", parts[1])] if len(parts) > 1 else []
+            items.append((number, None, parts[0].lower(), args))
+    return items
+
+def assemble(text):
+    items = _split(text)
+    program = Program()
+
+    # Pass 1: addresses of labels, sizes of instructions and data
+    symbols = {}
+    pcs = {"text": TEXT_BASE, "data": DATA_BASE}
+    section = "text"
+    for number, label, mnemonic, args in items:
+        line = f"line {number}"
+        if label:
+            if label in symbols:
+                raise AsmError(f"{line}: {label} defined twice")
+            symbols[label] = pcs[section]
+        elif mnemonic in (".text", ".data"):
+            section = mnemonic[1:]
+        elif mnemonic == ".equ":
+            symbols[args[0]] = value(args[1], symbols, line)
+        elif mnemonic in (".globl", ".global", ".section"):
+            pass
+        elif mnemonic.startswith("."):
+            pcs[section] += _data_size(mnemonic, args, pcs[section], symbols, line)
+        else:
+            if section != "text":
+                raise AsmError(f"{line}: instruction outside .text")
+            pcs[section] += _size(mnemonic, args)
+
+    # Pass 2: encoding
+    pcs = {"text": TEXT_BASE, "data": DATA_BASE}
+    section = "text"
+    source = text.splitlines()
+    for number, label, mnemonic, args in items:
+        line = f"line {number}"
+        if label or mnemonic in (".equ", ".globl", ".global", ".section"):
+            continue
+        if mnemonic in (".text", ".data"):
+            section = mnemonic[1:]
+        elif mnemonic.startswith("."):
+            pcs[section] = _emit_data(program, mnemonic, args, pcs[section], symbols, line)
+        else:
+            for base, base_args in _expand(mnemonic, args, pcs["text"], symbols, line):
+                program.text.append(encode(base, base_args, pcs["text"], symbols, line) & 0xFFFF_FFFF)
+                program.lines[pcs["text"]] = source[number - 1].strip()
+                pcs["text"] += 4
+    program.symbols = symbols
+    return program
+
+_DATA_WIDTHS = {".word": 4, ".half": 2, ".byte": 1}
+
+def _data_size(mnemonic, args, pc, symbols, line):
+    if mnemonic in _DATA_WIDTHS:
+        return _DATA_WIDTHS[mnemonic] * len(args)
+    if mnemonic in (".space", ".zero"):
+        return value(args[0], symbols, line)
+    if mnemonic in (".align", ".p2align"):
+        align = 1 << value(args[0], symbols, line)
+        return -pc % align
+    raise AsmError(f"{line}: unknown directive {mnemonic}")
+
+def _emit_data(program, mnemonic, args, pc, symbols, line):
+    if mnemonic in _DATA_WIDTHS:
+        width = _DATA_WIDTHS[mnemonic]
+        for arg in args:
+            v = value(arg, symbols, line)
+            for i in range(width):
+                program.data[pc + i] = (v >> (8 * i)) & 0xFF
+            pc += width
+        return pc
+    size = _data_size(mnemonic, args, pc, symbols, line)
+    for i in range(size):
+        program.data[pc + i] = 0
+    return pc + size
+
+
+def hex_image(words): # $readmemh format, one 32-bit word per line
+    return "".join(f"{w:08x}\n" for w in words)
+
+
+# --- CLI ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m svtb.asm")
+    parser.add_argument("source")
+    parser.add_argument("-o", "--out", help="hex image (default: <source>.hex)")
+    parser.add_argument("--listing", action="store_true", help="print address, word and source line")
+    args = parser.parse_args(argv)
+
+    source = Path(args.source)
+    try:
+        program = assemble(source.read_text())
+    except AsmError as e:
+        print(f"{source}: {e}", file=sys.stderr)
+        return 1
+    out = Path(args.out) if args.out else source.with_suffix(".hex")
+    out.write_text(hex_image(program.text))
+    if args.listing:
+        for i, word in enumerate(program.text):
+            addr = TEXT_BASE + 4 * i
+            print(f"{addr:08x}: {word:08x}  {program.lines.get(addr, '')}")
+    print(f"{len(program.text)} instructions, {len(program.data)} data bytes -> {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
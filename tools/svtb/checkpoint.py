@@ -0,0 +1,158 @@
+# Fork-based simulation checkpoints
+#
+# Icarus cannot save and restore its state, but its process can be copied: os.fork() at a
+# point in simulated time is a copy-on-write snapshot of the whole simulation (design state,
+# event queue, cocotb scheduler, running clock and monitor tasks). A test runs its common
+# prefix (clock, reset, later a boot program) once, then forks one child per branch; each
+# child continues the simulation from the snapshot with its own body, reports its outcome
+# through a pipe and exits, while the parent stays frozen at the checkpoint. Up to `jobs`
+# children run at once.
+#
+#   @cocotb.test()
+#   async def test_from_reset(dut):
+#       cocotb.start_soon(Clock(dut.clk, 2, unit="ns").start())
+#       await run_from_checkpoint(dut, reset_stage, {
+#           "counting": check_PC_counting,
+#           "seed7": functools.partial(check_random_redirects, seed=7),
+#       })
+#
+# Every branch reseeds `random` from the regression seed and its name, so a branch replays the
+# same way forked or not. Children exit without running the rest of the suite or writing
+# results.xml; the parent fails the test listing every failing branch with its traceback. A
+# child restarts the wall_s budget of the test's @watchdog, so a branch that waited for a free
+# job slot is not charged for the wait.
+# CHECKPOINT=0 (or a platform without fork) runs the branches one after another in-process,
+# replaying the prefix before each one.
+import json
+import logging
+import os
+import random
+import select
+import sys
+import time
+import traceback
+
+import cocotb
+from cocotb.utils import get_sim_time
+
+from svtb.watchdog import restart_wall_clocks
+
+
+CHECKPOINT_ENV = "CHECKPOINT"
+_READ_SIZE = 1 << 16
+
+
+def enabled():
+    return hasattr(os, "fork") and os.environ.get(CHECKPOINT_ENV, "1") != "0"
+
+def _seed(name):
+    random.seed(f"{cocotb.RANDOM_SEED}:{name}")
+
+def _flush(): # Buffered output would be written once per process after the fork
+    sys.stdout.flush()
+    sys.stderr.flush()
+    for handler in logging.getLogger().handlers:
+        handler.flush()
+
+
+async def _run_branch(name, body, dut): # -> outcome dict; never raises
+    start_ns = get_sim_time("ns")
+    start = time.perf_counter()
+    _seed(name)
+    try:
+        await body(dut)
+        error = None
+    except BaseException as e: # Assertion failures, errors and a watchdog cancelling the test
+        error = "".join(traceback.format_exception(e)).strip()
+    return {
+        "name": name,
+        "passed": error is None,
+        "error": error,
+        "sim_time_ns": get_sim_time("ns") - start_ns,
+        "wall_s": time.perf_counter() - start,
+    }
+
+
+def _collect(running, results): # Drain the children's pipes until one reaches EOF, then reap that child
+    # A child blocks writing an outcome larger than the pipe buffer, so the pipes are read
+    # before waiting: waiting first would deadlock on a big traceback or log
+    by_fd = {fd: pid for pid, (_, fd, _) in running.items()}
+    while True:
+        ready, _, _ = select.select(list(by_fd), [], [])
+        for fd in ready:
+            chunk = os.read(fd, _READ_SIZE)
+            pid = by_fd[fd]
+            if chunk:
+                running[pid][2].append(chunk)
+                continue
+            name, _, chunks = running.pop(pid)
+            os.close(fd)
+            _, status = os.waitpid(pid, 0)
+            data = b"".join(chunks)
+            if data:
+                results[name] = json.loads(data)
+            else: # Died before reporting: crash in the simulator or a signal
+                results[name] = {"name": name, "passed": False, "error": f"child exited with status {status:#x}", "sim_time_ns": 0, "wall_s": 0.0}
+            return
+
+async def _forked(dut, branches, jobs): # Fork every branch from the current simulator state
+    results = {}
+    running = {} # pid -> (name, read end, chunks read so far)
+    pending = list(branches.items())
+    while pending or running:
+        while pending and len(running) < jobs:
+            name, body = pending.pop(0)
+            read_fd, write_fd = os.pipe()
+            _flush()
+            pid = os.fork()
+            if pid == 0: # Child: continue the simulation from the snapshot, then leave without cleanup
+                os.close(read_fd)
+                restart_wall_clocks() # Time spent queued for a job slot is not the branch's
+                status = 1
+                try:
+                    outcome = await _run_branch(name, body, dut)
+                    with os.fdopen(write_fd, "w") as pipe:
+                        pipe.write(json.dumps(outcome))
+                    status = 0
+                finally:
+                    _flush()
+                    os._exit(status)
+            os.close(write_fd)
+            running[pid] = (name, read_fd, [])
+        # The parent blocks here without yielding to the scheduler: its simulation stays at the checkpoint
+        _collect(running, results)
+    return [results[name] for name in branches]
+
+async def _sequential(dut, prefix, branches):
+    results = []
+    for i, (name, body) in enumerate(branches.items()):
+        if i:
+            _seed("prefix")
+            await prefix(dut)
+        results.append(await _run_branch(name, body, dut))
+    return results
+
+
+async def run_from_checkpoint(dut, prefix, branches, jobs=None): # -> [outcome]; fails the test if any branch failed
+    # prefix: async (dut) -> None, run once (every branch with CHECKPOINT=0, so it must not start clocks);
+    # branches: {name: async (dut) -> None}
+    start = time.perf_counter()
+    _seed("prefix")
+    await prefix(dut)
+    prefix_s = time.perf_counter() - start
+
+    forked = enabled()
+    if forked:
+        outcomes = await _forked(dut, branches, max(jobs or os.cpu_count() or 1, 1))
+    else:
+        outcomes = await _sequential(dut, prefix, branches)
+
+    failed = [o for o in outcomes if not o["passed"]]
+    dut._log.info(
+        f"{len(outcomes)} branches {'forked from one checkpoint' if forked else 'run sequentially'} "
+        f"(prefix {prefix_s:.3f} s wall, paid {'once' if forked else f'{len(outcomes)} times'}), "
+        f"{len(outcomes) - len(failed)} passed"
+    )
+    assert not failed, "\n\n".join(f"branch {o['name']} failed:\n{o['error']}" for o in failed)
+    return outcomes
+
@@ -0,0 +1,246 @@
+# Functional coverage with batch sampling
+#
+# sample() only appends raw integers to typed arrays; binning happens vectorized
+# (NumPy) in flush(), which runs at checkpoints, on save() and at report time.
+#
+#   cg = Covergroup("decode", ["instruction", "ALU_op"], points=[...], crosses=[...])
+#   cg.sample(instr, alu_op)   # hot path, per event
+#   cg.save("coverage_666.json")
+#
+# Databases from parallel runs / seeds are merged by bin label:
+#   python -m svtb.coverage merge -o total.json cov_*.json
+#   python -m svtb.coverage report total.json
+import argparse
+import itertools
+import json
+from array import array
+
+import numpy as np
+
+
+CHECKPOINT_SAMPLES = 1 << 16 # Raw samples buffered before an automatic flush
+
+
+# --- Bins ---
+def _intervals(spec): # Bin spec (value | (lo, hi) | list of those) -> [(lo, hi)]
+    if isinstance(spec, tuple):
+        return [spec]
+    if isinstance(spec, (list, set, frozenset, range)):
+        return [iv for s in spec for iv in _intervals(s)]
+    return [(spec, spec)]
+
+def enum_bins(members, ignore=()): # {member: value} -> bins, one per enum member
+    return {name: value for name, value in members.items() if name not in ignore}
+
+
+class Coverpoint:
+    def __init__(self, name, bins, expr=None, at_least=1):
+        # bins: {label: value | (lo, hi) | [values / ranges]}, labels must not overlap
+        # expr: column name or callable(columns) -> array, defaults to the column called `name`
+        self.name = name
+        self.expr = name if expr is None else expr
+        self.at_least = at_least
+        self.labels = list(bins)
+
+        intervals = sorted(
+            (lo, hi, i) for i, label in enumerate(self.labels) for lo, hi in _intervals(bins[label])
+        )
+        self._lo = np.array([iv[0] for iv in intervals], dtype=np.int64)
+        self._hi = np.array([iv[1] for iv in intervals], dtype=np.int64)
+        self._bin = np.array([iv[2] for iv in intervals], dtype=np.int64)
+
+    def bin_indexes(self, columns): # Values -> bin index per sample, -1 if no bin matches
+        values = columns[self.expr] if isinstance(self.expr, str) else self.expr(columns)
+        values = np.asarray(values, dtype=np.int64)
+        pos = np.searchsorted(self._lo, values, side="right") - 1
+        safe = np.clip(pos, 0, None)
+        hit = (pos >= 0) & (values <= self._hi[safe])
+        return np.where(hit, self._bin[safe], -1)
+
+
+class Cross:
+    def __init__(self, name, points, bins=None, at_least=1):
+        # points: coverpoint names; bins: optional label tuples restricting the cross
+        self.name = name
+        self.points = tuple(points)
+        self.at_least = at_least
+        self._bins = bins
+        self.labels = []
+
+    def bind(self, coverpoints): # Resolve labels and the mixed-radix key of every bin
+        dims = [coverpoints[p].labels for p in self.points]
+        self._strides = np.cumprod([1] + [len(d) for d in dims[:0:-1]])[::-1].astype(np.int64)
+        tuples = list(itertools.product(*dims)) if self._bins is None else [tuple(b) for b in self._bins]
+        index = [{label: i for i, label in enumerate(d)} for d in dims]
+        keys = [sum(index[k][label] * int(self._strides[k]) for k, label in enumerate(t)) for t in tuples]
+        order = np.argsort(keys)
+        self.labels = ["|".join(t) for t in tuples]
+        self._keys = np.array(keys, dtype=np.int64)[order]
+        self._key_bin = order.astype(np.int64)
+
+    def bin_indexes(self, point_indexes):
+        idx = np.stack([point_indexes[p] for p in self.points])
+        valid = (idx >= 0).all(axis=0)
+        keys = (idx * self._strides[:, None]).sum(axis=0)
+        pos = np.clip(np.searchsorted(self._keys, keys), 0, max(len(self._keys) - 1, 0))
+        hit = valid & (self._keys[pos] == keys)
+        return np.where(hit, self._key_bin[pos], -1)
+
+
+# --- Covergroup ---
+class Covergroup:
+    def __init__(self, name, columns, points=(), crosses=(), checkpoint=CHECKPOINT_SAMPLES):
+        self.name = name
+        self.columns = tuple(columns)
+        self.points = {p.name: p for p in points}
+        self.crosses = {x.name: x for x in crosses}
+        for x in self.crosses.values():
+            x.bind(self.points)
+        self.items = {**self.points, **self.crosses}
+        self.counts = {n: np.zeros(len(i.labels), dtype=np.int64) for n, i in self.items.items()}
+        self.samples = 0
+        self.checkpoint = checkpoint
+        self._raw = [array("q") for _ in self.columns]
+        self._pending = 0
+
+    def sample(self, *values): # Hot path: one raw value per column, in column order
+        for buf, v in zip(self._raw, values):
+            buf.append(v)
+        self._pending += 1
+        if self._pending >= self.checkpoint:
+            self.flush()
+
+    def sample_many(self, **arrays): # Already-batched samples, one array per column
+        self.flush()
+        self._bin({c: np.asarray(arrays[c], dtype=np.int64) for c in self.columns})
+
+    def flush(self): # Bin everything buffered since the last checkpoint
+        if not self._pending:
+            return
+        columns = {c: np.frombuffer(buf, dtype=np.int64).copy() for c, buf in zip(self.columns, self._raw)}
+        self._raw = [array("q") for _ in self.columns]
+        self._pending = 0
+        self._bin(columns)
+
+    def _bin(self, columns):
+        n = len(next(iter(columns.values()))) if columns else 0
+        indexes = {name: p.bin_indexes(columns) for name, p in self.points.items()}
+        for name, x in self.crosses.items():
+            indexes[name] = x.bin_indexes(indexes)
+        for name, idx in indexes.items():
+            hits = idx[idx >= 0]
+            self.counts[name] += np.bincount(hits, minlength=len(self.items[name].labels))
+        self.samples += n
+
+    # --- Results ---
+    def hit_counts(self, name): # {label: count} for one coverpoint or cross
+        self.flush()
+        return dict(zip(self.items[name].labels, self.counts[name].tolist()))
+
+    def holes(self, names=None): # [(item, label)] of bins below their at_least goal
+        self.flush()
+        return [
+            (name, label)
+            for name in (names or self.items)
+            for label, c in zip(self.items[name].labels, self.counts[name])
+            if c < self.items[name].at_least
+        ]
+
+    def coverage(self, names=None): # Covered bins / total bins, in percent
+        self.flush()
+        names = names or list(self.items)
+        total = sum(len(self.items[n].labels) for n in names)
+        covered = sum(int((self.counts[n] >= self.items[n].at_least).sum()) for n in names)
+        return 100.0 * covered / total if total else 100.0
+
+    def goals_met(self, names=None):
+        return not self.holes(names)
+
+    def to_dict(self):
+        self.flush()
+        return {
+            "name": self.name,
+            "samples": self.samples,
+            "items": {n: self.hit_counts(n) for n in self.items},
+            "at_least": {n: i.at_least for n, i in self.items.items()},
+        }
+
+    def save(self, path):
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=1)
+
+    def merge(self, db): # Add counts from another run (dict or JSON path), matching by label
+        if not isinstance(db, dict):
+            with open(db) as f:
+                db = json.load(f)
+        self.flush()
+        for name, bins in db["items"].items():
+            if name not in self.items:
+                continue
+            index = {label: i for i, label in enumerate(self.items[name].labels)}
+            for label, count in bins.items():
+                if label in index:
+                    self.counts[name][index[label]] += count
+        self.samples += db.get("samples", 0)
+
+    def report(self):
+        return report(self.to_dict())
+
+
+# --- Databases ---
+def merge_dbs(dbs): # Sum several coverage databases (dicts) by item and label
+    merged = {"name": None, "samples": 0, "items": {}, "at_least": {}}
+    for db in dbs:
+        merged["name"] = merged["name"] or db["name"]
+        merged["samples"] += db.get("samples", 0)
+        merged["at_least"].update(db.get("at_least", {}))
+        for name, bins in db["items"].items():
+            dst = merged["items"].setdefault(name, {})
+            for label, count in bins.items():
+                dst[label] = dst.get(label, 0) + count
+    return merged
+
+def report(db, show_holes=True): # Text summary of a coverage database
+    lines = [f"Covergroup {db['name']}: {db['samples']} samples"]
+    total = covered = 0
+    for name, bins in db["items"].items():
+        goal = db.get("at_least", {}).get(name, 1)
+        hit = [label for label, c in bins.items() if c >= goal]
+        total += len(bins)
+        covered += len(hit)
+        pct = 100.0 * len(hit) / len(bins) if bins else 100.0
+        lines.append(f"  {name:<32} {len(hit):>5}/{len(bins):<5} {pct:6.2f}%")
+        if show_holes and len(hit) < len(bins):
+            holes = [label for label, c in bins.items() if c < goal]
+            shown = ", ".join(holes[:8]) + (" ..." if len(holes) > 8 else "")
+            lines.append(f"      holes: {shown}")
+    pct = 100.0 * covered / total if total else 100.0
+    lines.append(f"  {'TOTAL':<32} {covered:>5}/{total:<5} {pct:6.2f}%")
+    return "\n".join(lines)
+
+
+# --- CLI ---
+def _load(path):
+    with open(path) as f:
+        return json.load(f)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m svtb.coverage")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_merge = sub.add_parser("merge", help="merge coverage databases from several runs/seeds")
+    p_merge.add_argument("-o", "--output", required=True)
+    p_merge.add_argument("dbs", nargs="+")
+    p_report = sub.add_parser("report", help="print coverage summary and holes")
+    p_report.add_argument("dbs", nargs="+")
+    p_report.add_argument("--no-holes", action="store_true")
+    args = parser.parse_args(argv)
+
+    merged = merge_dbs(_load(p) for p in args.dbs)
+    if args.cmd == "merge":
+        with open(args.output, "w") as f:
+            json.dump(merged, f, indent=1)
+    print(report(merged, show_holes=not getattr(args, "no_holes", False)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+# Data memory model and store-heavy kernels
+#
+# Memory is the byte-addressed reference (RV32I loads/stores by width_type_enum). DmemModel
+# plays the DMEM side of the core's data port in cocotb: requests and read data both use
+# ready/valid, a request is taken at most once every `accept_cycles` cycles (a slow SRAM or
+# bus), read data comes back `read_latency` cycles after the request, writes land by byte
+# enable, and a request stalled by DMEM must hold still or the model fails the test.
+#
+# Kernels are memory-op streams of memset / memcpy loops, with the loop's ALU instructions
+# as non-memory ops, for benchmarking memory_stage against a slow DMEM:
+#
+#   python -m svtb.dmem bench           # cycles per kernel for each store buffer configuration
+#   python -m svtb.dmem bench -j 3 --config buffer_wc
+import argparse
+import json
+import random
+import sys
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import cocotb
+from cocotb.triggers import FallingEdge, ReadOnly, RisingEdge
+
+from svtb import farm, rv32i
+from svtb.sim import find_benches, run_make
+
+
+WORD_BYTES = 4
+SIZES = {"WT_BYTE": 1, "WT_BYTE_UNSIGNED": 1, "WT_HALF_WORD": 2, "WT_HALF_WORD_UNSIGNED": 2, "WT_WORD": 4}
+SIGNED = {"WT_BYTE", "WT_HALF_WORD"}
+WIDTH_NAMES = {v: k for k, v in rv32i.WIDTH_TYPES.items()}
+
+
+# --- Reference memory ---
+class Memory:
+    def __init__(self, fill=0):
+        self.bytes = {} # Bytes never written read as `fill`
+        self.fill = fill
+
+    def _span(self, addr, width): # Bytes of an access; past the word they are dropped, as in memory_stage
+        end = min(addr + SIZES[width], (addr // WORD_BYTES + 1) * WORD_BYTES)
+        return range(addr, end)
+
+    def copy(self):
+        other = Memory(self.fill)
+        other.bytes = dict(self.bytes)
+        return other
+
+    def load(self, addr, width): # -> 32-bit extended value
+        span = self._span(addr, width)
+        value = sum(self.bytes.get(a, self.fill) << (8 * i) for i, a in enumerate(span))
+        if width in SIGNED:
+            value = rv32i.to_signed(value, 8 * SIZES[width]) & 0xFFFF_FFFF
+        return value
+
+    def store(self, addr, width, value):
+        for i, a in enumerate(self._span(addr, width)):
+            self.bytes[a] = (value >> (8 * i)) & 0xFF
+
+    def read_word(self, addr):
+        base = addr & ~(WORD_BYTES - 1)
+        return sum(self.bytes.get(base + i, self.fill) << (8 * i) for i in range(WORD_BYTES))
+
+    def write_word(self, addr, data, byte_enablers):
+        base = addr & ~(WORD_BYTES - 1)
+        for i in range(WORD_BYTES):
+            if byte_enablers >> i & 1:
+                self.bytes[base + i] = (data >> (8 * i)) & 0xFF
+
+    def diff(self, other, limit=8): # Addresses whose bytes differ, for failure messages
+        addrs = sorted(set(self.bytes) | set(other.bytes))
+        return [
+            f"{a:#x}: {self.bytes.get(a, self.fill):#04x} != {other.bytes.get(a, other.fill):#04x}"
+            for a in addrs if self.bytes.get(a, self.fill) != other.bytes.get(a, other.fill)
+        ][:limit]
+
+
+def byte_enablers(addr, width):
+    return ((1 << SIZES[width]) - 1) << (addr % WORD_BYTES) & ((1 << WORD_BYTES) - 1)
+
+
+# --- Kernels ---
+# Ops: ("alu",), ("load", addr, width), ("store", addr, width, data). Loops are unrolled
+# `unroll` times, as a compiler would for these kernels.
+def memset(dst, n, value, width="WT_BYTE", unroll=4, loop_ops=3): # unroll x sb/sh/sw; addi ptr; addi count; bne
+    size = SIZES[width]
+    ops = []
+    for i in range(0, n // size, unroll):
+        ops += [("store", dst + (i + u) * size, width, value) for u in range(unroll)]
+        ops += [("alu",)] * loop_ops
+    return ops
+
+def memcpy(memory, dst, src, n, width="WT_BYTE", unroll=4, loop_ops=4): # unroll x (load; store); addi src, dst, count; bne
+    size = SIZES[width]
+    ops = []
+    for i in range(0, n // size, unroll):
+        for u in range(unroll):
+            offset = (i + u) * size
+            value = memory.load(src + offset, width)
+            memory.store(dst + offset, width, value)
+            ops += [("load", src + offset, width), ("store", dst + offset, width, value)]
+        ops += [("alu",)] * loop_ops
+    return ops
+
+def kernels(size=64, seed=0): # name -> (initial memory, ops)
+    rng = random.Random(seed)
+    result = {}
+    for width in ("WT_BYTE", "WT_HALF_WORD", "WT_WORD"):
+        label = width[3:].lower()
+        result[f"memset_{label}"] = (Memory(), memset(0x100, size, 0xA5A5A5A5 & ((1 << 8 * SIZES[width]) - 1), width))
+        memory = Memory()
+        for a in range(0x400, 0x400 + size):
+            memory.bytes[a] = rng.getrandbits(8)
+        result[f"memcpy_{label}"] = (memory.copy(), memcpy(memory, 0x800, 0x400, size, width))
+    return result
+
+
+# --- cocotb model ---
+class DmemModel:
+    def __init__(self, dut, memory=None, accept_cycles=1, read_latency=1, stall_prob=0.0, clock="clk"):
+        self.dut = dut
+        self.clk = getattr(dut, clock)
+        self.memory = memory if memory is not None else Memory()
+        self.accept_cycles = max(accept_cycles, 1)
+        self.read_latency = max(read_latency, 1)
+        self.stall_prob = stall_prob
+        self.cycle = 0
+        self.reads = 0
+        self.writes = 0
+        self.stalled_cycles = 0 # Request offered but not taken
+        self.requests = [] # (write_enable, addr, data, byte_enablers) in the order DMEM took them
+        self.responses = deque() # (cycle the data is offered from, data)
+        self._busy = 0
+        self._held = None
+        self._task = None
+
+    def start(self):
+        self._task = cocotb.start_soon(self._run())
+        return self
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def idle(self):
+        return not self.responses and self._held is None
+
+    def _request(self):
+        d = self.dut
+        return (int(d.write_enable.value), int(d.addr.value), int(d.data_to_dmem.value), int(d.byte_enablers.value))
+
+    async def _run(self):
+        d = self.dut
+        d.data_to_dmem_ready_in.value = 0
+        d.data_from_dmem_valid_in.value = 0
+        d.data_from_dmem.value = 0
+        while True:
+            await FallingEdge(self.clk)
+            ready = self._busy == 0 and random.random() >= self.stall_prob
+            d.data_to_dmem_ready_in.value = int(ready)
+            respond = bool(self.responses) and self.responses[0][0] <= self.cycle
+            d.data_from_dmem_valid_in.value = int(respond)
+            d.data_from_dmem.value = self.responses[0][1] if respond else 0
+
+            await ReadOnly()
+            if int(d.data_to_dmem_valid_out.value):
+                request = self._request()
+                assert self._held is None or request == self._held, (
+                    f"DMEM cycle {self.cycle}: stalled request changed from {self._held} to {request}"
+                )
+                if ready:
+                    write, addr, data, enables = request
+                    self.requests.append(request)
+                    if write:
+                        self.memory.write_word(addr, data, enables)
+                        self.writes += 1
+                    else:
+                        self.responses.append((self.cycle + self.read_latency, self.memory.read_word(addr)))
+                        self.reads += 1
+                    self._busy = self.accept_cycles
+                    self._held = None
+                else:
+                    self._held = request
+                    self.stalled_cycles += 1
+            else:
+                assert self._held is None, f"DMEM cycle {self.cycle}: request {self._held} withdrawn before it was taken"
+            if respond and int(d.data_from_dmem_ready_out.value):
+                self.responses.popleft()
+
+            await RisingEdge(self.clk)
+            self.cycle += 1
+            self._busy = max(self._busy - 1, 0)
+
+
+# --- Benchmark ---
+BENCH_DIR = "bench"
+BENCH_ENV = "DMEM_BENCH_OUT" # Where test_kernel_benchmark writes its JSON
+BENCH_DMEM = dict(accept_cycles=3, read_latency=2)
+CONFIGS = { # name -> memory_stage parameters
+    "no_buffer": {"STORE_BUFFER_EN": 0},
+    "buffer": {"WRITE_COMBINING": 0},
+    "buffer_wc": {},
+}
+
+def bench(configs, jobs=3, log=print): # Run the bench's kernel test once per configuration
+    target = next(b for b in find_benches() if b.name.endswith("memory_stage"))
+
+    def run(name):
+        params = CONFIGS[name]
+        farm.build(target, params)
+        out = target.sim_dir / BENCH_DIR / f"{name}.json"
+        proc = run_make(
+            target,
+            make_vars={"SIM_BUILD": farm.sim_build(params), "COCOTB_TEST_FILTER": "test_kernel_benchmark", "WAVES": 0},
+            env=dict(farm.compile_env(target, params), **{BENCH_ENV: str(out)}),
+        )
+        if proc.returncode != 0 or not out.exists():
+            raise RuntimeError(f"{name}: benchmark run failed\n{(proc.stdout + proc.stderr)[-2000:]}")
+        log(f"[done] {name}")
+        return name, json.loads(out.read_text())
+
+    with ThreadPoolExecutor(max_workers=max(jobs, 1)) as pool:
+        return dict(pool.map(run, configs))
+
+def report(results, baseline="no_buffer"): # Cycles per kernel and configuration, change against the baseline
+    names = list(results)
+    kernels_ = list(next(iter(results.values()))["kernels"])
+    lines = [f"{'kernel':16}" + "".join(f" {n:>18}" for n in names)]
+    for k in kernels_:
+        row = f"{k:16}"
+        base = results[baseline]["kernels"][k]["cycles"] if baseline in results else None
+        for n in names:
+            r = results[n]["kernels"][k]
+            change = f" ({100 * (r['cycles'] - base) / base:+.0f}%)" if base and n != baseline else ""
+            row += f" {str(r['cycles']) + change:>18}"
+        lines.append(row)
+    lines.append(f"{'DMEM writes':16}" + "".join(
+        f" {sum(r['writes'] for r in results[n]['kernels'].values()):>18}" for n in names
+    ))
+    return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m svtb.dmem")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("bench", help="memory_stage kernel cycles per store buffer configuration")
+    p.add_argument("--config", action="append", choices=list(CONFIGS), help="default: all")
+    p.add_argument("-j", "--jobs", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    results = bench(args.config or list(CONFIGS), args.jobs)
+    print(report(results))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+# Seed farm
+#
+# Runs one bench under many COCOTB_RANDOM_SEED values in parallel. Every parameter set is
+# compiled once into its own SIM_BUILD; the seed runs then only relaunch vvp on that image,
+# each writing its own results file. cocotb reseeds `random` per test from the regression
+# seed and the test name, so a failing (test, seed, params) replays exactly with a test filter.
+#
+#   python -m svtb.farm ff/dff_async_rst_n --seeds 500 -j 16
+#   python -m svtb.farm ff/dff_sync_rst_n -P WIDTH=4,8,32 --seeds 200 --max-failures 3
+#   python -m svtb.farm --replay modules/ff/dff_sync_rst_n/sim/farm/failures.jsonl
+#
+# Failures are appended to <sim>/farm/failures.jsonl, one JSON record per failing test with
+# the make invocation that reproduces it.
+import argparse
+import itertools
+import json
+import random
+import shlex
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from svtb import rtl
+from svtb.sim import find_benches, parse_results, run_make
+
+
+FARM_DIR = "farm"
+
+
+# --- Parameter sets ---
+def param_sets(specs): # ["WIDTH=1,8", "DEPTH=4"] -> [{WIDTH: 1, DEPTH: 4}, {WIDTH: 8, DEPTH: 4}]
+    axes = []
+    for spec in specs:
+        key, values = spec.split("=", 1)
+        axes.append([(key, v) for v in values.split(",")])
+    return [dict(combo) for combo in itertools.product(*axes)]
+
+def param_label(params):
+    return "_".join(f"{k}{v}" for k, v in params.items()) or "default"
+
+def compile_env(bench, params): # Top-level overrides go through the environment so the Makefile's += still applies
+    if not params:
+        return {}
+    return {"COMPILE_ARGS": " ".join(f"-P{bench.toplevel}.{k}={v}" for k, v in params.items())}
+
+def sim_build(params):
+    return f"sim_build_{FARM_DIR}/{param_label(params)}"
+
+
+# --- Runs ---
+def build(bench, params, timeout=None): # Compile the image the seed runs share
+    build_dir = sim_build(params)
+    proc = run_make(
+        bench, make_vars={"SIM_BUILD": build_dir},
+        env=compile_env(bench, params), target=f"{build_dir}/sim.vvp", timeout=timeout,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"{bench.name} ({param_label(params)}): compile failed\n{proc.stdout[-2000:]}{proc.stderr[-2000:]}")
+
+def replay_command(bench, seed, params, test=None):
+    env = compile_env(bench, params)
+    words = [f"{k}={shlex.quote(v)}" for k, v in env.items()]
+    words += ["make", "-C", str(bench.sim_dir.relative_to(rtl.REPO_ROOT)), f"SIM_BUILD={sim_build(params)}", f"COCOTB_RANDOM_SEED={seed}"]
+    if test:
+        words.append(f"COCOTB_TEST_FILTER={test}")
+    return " ".join(words)
+
+def run_seed(bench, seed, params, timeout=None):
+    results = bench.sim_dir / FARM_DIR / f"results_{param_label(params)}_{seed}.xml"
+    results.parent.mkdir(parents=True, exist_ok=True)
+    start = time.monotonic()
+    proc = run_make(
+        bench,
+        make_vars={
+            "SIM_BUILD": sim_build(params),
+            "COCOTB_RANDOM_SEED": seed,
+            "COCOTB_RESULTS_FILE": results,
+            "WAVES": 0,
+        },
+        env=dict(compile_env(bench, params), WAVE_CAPTURE="0"),
+        timeout=timeout,
+    )
+    cases = parse_results(results)
+    failed = [c["name"] for c in cases if not c["passed"]]
+    if not cases and proc.returncode != 0:
+        failed = ["<simulation>"] # Crashed before writing any result
+    else:
+        results.unlink(missing_ok=True)
+    return {
+        "seed": seed,
+        "params": params,
+        "tests": len(cases),
+        "failed": failed,
+        "wall_s": round(time.monotonic() - start, 3),
+        "log_tail": (proc.stdout + proc.stderr)[-4000:] if failed else "",
+    }
+
+def farm(bench, seeds, params_list=None, jobs=8, max_failures=1, out=None, timeout=None, log=print):
+    params_list = params_list or [{}]
+    out = Path(out) if out else bench.sim_dir / FARM_DIR / "failures.jsonl"
+    out.parent.mkdir(parents=True, exist_ok=True)
+
+    for params in params_list:
+        log(f"[build] {bench.name} ({param_label(params)})")
+        build(bench, params, timeout)
+
+    runs = [(seed, params) for params in params_list for seed in seeds]
+    failures = []
+    passed = 0
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=max(jobs, 1)) as pool, open(out, "a") as f:
+        futures = [pool.submit(run_seed, bench, seed, params, timeout) for seed, params in runs]
+        for future in as_completed(futures):
+            result = future.result()
+            if not result["failed"]:
+                passed += 1
+                continue
+            for test in result["failed"]:
+                record = {
+                    "bench": bench.name,
+                    "test": test,
+                    "seed": result["seed"],
+                    "params": result["params"],
+                    "replay": replay_command(bench, result["seed"], result["params"], None if test == "<simulation>" else test),
+                }
+                failures.append(record)
+                f.write(json.dumps(record) + "\n")
+                f.flush()
+                log(f"[FAIL] {test} seed={result['seed']} {param_label(result['params'])}")
+            if len(failures) >= max_failures:
+                log(f"[stop] {len(failures)} failures, cancelling the remaining seeds")
+                for pending in futures:
+                    pending.cancel()
+                break
+
+    log(f"{passed} seed runs passed, {len(failures)} failing tests in {time.monotonic() - start:.1f} s -> {out}")
+    return failures
+
+
+def replay(path, log=print): # Rerun every recorded failure with its exact seed, test and parameters
+    benches = {b.name: b for b in find_benches()}
+    still_failing = 0
+    with open(path) as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    for r in records:
+        bench = benches[r["bench"]]
+        build(bench, r["params"])
+        make_vars = {"SIM_BUILD": sim_build(r["params"]), "COCOTB_RANDOM_SEED": r["seed"]}
+        if r["test"] != "<simulation>":
+            make_vars["COCOTB_TEST_FILTER"] = r["test"]
+        proc = run_make(bench, make_vars=make_vars, env=compile_env(bench, r["params"]))
+        status = "FAIL" if proc.returncode != 0 else "pass"
+        still_failing += status == "FAIL"
+        log(f"[{status}] {r['test']} seed={r['seed']} {param_label(r['params'])}")
+    return still_failing
+
+
+# --- CLI ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m svtb.farm")
+    parser.add_argument("bench", nargs="?", help="bench path suffix, e.g. ff/dff_sync_rst_n")
+    parser.add_argument("--seeds", type=int, default=100, help="number of random seeds")
+    parser.add_argument("--seed-list", type=int, nargs="*", help="explicit seeds instead of --seeds")
+    parser.add_argument("-P", "--param", action="append", default=[], help="toplevel parameter NAME=v1,v2,...")
+    parser.add_argument("-j", "--jobs", type=int, default=8)
+    parser.add_argument("-k", "--max-failures", type=int, default=1, help="stop after this many failing tests")
+    parser.add_argument("--timeout", type=float, help="seconds per simulator run")
+    parser.add_argument("-o", "--out", help="failure record (JSONL)")
+    parser.add_argument("--replay", metavar="JSONL", help="rerun the failures recorded in a JSONL file")
+    args = parser.parse_args(argv)
+
+    if args.replay:
+        return 1 if replay(args.replay) else 0
+    if not args.bench:
+        parser.error("bench is required")
+
+    matches = [b for b in find_benches() if b.name.endswith(args.bench)]
+    if len(matches) != 1:
+        parser.error(f"{args.bench}: expected exactly one matching bench, found {[b.name for b in matches]}")
+    seeds = args.seed_list or random.sample(range(1, 2**31), args.seeds)
+    failures = farm(
+        matches[0], seeds, param_sets(args.param), args.jobs,
+        args.max_failures, args.out, args.timeout,
+    )
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,421 @@
+# FSM transition extraction and transition-tour stimulus
+#
+# The state transition graph is read off the synthesized netlist rather than the source
+# text: svtb.netlist evaluates the next-state logic for every (state, input) combination,
+# starting from the state the reset input forces and following reachable states only. State
+# registers declared with a `typedef enum` type get their member names as state labels.
+#
+# From the graph, the shortest input sequence that takes every transition at least once is
+# built as a directed Chinese postman tour: unbalanced states are paired up with the cheapest
+# connecting paths (an assignment problem over BFS distances, reset counting as a one-cycle
+# move back to the reset state) and the resulting Eulerian multigraph is walked once. The tour
+# does not have to return to the reset state, so it ends as soon as the last transition is taken.
+#
+#   python -m svtb.fsm modules/fsm/example/rtl/fsm_example.sv
+#
+# writes <module>/tb/<top>_model.py (transition table, state labels, tour) and, unless it
+# already exists, a <module>/tb/tb_<top>.py that drives the tour and a random walk through
+# the DUT while checking outputs and state against FsmModel.
+import argparse
+import re
+import sys
+from collections import defaultdict, deque
+from pathlib import Path
+
+import numpy as np
+from cocotb.triggers import FallingEdge, ReadOnly, RisingEdge
+
+from svtb import rtl
+from svtb.coverage import Coverpoint, Covergroup
+from svtb.netlist import Netlist
+
+
+MAX_INPUT_BITS = 16
+MAX_STATES = 4096
+RESET_SAMPLES = 4096
+CLOCK_RE = re.compile(r"clk|clock", re.I)
+RESET_RE = re.compile(r"rst|reset", re.I)
+
+
+# --- Extraction ---
+def _combos(widths): # Every combination of the given inputs, as one array per input
+    keys = np.arange(1 << sum(widths.values()), dtype=np.uint64)
+    out, shift = {}, 0
+    for name, width in widths.items():
+        out[name] = (keys >> np.uint64(shift)) & np.uint64((1 << width) - 1)
+        shift += width
+    return out
+
+def _state_types(path): # {variable: enum members} for variables declared with an enum typedef
+    enums = rtl.parse_enums(path)
+    text = rtl.strip_comments(Path(path).read_text())
+    types = {}
+    for name, members in enums.items():
+        for m in re.finditer(rf"\b{name}\s+([\w\s,]+);", text):
+            for var in m.group(1).split(","):
+                types[var.strip()] = members
+    return types
+
+
+class Fsm:
+    def __init__(self, path, top=None, params=None):
+        self.path = Path(path)
+        self.top = top or self.path.stem
+        self.net = Netlist.build((self.top, [self.path]), params)
+        if not self.net.state:
+            raise ValueError(f"{self.top}: no state registers")
+        self.clocks = [n for n in self.net.inputs if CLOCK_RE.fullmatch(n)]
+        self.inputs = {n: w for n, w in self.net.inputs.items() if n not in self.clocks}
+        self.outputs = {n: w for n, w in self.net.outputs.items() if not n.endswith("_next")}
+        self.state = dict(self.net.state)
+        if sum(self.inputs.values()) > MAX_INPUT_BITS:
+            raise ValueError(f"{self.top}: {sum(self.inputs.values())} input bits, at most {MAX_INPUT_BITS} are enumerated")
+
+        types = _state_types(self.path)
+        self.enums = {n: {v: k for k, v in types[n].items()} for n in self.state if n in types}
+        self.reset, self.reset_state = self._find_reset()
+        self.table = {} # (state, inputs) -> (next state, outputs)
+        self.transitions = defaultdict(list) # (state, next state) -> [inputs], reset deasserted
+        self._explore()
+
+    def _evaluate(self, states, inputs): # Parallel arrays of state tuples / input arrays -> (next tuples, output tuples)
+        values = dict(inputs)
+        for k, name in enumerate(self.state):
+            values[name] = np.array([s[k] for s in states], dtype=np.uint64)
+        out = self.net(values)
+        nxt = list(zip(*(out[f"{n}_next"].tolist() for n in self.state)))
+        outs = list(zip(*(out[n].tolist() for n in self.outputs))) if self.outputs else [()] * len(nxt)
+        return nxt, outs
+
+    def _find_reset(self): # The 1-bit reset-looking input whose value forces one next state from anywhere
+        rng = np.random.default_rng(0)
+        states = list(zip(*(rng.integers(0, 1 << w, RESET_SAMPLES, dtype=np.uint64).tolist() for w in self.state.values())))
+        for name in (n for n, w in self.inputs.items() if w == 1 and RESET_RE.search(n)):
+            for value in (0, 1):
+                inputs = {n: rng.integers(0, 1 << w, RESET_SAMPLES, dtype=np.uint64) for n, w in self.inputs.items()}
+                inputs[name] = np.full(RESET_SAMPLES, value, dtype=np.uint64)
+                nxt, _ = self._evaluate(states, inputs)
+                if len(set(nxt)) == 1:
+                    return (name, value), nxt[0]
+        raise ValueError(f"{self.top}: no 1-bit reset input forces a single state")
+
+    def _explore(self): # BFS over the states reachable from reset, every input combination per state
+        combos = _combos(self.inputs)
+        n_combos = len(next(iter(combos.values()))) if combos else 1
+        combo_tuples = list(zip(*(c.tolist() for c in combos.values()))) if combos else [()]
+        reset_pos = list(self.inputs).index(self.reset[0])
+        seen = {self.reset_state}
+        frontier = [self.reset_state]
+        while frontier:
+            states = [s for s in frontier for _ in range(n_combos)]
+            inputs = {n: np.tile(c, len(frontier)) for n, c in combos.items()}
+            nxt, outs = self._evaluate(states, inputs)
+            frontier = []
+            for i, (state, n, o) in enumerate(zip(states, nxt, outs)):
+                combo = combo_tuples[i % n_combos]
+                self.table[(state, combo)] = (n, o)
+                if combo[reset_pos] == self.reset[1]:
+                    continue
+                self.transitions[(state, n)].append(combo)
+                if n not in seen:
+                    seen.add(n)
+                    frontier.append(n)
+            if len(seen) > MAX_STATES:
+                raise ValueError(f"{self.top}: more than {MAX_STATES} reachable states")
+        self.states = sorted(seen)
+
+    def label(self, state):
+        parts = []
+        for (name, _), value in zip(self.state.items(), state):
+            if name in self.enums and value in self.enums[name]:
+                parts.append(self.enums[name][value])
+            else:
+                parts.append(f"{name}={value:#x}")
+        return ",".join(parts)
+
+    def reset_inputs(self): # Reset asserted, everything else 0
+        return tuple(self.reset[1] if n == self.reset[0] else 0 for n in self.inputs)
+
+
+# --- Transition tour ---
+def _bfs(moves, source): # Shortest paths from source: {state: (previous state, inputs)}
+    parent = {source: None}
+    queue = deque([source])
+    while queue:
+        s = queue.popleft()
+        for t, inputs in moves[s].items():
+            if t not in parent:
+                parent[t] = (s, inputs)
+                queue.append(t)
+    return parent
+
+def _path(parent, target): # [(state, next state, inputs)] from the BFS source to target
+    steps = []
+    while parent[target] is not None:
+        s, inputs = parent[target]
+        steps.append((s, target, inputs))
+        target = s
+    return steps[::-1]
+
+def assignment(cost): # Hungarian method: row -> column of a minimum-cost perfect matching (square matrix)
+    n = len(cost)
+    INF = float("inf")
+    u, v = [0] * (n + 1), [0] * (n + 1)
+    match = [0] * (n + 1) # column -> row, 1-based
+    for row in range(1, n + 1):
+        match[0] = row
+        col0 = 0
+        minv = [INF] * (n + 1)
+        way = [0] * (n + 1)
+        used = [False] * (n + 1)
+        while match[col0]:
+            used[col0] = True
+            r, delta, col1 = match[col0], INF, 0
+            for col in range(1, n + 1):
+                if not used[col]:
+                    cur = cost[r - 1][col - 1] - u[r] - v[col]
+                    if cur < minv[col]:
+                        minv[col], way[col] = cur, col0
+                    if minv[col] < delta:
+                        delta, col1 = minv[col], col
+            for col in range(n + 1):
+                if used[col]:
+                    u[match[col]] += delta
+                    v[col] -= delta
+                else:
+                    minv[col] -= delta
+            col0 = col1
+        while col0:
+            col1 = way[col0]
+            match[col0] = match[col1]
+            col0 = col1
+    rows = [0] * n
+    for col in range(1, n + 1):
+        rows[match[col] - 1] = col - 1
+    return rows
+
+def tour(fsm): # -> [(state, next state, inputs)], shortest walk from reset taking every transition
+    required = list(fsm.transitions)
+    moves = defaultdict(dict) # Cheapest way to go s -> t in one cycle, reset included
+    for s in fsm.states:
+        moves[s][fsm.reset_state] = fsm.reset_inputs()
+    for (s, t), combos in fsm.transitions.items():
+        moves[s][t] = combos[0]
+
+    balance = defaultdict(int) # in - out over the required transitions
+    for s, t in required:
+        balance[s] -= 1
+        balance[t] += 1
+    # Deadhead paths start where transitions pile up and end where they are missing. The walk
+    # may stop anywhere: one extra path may end at the reset state for free (the virtual edge
+    # closing the walk into a circuit).
+    starts = [s for s in fsm.states for _ in range(max(balance[s], 0))] + [fsm.reset_state]
+    ends = [s for s in fsm.states for _ in range(max(-balance[s], 0))] + [None]
+    parents = {s: _bfs(moves, s) for s in set(starts)}
+    unreachable = len(fsm.states) * 2
+    cost = [[0 if t is None else len(_path(parents[s], t)) if t in parents[s] else unreachable for t in ends] for s in starts]
+    edges = [(s, t, combos[0], True) for (s, t), combos in fsm.transitions.items()]
+    closing = None
+    for i, j in enumerate(assignment(cost)):
+        if ends[j] is None:
+            closing = len(edges)
+            edges.append((starts[i], fsm.reset_state, None, False))
+        else:
+            edges += [(a, b, inputs, False) for a, b, inputs in _path(parents[starts[i]], ends[j])]
+
+    # Hierholzer from the reset state, then open the circuit at the virtual edge
+    out = defaultdict(list)
+    for k, (s, _, _, _) in enumerate(edges):
+        out[s].append(k)
+    stack, circuit = [(fsm.reset_state, None)], []
+    while stack:
+        s, k = stack[-1]
+        if out[s]:
+            e = out[s].pop()
+            stack.append((edges[e][1], e))
+        else:
+            stack.pop()
+            if k is not None:
+                circuit.append(k)
+    circuit.reverse()
+    if len(circuit) != len(edges):
+        raise RuntimeError(f"{fsm.top}: transition graph is not connected from the reset state")
+    cut = circuit.index(closing)
+    walk = [edges[k] for k in circuit[cut + 1:] + circuit[:cut]]
+    while walk and not walk[-1][3]: # Trailing moves take no new transition
+        walk.pop()
+    return [(s, t, inputs) for s, t, inputs, _ in walk]
+
+
+# --- Model ---
+class FsmModel:
+    # Runs a generated <top>_model module: TABLE[(state, inputs)] -> (next state, outputs),
+    # states by label, inputs and outputs as tuples in INPUTS / OUTPUTS order
+    def __init__(self, tables):
+        self.t = tables
+        self.index = {label: i for i, label in enumerate(tables.STATES)}
+        self.transition_index = {pair: i for i, pair in enumerate(tables.TRANSITIONS)}
+        self.state = tables.RESET_STATE
+
+    def reset(self):
+        self.state = self.t.RESET_STATE
+
+    def outputs(self, inputs):
+        return self.t.TABLE[(self.state, tuple(inputs))][1]
+
+    def step(self, inputs): # -> index of the transition taken, -1 under reset
+        nxt, _ = self.t.TABLE[(self.state, tuple(inputs))]
+        taken = self.transition_index.get((self.state, nxt), -1) if not self.in_reset(inputs) else -1
+        self.state = nxt
+        return taken
+
+    def in_reset(self, inputs):
+        name, value = self.t.RESET
+        return inputs[list(self.t.INPUTS).index(name)] == value
+
+    def covergroup(self):
+        return Covergroup(self.t.TOP, ["state", "transition"], points=[
+            Coverpoint("state", {label: i for i, label in enumerate(self.t.STATES)}),
+            Coverpoint("transition", {f"{a}->{b}": i for i, (a, b) in enumerate(self.t.TRANSITIONS)}),
+        ])
+
+
+async def drive_fsm(dut, model, steps): # Reset, then one input tuple per cycle, checked against the model
+    t = model.t
+    names = list(t.INPUTS)
+    clk = getattr(dut, t.CLOCK)
+    cov = model.covergroup()
+
+    reset_inputs = [t.RESET[1] if n == t.RESET[0] else 0 for n in names]
+    for name, value in zip(names, reset_inputs):
+        getattr(dut, name).value = value
+    await RisingEdge(clk)
+    model.reset()
+
+    for cycle, inputs in enumerate(steps):
+        await FallingEdge(clk)
+        for name, value in zip(names, inputs):
+            getattr(dut, name).value = value
+        await ReadOnly()
+        context = f"cycle {cycle}, state {model.state}, inputs {dict(zip(names, inputs))}"
+        for name, reg_value in zip(t.STATE_SIGNALS, t.STATES[model.state]):
+            got = int(getattr(dut, name).value)
+            assert got == reg_value, f"{context}: {name} = {got:#x}, expected {reg_value:#x}"
+        for name, expected in zip(t.OUTPUTS, model.outputs(inputs)):
+            got = int(getattr(dut, name).value)
+            assert got == expected, f"{context}: {name} = {got:#x}, expected {expected:#x}"
+        cov.sample(model.index[model.state], model.step(inputs))
+        await RisingEdge(clk)
+    return cov
+
+
+# --- Code generation ---
+def generate_model(fsm, steps, command):
+    labels = {s: fsm.label(s) for s in fsm.states}
+    signals = [n for n in fsm.state if n.isidentifier()] if all(n.isidentifier() for n in fsm.state) else []
+    lines = [
+        f"# Generated by `{command}`, regenerate instead of editing",
+        f"# {fsm.top}: {len(fsm.states)} reachable states, {len(fsm.transitions)} transitions,"
+        f" transition tour of {len(steps)} cycles",
+        f"TOP = {fsm.top!r}",
+        f"CLOCK = {fsm.clocks[0]!r}" if fsm.clocks else "CLOCK = None",
+        f"INPUTS = {fsm.inputs!r}",
+        f"OUTPUTS = {fsm.outputs!r}",
+        f"RESET = {fsm.reset!r} # (input, asserted value)",
+        f"STATE_SIGNALS = {signals!r}",
+        "",
+        "STATES = { # label -> state register values",
+        *(f"    {labels[s]!r}: {s!r}," for s in fsm.states),
+        "}",
+        f"RESET_STATE = {labels[fsm.reset_state]!r}",
+        "",
+        "TRANSITIONS = [ # (state, next state) with reset deasserted",
+        *(f"    ({labels[s]!r}, {labels[t]!r})," for s, t in sorted(fsm.transitions)),
+        "]",
+        "",
+        "TABLE = { # (state, inputs) -> (next state, outputs)",
+        *(f"    ({labels[s]!r}, {i!r}): ({labels[n]!r}, {o!r})," for (s, i), (n, o) in sorted(fsm.table.items())),
+        "}",
+        "",
+        "TOUR = [ # Inputs per cycle after reset, every transition at least once",
+        *(f"    {i!r}, # {labels[s]} -> {labels[t]}" for s, t, i in steps),
+        "]",
+    ]
+    return "\n".join(lines) + "\n"
+
+def generate_tb(fsm):
+    model = f"{fsm.top}_model"
+    return f'''import cocotb
+from cocotb.clock import Clock
+
+import os
+import random
+SEED = int(os.environ.get("COCOTB_RANDOM_SEED", 666))
+random.seed(SEED)
+RANDOM_CYCLES = 512
+
+import {model}
+from svtb.fsm import FsmModel, drive_fsm
+
+
+# --- Helpers ---
+def random_inputs(): # Reset now and then, any input combination otherwise
+    name, asserted = {model}.RESET
+    inputs = [random.getrandbits(width) for width in {model}.INPUTS.values()]
+    inputs[list({model}.INPUTS).index(name)] = asserted if random.random() < 0.05 else 1 - asserted
+    return tuple(inputs)
+
+
+# --- Tests ---
+@cocotb.test()
+async def test_transition_tour(dut): # Shortest input sequence taking every transition, checked against the model
+    cocotb.start_soon(Clock(dut.{fsm.clocks[0]}, 2, unit="ns").start())
+    cov = await drive_fsm(dut, FsmModel({model}), {model}.TOUR)
+    assert cov.goals_met(), f"uncovered: {{cov.holes()}}"
+
+
+@cocotb.test()
+async def test_random_inputs(dut): # Random walk with occasional resets
+    cocotb.start_soon(Clock(dut.{fsm.clocks[0]}, 2, unit="ns").start())
+    await drive_fsm(dut, FsmModel({model}), [random_inputs() for _ in range(RANDOM_CYCLES)])
+'''
+
+
+# --- CLI ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m svtb.fsm")
+    parser.add_argument("rtl", help="SystemVerilog file of the FSM")
+    parser.add_argument("--top", help="module name (default: file name)")
+    parser.add_argument("-P", "--param", action="append", default=[], help="parameter NAME=VALUE")
+    parser.add_argument("-o", "--out", help="testbench directory (default: <module>/tb)")
+    parser.add_argument("--force-tb", action="store_true", help="overwrite an existing tb_<top>.py")
+    parser.add_argument("--dry-run", action="store_true", help="print the graph and tour only")
+    args = parser.parse_args(argv)
+
+    fsm = Fsm(args.rtl, args.top, dict(p.split("=", 1) for p in args.param))
+    if not fsm.clocks:
+        parser.error(f"{fsm.top}: no clock input")
+    steps = tour(fsm)
+    print(f"{fsm.top}: {len(fsm.states)} states, {len(fsm.transitions)} transitions, reset {fsm.reset[0]}={fsm.reset[1]}")
+    for (s, t), combos in sorted(fsm.transitions.items()):
+        print(f"  {fsm.label(s)} -> {fsm.label(t)} ({len(combos)} input combinations)")
+    print(f"tour: {len(steps)} cycles ({len(steps) - len(fsm.transitions)} beyond one cycle per transition)")
+    if args.dry_run:
+        return 0
+
+    out = Path(args.out) if args.out else Path(args.rtl).resolve().parent.parent / "tb"
+    out.mkdir(parents=True, exist_ok=True)
+    rtl_path = Path(args.rtl).resolve()
+    shown = rtl_path.relative_to(rtl.REPO_ROOT) if rtl_path.is_relative_to(rtl.REPO_ROOT) else rtl_path
+    command = " ".join(["python -m svtb.fsm", str(shown)] + [f"-P {p}" for p in args.param])
+    (out / f"{fsm.top}_model.py").write_text(generate_model(fsm, steps, command))
+    print(f"wrote {out / f'{fsm.top}_model.py'}")
+    tb = out / f"tb_{fsm.top}.py"
+    if args.force_tb or not tb.exists():
+        tb.write_text(generate_tb(fsm))
+        print(f"wrote {tb}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
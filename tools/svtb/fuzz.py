@@ -0,0 +1,296 @@
+# Differential fuzzing with ISS-side novelty filtering
+#
+# Random programs are cheap on svtb.iss and expensive in RTL. A campaign generates RV32I
+# programs in bulk from seeds, runs them on the ISS across a process pool and reduces every
+# run to a set of behaviour features:
+#   op:<instr>:<class a>:<class b>        operand value classes per instruction
+#   br:<cond>:<taken>:<relation>          branch outcomes against the signed/unsigned relation
+#   raw:<producer>:<consumer>:<rs>:<d>    register RAW hazards at distance 1..3 (load-use included)
+#   mem:<store>:<load>:<d>                load after a store to the same word
+#   rd:<instr>:<x0|rs1|other>             destination aliasing
+# Only programs that add a feature the corpus has not seen are kept. The corpus persists in
+# .fuzz_corpus/corpus.jsonl across campaigns, and only it is replayed in RTL: the
+# test_fuzz_corpus tests of decode_stage (decoder and regfile) and execute_stage (ALU, branch
+# compare, targets) step through each program on the ISS and compare the stage against it.
+# Those benches drive each stage with the ISS operand values and the forward selects fixed to
+# the register file path, so the raw: and mem: features only diversify the kept programs: no
+# forwarding, load-use or store-to-load path of the RTL is exercised until a whole-pipeline
+# bench replays the corpus. An empty corpus (.fuzz_corpus/ is not committed) skips the tests.
+#
+#   python -m svtb.fuzz run --programs 20000 -j 8           # grow the corpus
+#   python -m svtb.fuzz run --programs 20000 --cosim        # ... and replay the new programs in RTL
+#   python -m svtb.fuzz status
+import argparse
+import hashlib
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+from svtb import rtl, rv32i
+from svtb.asm import DATA_BASE
+from svtb.iss import TOHOST, Iss, IssError
+from svtb.sim import find_benches, parse_results, run_make
+
+
+CORPUS_DIR = rtl.REPO_ROOT / ".fuzz_corpus"
+CORPUS_ENV = "FUZZ_CORPUS"      # Corpus directory the RTL benches replay
+CAMPAIGN_ENV = "FUZZ_CAMPAIGN"  # Replay only the programs this campaign added
+COSIM_BENCHES = ("decode_stage", "execute_stage")
+PROGRAM_LENGTH = 48 # Body instructions
+MAX_STEPS = 1000
+
+_OP = rv32i.OPCODES
+_BASE = 8     # x8 holds DATA_BASE for loads/stores, never written
+_LINK = 31    # x31 stays 0: jalr targets are absolute, so a jump can never land before it
+_REGS = [0, 1, 5, 6, 7, 10, 11, 12] # Few registers: hazards and aliasing come often
+_CORNERS = [0, 1, 0xFFFF_FFFF, 0x7FFF_FFFF, 0x8000_0000, 0x0000_07FF, 0xFFFF_F800]
+
+
+# --- Programs ---
+def _li(rd, value): # lui + addi, as the assembler's li
+    hi = ((value + 0x800) >> 12) & 0xFFFFF
+    return [
+        rv32i.encode_u(_OP["OPCODE_U"], rd, hi << 12),
+        rv32i.encode_i(_OP["OPCODE_I_ALU"], rd, 0, rd, value & 0xFFF),
+    ]
+
+def _imm12(rng):
+    return rng.choice([0, 1, -1, 2047, -2048, rng.randrange(-2048, 2048)])
+
+def generate(seed, length=PROGRAM_LENGTH): # -> instruction words; terminates by construction (forward control flow only)
+    rng = random.Random(seed)
+    words = _li(_BASE, DATA_BASE)
+    for r in _REGS[1:]:
+        words += _li(r, rng.choice(_CORNERS + [rng.getrandbits(32)]))
+    reg = lambda: rng.choice(_REGS)
+    body_end = len(words) + length # Index of the epilogue, the furthest forward target
+
+    while len(words) < body_end:
+        room = body_end - len(words) # Instructions left, the forward reach
+        kind = rng.choices(
+            ["r", "i", "shift", "u", "load", "store", "branch", "jal", "jalr"],
+            weights=[6, 5, 2, 1, 4, 3, 4, 1, 1],
+        )[0]
+        if kind == "r":
+            f3 = rng.randrange(8)
+            f7 = 0x20 if f3 in (0, 5) and rng.random() < 0.5 else 0
+            words.append(rv32i.encode(_OP["OPCODE_R"], reg(), f3, reg(), reg(), f7))
+        elif kind == "i":
+            words.append(rv32i.encode_i(_OP["OPCODE_I_ALU"], reg(), rng.choice([0, 2, 3, 4, 6, 7]), reg(), _imm12(rng)))
+        elif kind == "shift":
+            f3, f7 = rng.choice([(1, 0), (5, 0), (5, 0x20)])
+            shamt = rng.choice([0, 1, 31, rng.randrange(32)])
+            words.append(rv32i.encode_i(_OP["OPCODE_I_ALU"], reg(), f3, reg(), (f7 << 5) | shamt))
+        elif kind == "u":
+            op = rng.choice([_OP["OPCODE_U"], _OP["OPCODE_U_PC"]])
+            words.append(rv32i.encode_u(op, reg(), rng.getrandbits(20) << 12))
+        elif kind in ("load", "store"):
+            f3 = rng.choice([0, 1, 2, 4, 5] if kind == "load" else [0, 1, 2])
+            size = 1 << (f3 & 3)
+            offset = rng.randrange(0, 64, size) if rng.random() < 0.9 else rng.randrange(64)
+            if kind == "load":
+                words.append(rv32i.encode_i(_OP["OPCODE_I_LOAD"], reg(), f3, _BASE, offset))
+            else:
+                words.append(rv32i.encode_s(_OP["OPCODE_S"], f3, _BASE, reg(), offset))
+        elif kind == "branch" and room > 1:
+            skip = rng.randint(1, min(room - 1, 4))
+            words.append(rv32i.encode_b(_OP["OPCODE_B"], rng.choice([0, 1, 4, 5, 6, 7]), reg(), reg(), 4 * (skip + 1)))
+        elif kind == "jal" and room > 1:
+            skip = rng.randint(0, min(room - 1, 3))
+            words.append(rv32i.encode_j(_OP["OPCODE_J"], reg(), 4 * (skip + 1)))
+        elif kind == "jalr" and room > 1: # jalr rd, target(x31)
+            skip = rng.randint(0, min(room - 1, 3))
+            words.append(rv32i.encode_i(_OP["OPCODE_I_JUMP"], reg(), 0, _LINK, 4 * (len(words) + skip + 1)))
+
+    words.append(rv32i.encode_s(_OP["OPCODE_S"], 2, _BASE, 0, TOHOST - DATA_BASE)) # sw x0, TOHOST: exit 0
+    words.append(rv32i.encode_j(_OP["OPCODE_J"], 0, 0))
+    return words
+
+
+# --- Features ---
+def _value_class(v):
+    if v in (0, 1, 0xFFFF_FFFF, 0x7FFF_FFFF, 0x8000_0000):
+        return {0: "zero", 1: "one", 0xFFFF_FFFF: "m1", 0x7FFF_FFFF: "max", 0x8000_0000: "min"}[v]
+    if v < 0x800:
+        return "small"
+    return "neg" if v >> 31 else "pos"
+
+def _instr_key(instr, op): # Mnemonic-level identity: opcode, funct3 and the funct7 bit that matters
+    f3 = rv32i.funct3(instr)
+    alt = rv32i.funct7(instr) >> 5 if op == "OPCODE_R" or (op == "OPCODE_I_ALU" and f3 == 5) else 0
+    if op in ("OPCODE_U", "OPCODE_U_PC", "OPCODE_J"):
+        return op[7:]
+    return f"{op[7:]}.{f3}{'a' if alt else ''}"
+
+_NAMES = {v: k for k, v in _OP.items()}
+
+def steps(words, max_steps=MAX_STEPS, memory=None): # Replay on the ISS: one dict per retired instruction with operand values
+    iss = Iss(words, memory)
+    out = []
+    while iss.exit_code is None:
+        if iss.instret >= max_steps:
+            raise IssError(f"no store to TOHOST after {max_steps} instructions")
+        pc = iss.pc
+        instr = iss.fetch(pc)
+        a, b = iss.regs[rv32i.rs1(instr)], iss.regs[rv32i.rs2(instr)]
+        iss.trace = []
+        iss.step()
+        t = iss.trace[0]
+        t.update(a=a, b=b, op=_NAMES[instr & 0x7F], value=iss.regs[t["rd"]] if t["rd"] else None)
+        out.append(t)
+    return out
+
+def features(trace): # -> set of feature strings of one run
+    feats = set()
+    history = [] # Last three retired steps, youngest last
+    for t in trace:
+        op, instr = t["op"], t["instr"]
+        key = _instr_key(instr, op)
+        if op in ("OPCODE_R", "OPCODE_B", "OPCODE_S"):
+            feats.add(f"op:{key}:{_value_class(t['a'])}:{_value_class(t['b'])}")
+        elif op in ("OPCODE_I_ALU", "OPCODE_I_JUMP"):
+            imm = rv32i.immediate(instr, "IMM_I")
+            feats.add(f"op:{key}:{_value_class(t['a'])}:{_value_class(imm & 0x1F if rv32i.funct3(instr) in (1, 5) else imm)}")
+        else:
+            feats.add(f"op:{key}")
+        if op == "OPCODE_B":
+            feats.add(f"br:{rv32i.funct3(instr)}:{int(t['taken'])}:{int(rv32i.operand_relation(t['a'], t['b']))}")
+        if op not in ("OPCODE_S", "OPCODE_B"):
+            rd = rv32i.rd(instr)
+            feats.add(f"rd:{key}:{'x0' if rd == 0 else 'rs1' if rd == rv32i.rs1(instr) else 'other'}")
+
+        for operand in rv32i.OPCODE_SOURCES[op]:
+            src = getattr(rv32i, operand)(instr)
+            if src == 0:
+                continue
+            for distance, prev in enumerate(reversed(history), 1):
+                if prev["rd"] == src:
+                    feats.add(f"raw:{prev['class']}:{t['class']}:{operand}:{distance}")
+                    break
+        if op == "OPCODE_I_LOAD":
+            for distance, prev in enumerate(reversed(history), 1):
+                if prev["class"] == "store" and prev["addr"] >> 2 == t["addr"] >> 2:
+                    feats.add(f"mem:{rv32i.funct3(prev['instr'])}:{rv32i.funct3(instr)}:{distance}")
+                    break
+        history = (history + [t])[-3:]
+    return feats
+
+def evaluate(seed): # Pool worker: -> (seed, words, sorted features), or (seed, None, error) for a broken generator
+    words = generate(seed)
+    try:
+        return seed, words, sorted(features(steps(words)))
+    except IssError as e:
+        return seed, None, str(e)
+
+
+# --- Corpus ---
+def corpus_path(directory=None):
+    return Path(directory or os.environ.get(CORPUS_ENV) or CORPUS_DIR) / "corpus.jsonl"
+
+def load_corpus(directory=None, campaign=None): # -> [entry]; campaign filters to the programs it added
+    path = corpus_path(directory)
+    if not path.exists():
+        return []
+    entries = [json.loads(line) for line in path.read_text().splitlines() if line.strip()]
+    return [e for e in entries if campaign is None or e["campaign"] == campaign]
+
+def program_id(words):
+    return hashlib.sha1(b"".join(w.to_bytes(4, "little") for w in words)).hexdigest()[:12]
+
+def campaign(programs, jobs=os.cpu_count(), seed=None, directory=None, log=print): # -> (campaign number, added entries)
+    corpus = load_corpus(directory)
+    seen = set().union(*(e["features"] for e in corpus))
+    ids = {e["id"] for e in corpus}
+    number = max((e["campaign"] for e in corpus), default=0) + 1
+    base = random.Random(seed).getrandbits(48) if seed is not None else random.getrandbits(48)
+
+    added = []
+    errors = 0
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=max(jobs or 1, 1)) as pool:
+        # Results arrive in seed order, so a campaign with a fixed --seed distils the same corpus
+        for s, words, feats in pool.map(evaluate, range(base, base + programs), chunksize=64):
+            if words is None:
+                errors += 1
+                continue
+            new = set(feats) - seen
+            if not new or program_id(words) in ids:
+                continue
+            seen |= new
+            entry = {"id": program_id(words), "campaign": number, "seed": s, "words": words, "new": sorted(new), "features": feats}
+            ids.add(entry["id"])
+            added.append(entry)
+    elapsed = time.perf_counter() - start
+
+    path = corpus_path(directory)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a") as f:
+        for entry in added:
+            f.write(json.dumps(entry) + "\n")
+    log(
+        f"campaign {number}: {programs} programs in {elapsed:.1f}s ({programs / elapsed:.0f}/s), "
+        f"kept {len(added)} ({100 * len(added) / max(programs, 1):.2f}%), {len(seen)} features"
+        + (f", {errors} generator errors" if errors else "")
+    )
+    return number, added
+
+
+# --- RTL co-simulation ---
+def cosim(number=None, directory=None, log=print): # Replay the corpus (or one campaign of it) in the stage benches
+    benches = [b for b in find_benches() if b.name.endswith(COSIM_BENCHES)]
+    env = {CORPUS_ENV: str(Path(directory or CORPUS_DIR).resolve())}
+    if number is not None:
+        env[CAMPAIGN_ENV] = str(number)
+
+    def run(bench):
+        proc = run_make(bench, make_vars={"COCOTB_TEST_FILTER": "test_fuzz_corpus", "WAVES": 0}, env=env)
+        results = parse_results(bench.sim_dir / "results.xml")
+        return bench, proc.returncode == 0 and results and all(r["passed"] for r in results), proc
+
+    failed = 0
+    with ThreadPoolExecutor(max_workers=len(benches) or 1) as pool:
+        for bench, ok, proc in pool.map(run, benches):
+            log(f"[{'pass' if ok else 'FAIL'}] {bench.name}")
+            if not ok:
+                failed += 1
+                log((proc.stdout + proc.stderr)[-2000:])
+    return failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m svtb.fuzz")
+    parser.add_argument("--corpus", default=None, help=f"default: {CORPUS_DIR}")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("run", help="generate, filter on the ISS and grow the corpus")
+    p.add_argument("--programs", type=int, default=10_000)
+    p.add_argument("-j", "--jobs", type=int, default=os.cpu_count())
+    p.add_argument("--seed", type=int, default=None)
+    p.add_argument("--cosim", action="store_true", help="replay the programs this campaign kept in RTL")
+    p = sub.add_parser("cosim", help="replay the corpus in RTL")
+    p.add_argument("--campaign", type=int, default=None)
+    sub.add_parser("status", help="corpus size and feature counts per kind")
+    args = parser.parse_args(argv)
+
+    if args.cmd == "run":
+        number, added = campaign(args.programs, args.jobs, args.seed, args.corpus)
+        if args.cosim and added:
+            return int(cosim(number, args.corpus) > 0)
+    elif args.cmd == "cosim":
+        return int(cosim(args.campaign, args.corpus) > 0)
+    else:
+        corpus = load_corpus(args.corpus)
+        seen = set().union(*(e["features"] for e in corpus))
+        kinds = {}
+        for f in seen:
+            kinds[f.split(":")[0]] = kinds.get(f.split(":")[0], 0) + 1
+        print(f"{len(corpus)} programs, {max((e['campaign'] for e in corpus), default=0)} campaigns, {len(seen)} features")
+        print("  ".join(f"{k} {v}" for k, v in sorted(kinds.items())))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,177 @@
+# Golden-vector record/replay
+#
+# Record mode captures the input and output values of a DUT once per step into a compressed
+# columnar .npz (one uint64 column per 64 bits of each signal, plus an X mask), together with
+# the hash of the RTL it was recorded on. Replay mode streams the inputs back through the
+# DUT, collects the outputs into preallocated arrays and compares everything in one batch,
+# so refactors are re-checked at simulator speed without running a Python reference model.
+#
+#   GOLDEN=record make     # reference-checked run, writes tb/golden/<name>.npz
+#   make                   # replays tb/golden/<name>.npz, the test fails when it is missing
+#
+# Vectors stay valid as long as the port list (names and widths) is unchanged; the RTL hash
+# only tells whether the replay is checking a different revision than the recorded one.
+import hashlib
+import os
+from pathlib import Path
+
+import numpy as np
+from cocotb.triggers import Timer
+
+from svtb import rtl
+from svtb.regress import file_hash, sv_closure
+from svtb.sim import Bench
+
+
+GOLDEN_ENV = "GOLDEN"
+GOLDEN_DIR = "golden"
+MAX_MISMATCHES = 10
+
+
+# --- Keys ---
+def rtl_hash(sim_dir=None): # Hash of the bench's VERILOG_SOURCES and everything they instantiate
+    bench = Bench(Path(sim_dir or Path.cwd()) / "Makefile")
+    sources, _ = sv_closure(bench.sources, rtl.definition_index())
+    h = hashlib.sha256()
+    for path in sorted(p for p in sources if p.exists()):
+        h.update(f"{path.relative_to(rtl.REPO_ROOT)}:{file_hash(path)}\n".encode())
+    return h.hexdigest()
+
+def interface_hash(widths):
+    return hashlib.sha256(repr(sorted(widths.items())).encode()).hexdigest()
+
+def mode(): # "record", or "replay" (default)
+    return os.environ.get(GOLDEN_ENV, "replay")
+
+def golden_path(tb_dir, name):
+    return Path(tb_dir) / GOLDEN_DIR / f"{name}.npz"
+
+
+# --- Columns ---
+def _words(width):
+    return max((width + 63) // 64, 1)
+
+def _split(value, words): # int -> [low 64 bits, next 64 bits, ...]
+    return [(value >> (64 * w)) & 0xFFFF_FFFF_FFFF_FFFF for w in range(words)]
+
+def _join(row): # [low 64 bits, ...] -> int
+    return sum(int(word) << (64 * w) for w, word in enumerate(row))
+
+def _read(handle): # (value, is_x)
+    try:
+        return int(handle.value), False
+    except ValueError:
+        return 0, True
+
+
+class VectorRecorder:
+    # Samples named inputs and outputs once per step; handles are read as-is, so call
+    # sample() after the DUT settled
+    def __init__(self, dut, inputs, outputs):
+        self.dut = dut
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.handles = {n: getattr(dut, n) for n in self.inputs + self.outputs}
+        self.widths = {n: len(h) for n, h in self.handles.items()}
+        self.rows = {n: [] for n in self.handles}
+        self.xs = {n: [] for n in self.handles}
+
+    def __len__(self):
+        return len(self.rows[self.inputs[0]]) if self.inputs else 0
+
+    def sample(self):
+        for name, handle in self.handles.items():
+            value, x = _read(handle)
+            self.rows[name].append(_split(value, _words(self.widths[name])))
+            self.xs[name].append(x)
+
+    def save(self, path, **meta):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        arrays = {}
+        for name in self.handles:
+            arrays[f"v:{name}"] = np.array(self.rows[name], dtype=np.uint64).reshape(-1, _words(self.widths[name]))
+            arrays[f"x:{name}"] = np.array(self.xs[name], dtype=bool)
+        arrays["inputs"] = np.array(self.inputs)
+        arrays["outputs"] = np.array(self.outputs)
+        arrays["widths"] = np.array([self.widths[n] for n in self.inputs + self.outputs], dtype=np.int64)
+        arrays["interface_hash"] = np.array(interface_hash(self.widths))
+        arrays["rtl_hash"] = np.array(meta.pop("rtl_hash", None) or rtl_hash())
+        for key, value in meta.items():
+            arrays[f"meta:{key}"] = np.array(value)
+        np.savez_compressed(path, **arrays)
+        return path
+
+
+class GoldenVectors:
+    def __init__(self, path):
+        self.path = Path(path)
+        with np.load(self.path) as data:
+            self.inputs = [str(n) for n in data["inputs"]]
+            self.outputs = [str(n) for n in data["outputs"]]
+            names = self.inputs + self.outputs
+            self.widths = dict(zip(names, (int(w) for w in data["widths"])))
+            self.values = {n: data[f"v:{n}"] for n in names}
+            self.xs = {n: data[f"x:{n}"] for n in names}
+            self.interface_hash = str(data["interface_hash"])
+            self.rtl_hash = str(data["rtl_hash"])
+            self.meta = {k[5:]: data[k].item() for k in data.files if k.startswith("meta:")}
+
+    def __len__(self):
+        return len(self.values[self.inputs[0]])
+
+    async def replay(self, dut, settle=None): # Drive every input row, compare all outputs at the end
+        handles = {n: getattr(dut, n) for n in self.inputs + self.outputs}
+        widths = {n: len(h) for n, h in handles.items()}
+        if interface_hash(widths) != self.interface_hash:
+            raise AssertionError(f"{self.path.name}: port list changed since recording ({self.widths} -> {widths})")
+        current = rtl_hash()
+        dut._log.info(
+            f"{self.path.name}: {len(self)} vectors, "
+            + ("same RTL as recorded" if current == self.rtl_hash else f"recorded on {self.rtl_hash[:12]}, checking {current[:12]}")
+        )
+
+        n = len(self)
+        got = {name: np.zeros_like(self.values[name]) for name in self.outputs}
+        got_x = {name: np.zeros(n, dtype=bool) for name in self.outputs}
+        inputs = [(handles[name], [_join(r) for r in self.values[name]]) for name in self.inputs]
+        outputs = [(name, handles[name], _words(widths[name])) for name in self.outputs]
+        for i in range(n):
+            for handle, column in inputs:
+                handle.value = column[i]
+            await (settle() if settle else Timer(1, "ps"))
+            for name, handle, words in outputs:
+                value, x = _read(handle)
+                got[name][i] = _split(value, words)
+                got_x[name][i] = x
+
+        self.check(got, got_x)
+
+    def check(self, got, got_x): # Batch compare; X in the recording is a don't-care
+        failures = []
+        for name in self.outputs:
+            expected, expected_x = self.values[name], self.xs[name]
+            bad = ((got[name] != expected).any(axis=1) | got_x[name]) & ~expected_x
+            for row in np.flatnonzero(bad)[:MAX_MISMATCHES]:
+                stim = ", ".join(f"{n}={_join(self.values[n][row]):#x}" for n in self.inputs)
+                seen = "x" if got_x[name][row] else f"{_join(got[name][row]):#x}"
+                failures.append(f"vector {row}: {name} = {seen}, expected {_join(expected[row]):#x} ({stim})")
+            if bad.any():
+                failures.append(f"{name}: {int(bad.sum())}/{len(bad)} vectors differ")
+        assert not failures, f"{self.path.name}:\n" + "\n".join(failures)
+
+
+# --- Tests ---
+async def golden(dut, path, inputs, outputs, record, settle=None):
+    # GOLDEN=record: `record(recorder)` drives reference-checked stimulus and calls
+    # recorder.sample() after every step. Otherwise the stored vectors are replayed.
+    path = Path(path)
+    if mode() == "record":
+        recorder = VectorRecorder(dut, inputs, outputs)
+        await record(recorder)
+        recorder.save(path)
+        dut._log.info(f"{len(recorder)} vectors recorded to {path}")
+    elif path.exists():
+        await GoldenVectors(path).replay(dut, settle)
+    else: # A missing recording is an unchecked DUT, not a pass
+        raise AssertionError(f"no golden vectors at {path}: record them with {GOLDEN_ENV}=record make and commit the file")
@@ -0,0 +1,274 @@
+# Ready/valid protocol monitors
+#
+# Checks the contract of notes/about_ready_valid.txt on every handshake interface of a DUT:
+#   - valid must not drop before the clock edge where ready is high (the handshake)
+#   - data must stay stable while valid && !ready
+# Signals are sampled at rising clock edges, but the monitor only subscribes to the clock
+# when a sample is actually needed: idle interfaces wait for valid to rise, stalled ones
+# for a change of valid, ready, data or a disable signal, and streaming ones (valid && ready)
+# for valid or ready to fall, counting the handshakes in between from the clock period. A long
+# stall or a long burst therefore costs a couple of wakeups instead of one per cycle.
+#
+#   @cocotb.test()
+#   @protocol_checked
+#   async def test_random_backpressure(dut): ...
+#
+# Interfaces are discovered from the toplevel's port list by naming convention:
+# X_valid_in / X_ready_out (the DUT receives) and X_valid_out / X_ready_in (the DUT sends),
+# with data X or X_* flowing the same way. Without a prefix (valid_in, ready_out), the data is
+# every other input or output port no prefixed pair claims. Resets (*rst*, *reset*, active low
+# if named *_n) and flushes disable the checks. Ports off the convention are named per interface:
+#
+#   @protocol_checked(data={"out": ["read_data_M"], "data_to_dmem": ["addr", "data_to_dmem"]})
+import functools
+import re
+
+import cocotb
+from cocotb.triggers import First, RisingEdge
+from cocotb.utils import get_sim_time
+
+from svtb import rtl
+from svtb.harness import parse_header
+
+
+MAX_VIOLATIONS = 20 # Reported per interface, the rest are only counted
+CLOCK_RE = re.compile(r"clk|clock")
+DISABLE_RE = re.compile(r"rst|reset|flush")
+HANDSHAKE_RE = re.compile(r"(?P<prefix>\w*?)_?(?P<kind>valid|ready)_(?P<dir>in|out)")
+
+
+# --- Monitor ---
+def _bit(handle): # X/Z read as 0
+    value = handle.value
+    return int(value) if value.is_resolvable else 0
+
+
+class ReadyValidMonitor:
+    def __init__(self, clk, valid, ready, data=(), disable=(), name=None):
+        # disable: [(handle, active value)], checks are off while any of them is active
+        self.clk = clk
+        self.valid = valid
+        self.ready = ready
+        self.data = list(data)
+        self.disable = list(disable)
+        self.name = name or valid._name
+        self.log = valid._log
+        self.violations = []
+        self.violation_count = 0
+        self.transfers = 0
+        self.stall_cycles = 0
+        self.wakeups = 0
+        self.pending = None # (offered at cycle, data, stall counted up to cycle) while valid && !ready
+        self.last_transfer = None # Cycle of the latest handshake
+        self._streaming = None # Cycle a valid && ready burst started at
+        self.t0 = None
+        self.period = None
+        self._task = None
+
+    def start(self):
+        self._task = cocotb.start_soon(self._run())
+        return self
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    # --- Sampling ---
+    def _now(self):
+        return get_sim_time("step")
+
+    def _cycle(self):
+        return int((self._now() - self.t0) // self.period)
+
+    def _disabled(self):
+        return any(h.value.is_resolvable and int(h.value) == active for h, active in self.disable)
+
+    def _data(self):
+        return tuple(str(h.value) for h in self.data)
+
+    def _describe(self, data):
+        return ", ".join(f"{h._name}={v}" for h, v in zip(self.data, data)) or "no data signals"
+
+    def _violate(self, rule, cycle, message):
+        self.violation_count += 1
+        if len(self.violations) < MAX_VIOLATIONS:
+            violation = {
+                "interface": self.name,
+                "rule": rule,
+                "cycle": cycle,
+                "time_ns": get_sim_time("ns"),
+                "message": message,
+            }
+            self.violations.append(violation)
+            self.log.error(f"[{self.name}] cycle {cycle} ({violation['time_ns']} ns): {message}")
+
+    async def _run(self):
+        last_edge = None
+        while True:
+            await RisingEdge(self.clk)
+            self.wakeups += 1
+            # The first two edges give the clock period; until then every edge is sampled
+            now = self._now()
+            if self.t0 is None:
+                self.t0 = now
+            elif self.period is None:
+                self.period = now - last_edge
+            last_edge = now
+            cycle = self._cycle() if self.period else 0
+
+            if self._disabled():
+                self.pending = None
+                continue
+            valid, ready = _bit(self.valid), _bit(self.ready)
+            data = self._data()
+            if self.pending is not None:
+                since, offered, counted = self.pending
+                if not valid:
+                    self._violate("valid_dropped", cycle,
+                                  f"valid dropped without a handshake, offered at cycle {since} ({self._describe(offered)})")
+                elif data != offered:
+                    self._violate("data_changed", cycle,
+                                  f"data changed while stalled since cycle {since}: {self._describe(offered)} -> {self._describe(data)}")
+                self.stall_cycles += cycle - counted
+            self.pending = (self.pending[0] if self.pending else cycle, data, cycle) if valid and not ready else None
+            if valid and ready:
+                self.last_transfer = cycle
+            if not self.period:
+                self.transfers += valid and ready
+                continue
+
+            if valid and ready: # Every edge is a handshake until one of them falls
+                self._streaming = cycle
+                await First(self.valid.falling_edge, self.ready.falling_edge, *(h.value_change for h, _ in self.disable))
+                self._streaming = None
+                self.last_transfer = self._cycle()
+                self.transfers += 1 + self.last_transfer - cycle
+            elif valid: # Stalled: nothing to check until something moves
+                await First(
+                    self.valid.value_change, self.ready.value_change,
+                    *(h.value_change for h in self.data), *(h.value_change for h, _ in self.disable),
+                )
+                if self._disabled():
+                    self.pending = None
+            else:
+                await self.valid.rising_edge
+
+    # --- Results ---
+    def handshakes(self): # Transfers so far, including a burst still in progress
+        if self._streaming is None:
+            return self.transfers
+        return self.transfers + 1 + self._cycle() - self._streaming
+
+    def status(self): # One line for hang reports
+        valid, ready = _bit(self.valid), _bit(self.ready)
+        if valid and not ready:
+            since = self.pending[0] if self.pending else "?"
+            state = f"STALLED: valid without ready since cycle {since} ({self._describe(self._data())})"
+        elif valid:
+            state = "streaming"
+        else:
+            state = "idle: no valid"
+        last = "never" if self.last_transfer is None else f"at cycle {self.last_transfer}"
+        return f"{self.name}: valid={valid} ready={ready}, {state}, last handshake {last}, {self.handshakes()} transfers"
+
+    def summary(self):
+        return (
+            f"{self.name}: {self.transfers} transfers, {self.stall_cycles} stall cycles, "
+            f"{self.violation_count} violations, {self.wakeups} wakeups"
+        )
+
+
+# --- Discovery ---
+def _port_list(dut): # [(name, direction)] of the toplevel, from its RTL declaration
+    paths = rtl.definition_index().get(dut._name)
+    if not paths:
+        raise ValueError(f"{dut._name}: module declaration not found under {rtl.REPO_ROOT}")
+    return [(p["name"], p["dir"]) for p in parse_header(paths[0], dut._name)["ports"]]
+
+def discover(dut): # -> (clock ports, [{name, valid, ready, data, disable}] per ready/valid pair of the toplevel)
+    ports = _port_list(dut)
+    names = {n for n, _ in ports}
+    handshake = {n for n in names if HANDSHAKE_RE.fullmatch(n)}
+    clocks = [n for n in names if CLOCK_RE.fullmatch(n)]
+    disable = [(n, 0 if n.endswith("_n") else 1) for n in sorted(names) if DISABLE_RE.search(n) and n not in handshake]
+    prefixes = {HANDSHAKE_RE.fullmatch(n)["prefix"].lower() for n in handshake} - {""}
+    interfaces = []
+    for name in sorted(handshake):
+        m = HANDSHAKE_RE.fullmatch(name)
+        if m["kind"] != "valid":
+            continue
+        prefix, direction = m["prefix"], m["dir"]
+        sep = "_" if prefix else ""
+        ready = f"{prefix}{sep}ready_{'out' if direction == 'in' else 'in'}"
+        if ready not in names:
+            continue
+        port_dir = "input" if direction == "in" else "output"
+        others = set(handshake) | set(clocks) | {n for n, _ in disable}
+        data = [n for n, d in ports if d == port_dir and n not in others]
+        claims = [prefix.lower()] if prefix else prefixes
+        # X, X_* (any case) flowing the same way; unprefixed pairs take the ones no prefix claims
+        data = [n for n in data if any(n.lower() == p or n.lower().startswith(f"{p}_") for p in claims) == bool(prefix)]
+        interfaces.append({
+            "name": prefix or ("in" if direction == "in" else "out"),
+            "valid": name,
+            "ready": ready,
+            "data": data,
+            "disable": disable,
+        })
+    return clocks, interfaces
+
+_shared = [] # Monitors of the running test, shared by every user (protocol checks, watchdog)
+_users = 0
+
+def attach_monitors(dut, clock=None, data=None): # One started monitor per discovered interface, shared within a test
+    # data: {interface name: [port names]} replaces the discovered data, also on monitors already shared
+    global _users
+    if not _users:
+        clocks, interfaces = discover(dut)
+        clock = clock or (clocks[0] if clocks else None)
+        if clock is None:
+            raise ValueError(f"{dut._name}: no clock port found")
+        for i in interfaces:
+            _shared.append(ReadyValidMonitor(
+                getattr(dut, clock), getattr(dut, i["valid"]), getattr(dut, i["ready"]),
+                data=[getattr(dut, n) for n in i["data"]],
+                disable=[(getattr(dut, n), active) for n, active in i["disable"]],
+                name=i["name"],
+            ).start())
+    for m in _shared:
+        if data and m.name in data: # Before the monitors' first clock edge: nothing sampled yet
+            m.data = [getattr(dut, n) for n in data[m.name]]
+    _users += 1
+    return list(_shared)
+
+def release_monitors(): # Stop the shared monitors once their last user is done
+    global _users
+    _users -= 1
+    if not _users:
+        for m in _shared:
+            m.stop()
+        _shared.clear()
+
+def check_monitors(monitors): # Fail on any protocol violation
+    for m in monitors:
+        m.log.info(m.summary())
+    bad = [m for m in monitors if m.violation_count]
+    assert not bad, "ready/valid protocol violations:\n" + "\n".join(
+        f"  {v['interface']} cycle {v['cycle']}: {v['message']}" for m in bad for v in m.violations
+    )
+
+def protocol_checked(test_fn=None, *, data=None): # Decorator: monitor every ready/valid interface during the test
+    if test_fn is None: # @protocol_checked(data=...)
+        return functools.partial(protocol_checked, data=data)
+
+    @functools.wraps(test_fn)
+    async def wrapper(dut, *args, **kwargs):
+        monitors = attach_monitors(dut, data=data)
+        try:
+            await test_fn(dut, *args, **kwargs)
+            check_monitors(monitors)
+        finally:
+            release_monitors()
+
+    return wrapper
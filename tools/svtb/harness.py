@@ -0,0 +1,307 @@
+# Multi-DUT harness
+#
+# Small leaf modules spend far more time in iverilog compile and simulator startup than in
+# their tests. The harness generator wraps many DUTs (or many parameterizations of one DUT)
+# as sub-instances of one generated toplevel and reruns their existing tb_*.py tests
+# against each sub-instance, so one simulator process covers every combination.
+#
+#   python -m svtb.harness ff/dff_async_rst_n:WIDTH=4,32 mux/mux_generic:CHANNELS_COUNT=2,5:CHANNELS_WIDTH=4,8
+#   python -m svtb.harness --leaf                  # every leaf module, a few widths each
+#   make -C harness_build
+#
+# Every sub-instance port is driven/observed through a top-level variable <inst>__<port>,
+# parameters become localparams <inst>__<PARAM>. Tests receive a SubDut proxy, so
+# dut.data, dut.WIDTH and len(dut.data) keep working unchanged.
+import argparse
+import importlib
+import itertools
+import json
+import os
+import re
+import sys
+from pathlib import Path
+
+import cocotb
+
+from svtb import rtl
+from svtb.sim import find_benches
+
+
+TOPLEVEL = "svtb_harness"
+MANIFEST = "harness.json"
+
+# Leaf modules and the parameterizations --leaf sweeps
+LEAF_SPECS = [
+    "ff/dff_async_rst_n:WIDTH=4,8,32",
+    "ff/dff_async_rst_n_en:WIDTH=4,8,32",
+    "ff/dff_sync_rst_n:WIDTH=4,8,32",
+    "ff/dff_sync_rst_n_en:WIDTH=4,8,32",
+    "mux/mux_generic:CHANNELS_COUNT=2,5,8:CHANNELS_WIDTH=4,8",
+    "fsm/counters",
+]
+
+
+# --- Module headers ---
+def _group(text, start, open_="(", close=")"): # Contents of the bracket group opening at text[start]
+    depth = 0
+    for i in range(start, len(text)):
+        if text[i] == open_:
+            depth += 1
+        elif text[i] == close:
+            depth -= 1
+            if depth == 0:
+                return text[start + 1:i], i + 1
+    raise ValueError("unbalanced brackets")
+
+def _split_top(text): # Split on commas outside (), [] and {}
+    items, depth, current = [], 0, ""
+    for c in text:
+        if c in "([{":
+            depth += 1
+        elif c in ")]}":
+            depth -= 1
+        if c == "," and depth == 0:
+            items.append(current)
+            current = ""
+        else:
+            current += c
+    items.append(current)
+    return [item.strip() for item in items if item.strip()]
+
+def parse_header(path, module=None): # Parameters and ANSI ports of a module declaration
+    text = rtl.strip_comments(Path(path).read_text())
+    pattern = re.escape(module) if module else r"\w+"
+    m = re.search(rf"\bmodule\s+({pattern})\b\s*", text)
+    if not m:
+        raise ValueError(f"{path}: module {module or ''} not found")
+    name, pos = m.group(1), m.end()
+
+    params = []
+    if text[pos] == "#":
+        pos = text.index("(", pos)
+        body, pos = _group(text, pos)
+        for item in _split_top(body):
+            decl, _, default = item.partition("=")
+            words = re.sub(r"\b(parameter|localparam)\b", "", decl).split()
+            params.append({
+                "name": words[-1],
+                "type": " ".join(words[:-1]),
+                "default": default.strip(),
+            })
+        while text[pos].isspace():
+            pos += 1
+
+    ports = []
+    body, _ = _group(text, pos)
+    direction = "input"
+    for item in _split_top(body):
+        words = item.split()
+        if words[0] in ("input", "output", "inout"):
+            direction = words.pop(0)
+        decl = " ".join(words[:-1])
+        ports.append({"name": words[-1], "dir": direction, "type": decl or "logic"})
+    return {"module": name, "params": params, "ports": ports}
+
+
+# --- Specs ---
+def parse_spec(spec): # "ff/dff_async_rst_n:WIDTH=1,4" -> (bench filter, [{WIDTH: 1}, {WIDTH: 4}])
+    name, *assignments = spec.split(":")
+    axes = []
+    for a in assignments:
+        key, values = a.split("=", 1)
+        axes.append([(key, v) for v in values.split(",")])
+    return name, [dict(combo) for combo in itertools.product(*axes)]
+
+def _find_bench(name, benches):
+    matches = [b for b in benches if b.name.endswith(name)]
+    if len(matches) != 1:
+        raise ValueError(f"{name}: expected exactly one matching bench, found {[b.name for b in matches]}")
+    return matches[0]
+
+
+# --- Generation ---
+def _prefixed(text, inst, names): # Rewrite parameter references to the per-instance localparams
+    for name in names:
+        text = re.sub(rf"\b{name}\b", f"{inst}__{name}", text)
+    return text
+
+def build_instances(specs, benches=None):
+    benches = benches if benches is not None else find_benches()
+    instances = []
+    for spec in specs:
+        name, combos = parse_spec(spec)
+        bench = _find_bench(name, benches)
+        source = next(s for s in bench.sources if bench.toplevel in rtl.definitions(s)["module"])
+        header = parse_header(source, bench.toplevel)
+        known = {p["name"] for p in header["params"]}
+        for combo in combos:
+            unknown = set(combo) - known
+            if unknown:
+                raise ValueError(f"{bench.toplevel}: unknown parameters {sorted(unknown)}")
+            instances.append({
+                "inst": f"{bench.toplevel}_{sum(i['module'] == bench.toplevel for i in instances)}",
+                "module": bench.toplevel,
+                "bench": bench,
+                "header": header,
+                "overrides": combo,
+            })
+    return instances
+
+def generate_top(instances):
+    lines = [
+        f"// Generated by svtb.harness: {len(instances)} sub-instances, ports driven through <inst>__<port>",
+        f"module {TOPLEVEL};",
+        "",
+    ]
+    for i in instances:
+        inst, header = i["inst"], i["header"]
+        names = [p["name"] for p in header["params"]]
+        setting = ", ".join(f"{k}={v}" for k, v in i["overrides"].items()) or "defaults"
+        lines.append(f"// {inst}: {i['module']} ({setting})")
+        for p in header["params"]:
+            value = _prefixed(i["overrides"].get(p["name"], p["default"]), inst, names)
+            kind = f"{p['type']} " if p["type"] else ""
+            lines.append(f"localparam {kind}{inst}__{p['name']} = {value};")
+        for port in header["ports"]:
+            decl = re.sub(r"^(wire|var)\s+", "", _prefixed(port["type"], inst, names))
+            if decl.startswith("["):
+                decl = f"logic {decl}"
+            lines.append(f"{decl} {inst}__{port['name']};")
+        overrides = [f".{n}({inst}__{n})" for n in names if n in i["overrides"]]
+        param_list = f" #({', '.join(overrides)})" if overrides else ""
+        connections = ",\n".join(f"    .{p['name']}({inst}__{p['name']})" for p in header["ports"])
+        lines.append(f"{i['module']}{param_list} {inst}\n(\n{connections}\n);")
+        lines.append("")
+    lines.append("endmodule")
+    return "\n".join(lines) + "\n"
+
+def generate_makefile(instances, out_dir):
+    sources, pythonpath = [], [Path(out_dir).resolve()]
+    for i in instances:
+        sources += [s for s in i["bench"].sources if s not in sources]
+        pythonpath += [p for p in i["bench"].pythonpath if p not in pythonpath]
+    tools = rtl.REPO_ROOT / "tools"
+    if tools not in pythonpath:
+        pythonpath.append(tools)
+    # Packages must be compiled before the modules importing them
+    sources.sort(key=lambda s: not rtl.definitions(s)["package"])
+    lines = [
+        "# Generated by svtb.harness",
+        "TOPLEVEL_LANG = verilog",
+        f"TOPLEVEL = {TOPLEVEL}",
+        "COCOTB_TEST_MODULES = tb_harness",
+        "VERILOG_SOURCES = " + " \\\n\t".join(str(s) for s in sources + [Path(out_dir).resolve() / f"{TOPLEVEL}.sv"]),
+        "IVERILOG_ARGS += -g2012",
+        f"export SVTB_HARNESS := {Path(out_dir).resolve() / MANIFEST}",
+        "export PYTHONPATH := " + ":".join(str(p) for p in pythonpath) + ":$(PYTHONPATH)",
+        "include $(shell cocotb-config --makefiles)/Makefile.sim",
+    ]
+    return "\n".join(lines) + "\n"
+
+def write_harness(instances, out_dir):
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    (out_dir / f"{TOPLEVEL}.sv").write_text(generate_top(instances))
+    (out_dir / "Makefile").write_text(generate_makefile(instances, out_dir))
+    (out_dir / "tb_harness.py").write_text(
+        "# Generated by svtb.harness: reruns the tests of every sub-instance\n"
+        "from svtb.harness import load_tests\n"
+        "globals().update(load_tests())\n"
+    )
+    manifest = [{
+        "inst": i["inst"],
+        "module": i["module"],
+        "overrides": i["overrides"],
+        "params": [p["name"] for p in i["header"]["params"]],
+        "ports": [p["name"] for p in i["header"]["ports"]],
+        "test_modules": i["bench"].test_modules,
+    } for i in instances]
+    with open(out_dir / MANIFEST, "w") as f:
+        json.dump(manifest, f, indent=1)
+    return out_dir
+
+
+# --- Running ---
+class SubDut:
+    # Stands in for the toplevel handle of a single-DUT bench: ports resolve to the
+    # <inst>__<port> variables of the harness, parameters and internals to the sub-instance
+    def __init__(self, top, inst, ports, params):
+        self._top = top
+        self._inst = inst
+        self._ports = set(ports)
+        self._params = set(params)
+        self._handle = getattr(top, inst)
+        self._name = inst
+        self._log = top._log.getChild(inst)
+
+    def __getattr__(self, name):
+        if name in self._ports:
+            return getattr(self._top, f"{self._inst}__{name}")
+        return getattr(self._handle, name)
+
+    def __iter__(self):
+        return iter(self._handle)
+
+    def __repr__(self):
+        return f"SubDut({self._inst})"
+
+def adapt_test(generator, entry): # Rebind a @cocotb.test of a tb module to one sub-instance
+    func = generator.func
+
+    async def run(dut, **kwargs):
+        sub = SubDut(dut, entry["inst"], entry["ports"], entry["params"])
+        setting = ", ".join(f"{k}={v}" for k, v in entry["overrides"].items()) or "defaults"
+        sub._log.info(f"{entry['module']} ({setting})")
+        await func(sub, **kwargs)
+
+    run.__module__, run.__doc__ = generator.module, func.__doc__
+    # Registered through the public decorators, with the options the tb gave its own test
+    timeout_time, timeout_unit = generator.timeout or (None, "step")
+    register = cocotb.test(
+        timeout_time=timeout_time, timeout_unit=timeout_unit,
+        expect_fail=generator.expect_fail, expect_error=tuple(generator.expect_error),
+        skip=generator.skip, stage=generator.stage, name=f"{entry['inst']}__{generator.name}",
+    )
+    return register(cocotb.parametrize(*generator.options)(run) if generator.options else run)
+
+async def _probe(dut):
+    pass
+
+_TEST_TYPE = type(cocotb.test(_probe)) # What @cocotb.test returns, without naming cocotb internals
+
+def load_tests(manifest=None): # {test name: cocotb test} for every sub-instance x tb test
+    manifest = manifest or os.environ.get("SVTB_HARNESS", MANIFEST)
+    with open(manifest) as f:
+        entries = json.load(f)
+    tests = {}
+    for entry in entries:
+        for module_name in entry["test_modules"]:
+            module = importlib.import_module(module_name)
+            for obj in vars(module).values():
+                if isinstance(obj, _TEST_TYPE):
+                    adapted = adapt_test(obj, entry)
+                    tests[adapted.name] = adapted
+    return tests
+
+
+# --- CLI ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m svtb.harness")
+    parser.add_argument("specs", nargs="*", help="bench[:PARAM=v1,v2[:PARAM=...]], e.g. ff/dff_sync_rst_n:WIDTH=1,8")
+    parser.add_argument("--leaf", action="store_true", help="add every leaf module (LEAF_SPECS)")
+    parser.add_argument("-o", "--out", default=str(rtl.REPO_ROOT / "harness_build"))
+    args = parser.parse_args(argv)
+
+    specs = (LEAF_SPECS if args.leaf else []) + args.specs
+    if not specs:
+        parser.error("no specs given")
+    instances = build_instances(specs)
+    out_dir = write_harness(instances, args.out)
+    modules = sorted({i["module"] for i in instances})
+    print(f"{len(instances)} sub-instances of {len(modules)} modules in {out_dir}")
+    print(f"run: make -C {out_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
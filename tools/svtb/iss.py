@@ -0,0 +1,156 @@
+# RV32I instruction set simulator
+#
+# Architectural reference for whole programs: executes svtb.asm programs (or raw instruction
+# words) against a svtb.dmem.Memory until the program stores to TOHOST, the halt convention
+# of the kernels (the core has no ecall). Counts retired instructions and can record a trace
+# with one entry per retired instruction for timing models.
+#
+#   iss = Iss(assemble(source))
+#   iss.run()
+#   iss.instret, iss.regs[10], iss.memory.load(addr, "WT_WORD")
+import argparse
+import sys
+from pathlib import Path
+
+from svtb import rv32i
+from svtb.asm import DATA_BASE, TEXT_BASE, assemble
+from svtb.dmem import Memory
+
+
+TOHOST = DATA_BASE - 4 # A store here ends the program, the value is its exit code
+STACK_TOP = DATA_BASE + 0x1_0000 # sp at reset
+MAX_STEPS = 10_000_000
+
+_OPCODE_NAMES = {v: k for k, v in rv32i.OPCODES.items()}
+_LOAD_WIDTHS = {0: "WT_BYTE", 1: "WT_HALF_WORD", 2: "WT_WORD", 4: "WT_BYTE_UNSIGNED", 5: "WT_HALF_WORD_UNSIGNED"}
+_STORE_WIDTHS = {0: "WT_BYTE", 1: "WT_HALF_WORD", 2: "WT_WORD"}
+_MASK = 0xFFFF_FFFF
+
+# Instruction classes in traces
+CLASSES = {
+    "OPCODE_R": "alu", "OPCODE_I_ALU": "alu", "OPCODE_U": "alu", "OPCODE_U_PC": "alu",
+    "OPCODE_I_LOAD": "load", "OPCODE_S": "store", "OPCODE_B": "branch",
+    "OPCODE_J": "jal", "OPCODE_I_JUMP": "jalr",
+}
+
+
+class IssError(Exception):
+    pass
+
+
+def _alu(f3, f7, a, b, register): # RV32I OP / OP-IMM on unsigned 32-bit operands
+    if f3 == 0:
+        return (a - b if register and f7 == 0x20 else a + b) & _MASK
+    if f3 == 1:
+        return (a << (b & 31)) & _MASK
+    if f3 == 2:
+        return int(rv32i.to_signed(a) < rv32i.to_signed(b))
+    if f3 == 3:
+        return int(a < b)
+    if f3 == 4:
+        return a ^ b
+    if f3 == 5:
+        return (rv32i.to_signed(a) >> (b & 31)) & _MASK if f7 == 0x20 else a >> (b & 31)
+    if f3 == 6:
+        return a | b
+    return a & b
+
+def _taken(f3, a, b):
+    sa, sb = rv32i.to_signed(a), rv32i.to_signed(b)
+    return {0: a == b, 1: a != b, 4: sa < sb, 5: sa >= sb, 6: a < b, 7: a >= b}[f3]
+
+
+class Iss:
+    def __init__(self, program, memory=None, trace=False):
+        # program: svtb.asm.Program or a list of instruction words at TEXT_BASE
+        self.text = list(program.text if hasattr(program, "text") else program)
+        self.memory = memory if memory is not None else Memory()
+        for addr, byte in getattr(program, "data", {}).items():
+            self.memory.bytes[addr] = byte
+        self.regs = [0] * 32
+        self.regs[2] = STACK_TOP
+        self.pc = TEXT_BASE
+        self.instret = 0
+        self.exit_code = None
+        self.trace = [] if trace else None
+
+    def fetch(self, pc):
+        index = (pc - TEXT_BASE) >> 2
+        if pc & 3 or not 0 <= index < len(self.text):
+            raise IssError(f"fetch outside the program at {pc:#010x} after {self.instret} instructions")
+        return self.text[index]
+
+    def step(self): # Execute one instruction
+        pc, instr = self.pc, self.fetch(self.pc)
+        op = _OPCODE_NAMES.get(instr & 0x7F)
+        f3, f7 = rv32i.funct3(instr), rv32i.funct7(instr)
+        rd, rs1, rs2 = rv32i.rd(instr), rv32i.rs1(instr), rv32i.rs2(instr)
+        a, b = self.regs[rs1], self.regs[rs2]
+        imm = rv32i.immediate(instr, rv32i.OPCODE_IMMEDIATE[op]) if op else 0
+        next_pc = (pc + 4) & _MASK
+        result = None
+        addr = None
+        taken = False
+
+        if op == "OPCODE_R":
+            result = _alu(f3, f7, a, b, True)
+        elif op == "OPCODE_I_ALU":
+            result = _alu(f3, f7 if f3 == 5 else 0, a, imm, False)
+        elif op == "OPCODE_U":
+            result = imm
+        elif op == "OPCODE_U_PC":
+            result = (pc + imm) & _MASK
+        elif op == "OPCODE_I_LOAD":
+            addr = (a + imm) & _MASK
+            result = self.memory.load(addr, _LOAD_WIDTHS[f3])
+        elif op == "OPCODE_S":
+            addr = (a + imm) & _MASK
+            self.memory.store(addr, _STORE_WIDTHS[f3], b)
+            if addr == TOHOST:
+                self.exit_code = b
+        elif op == "OPCODE_B":
+            taken = _taken(f3, a, b)
+            if taken:
+                next_pc = (pc + imm) & _MASK
+        elif op == "OPCODE_J":
+            result, next_pc, taken = next_pc, (pc + imm) & _MASK, True
+        elif op == "OPCODE_I_JUMP":
+            result, next_pc, taken = next_pc, (a + imm) & ~1 & _MASK, True
+        else:
+            raise IssError(f"illegal instruction {instr:#010x} at {pc:#010x}")
+
+        if result is not None and rd != 0:
+            self.regs[rd] = result
+        self.pc = next_pc
+        self.instret += 1
+        if self.trace is not None:
+            self.trace.append({
+                "pc": pc, "instr": instr, "class": CLASSES[op],
+                "rd": rd if result is not None else 0, "rs1": rs1, "rs2": rs2,
+                "taken": taken, "next_pc": next_pc, "addr": addr,
+            })
+
+    def run(self, max_steps=MAX_STEPS): # -> exit code
+        while self.exit_code is None:
+            if self.instret >= max_steps:
+                raise IssError(f"no store to TOHOST after {max_steps} instructions (pc {self.pc:#010x})")
+            self.step()
+        return self.exit_code
+
+
+def main(argv=None): # python -m svtb.iss prog.s: run and print the final registers
+    parser = argparse.ArgumentParser(prog="python -m svtb.iss")
+    parser.add_argument("source")
+    parser.add_argument("--max-steps", type=int, default=MAX_STEPS)
+    args = parser.parse_args(argv)
+
+    iss = Iss(assemble(Path(args.source).read_text()))
+    code = iss.run(args.max_steps)
+    print(f"exit {code} after {iss.instret} instructions")
+    for i in range(0, 32, 4):
+        print("  ".join(f"x{r:<2} {iss.regs[r]:08x}" for r in range(i, i + 4)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
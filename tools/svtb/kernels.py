@@ -0,0 +1,302 @@
+# RV32I kernel benchmark suite for core.sv
+#
+# Kernels are assembly sources in core/tb/kernels. `build` assembles each one, runs it on the
+# ISS, checks the final state against an independent Python oracle and writes next to the
+# source:
+#   <name>.hex    text image in $readmemh format, loadable by imem.sv (MEMFILE)
+#   <name>.json   retired instruction count, initial data and the expected result region
+#
+# Every kernel writes its result between the `result:` and `result_end:` labels and halts by
+# storing 1 to TOHOST. run_kernel() drives the core with the image in cocotb, stops at that
+# store, checks the result region in DMEM and returns cycles, instret, CPI/IPC and simulator
+# throughput; tb_core writes one report per run (write_report) for comparing architecture changes.
+#
+#   python -m svtb.kernels build                  # regenerate images after editing a kernel
+#   python -m svtb.kernels iss crc32              # run one kernel on the ISS
+#   python -m svtb.kernels compare base.json new.json
+import argparse
+import json
+import subprocess
+import sys
+import time
+import zlib
+from pathlib import Path
+
+import cocotb
+from cocotb.triggers import FallingEdge, ReadOnly, ReadWrite, RisingEdge
+
+from svtb import rtl, rv32i
+from svtb.asm import assemble, hex_image
+from svtb.dmem import DmemModel, Memory
+from svtb.iss import TOHOST, Iss
+
+
+KERNELS_DIR = rtl.MODULES_DIR / "RV32" / "RV32I_pipelined" / "core" / "tb" / "kernels"
+PRELUDE = f".equ TOHOST, {TOHOST:#x}\n"
+REPORT_ENV = "KERNELS_REPORT_OUT" # Where tb_core writes its JSON report
+MAX_CYCLES_PER_INSTR = 50 # Timeout: a kernel that gets slower than this is considered hung
+
+
+# --- Oracles ---
+# name -> expected result region as 32-bit words, computed without the ISS
+def _xorshift32(seed, n):
+    x, out = seed, []
+    for _ in range(n):
+        x ^= (x << 13) & 0xFFFF_FFFF
+        x ^= x >> 17
+        x ^= (x << 5) & 0xFFFF_FFFF
+        out.append(x)
+    return out
+
+def _bytes(words):
+    return b"".join(w.to_bytes(4, "little") for w in words)
+
+def _words(data):
+    return [int.from_bytes(data[i:i + 4], "little") for i in range(0, len(data), 4)]
+
+def _sorted_signed(seed, n):
+    return [v & 0xFFFF_FFFF for v in sorted(rv32i.to_signed(w) for w in _xorshift32(seed, n))]
+
+def _matmul():
+    values = [rv32i.to_signed(w & 0xFF, 8) for w in _xorshift32(0x0BADC0DE, 128)]
+    a, b = values[:64], values[64:]
+    return [sum(a[8 * i + k] * b[8 * k + j] for k in range(8)) & 0xFFFF_FFFF for i in range(8) for j in range(8)]
+
+def _fib():
+    table = [0, 1]
+    while len(table) < 32:
+        table.append(table[-1] + table[-2])
+    return [table[15]] + table
+
+def _fsm():
+    text = bytes(0x20 if c & 0x80 else c for c in _bytes(_xorshift32(0x31415926, 128)))
+    numbers = words = punct = ctrl = longest = length = 0
+    state = "idle"
+    for c in text + b" ": # Trailing space closes a word running at the end
+        ch = chr(c)
+        if c < 0x20 or c == 0x7F or ch == " ":
+            ctrl += c != 0x20
+            if state == "word":
+                longest = max(longest, length)
+            state = "idle"
+        elif ch.isdigit():
+            if state == "idle":
+                numbers += 1
+                state = "number"
+            elif state == "word":
+                length += 1
+        elif ch.isascii() and ch.isalpha():
+            if state != "word":
+                words += 1
+                state, length = "word", 0
+            length += 1
+        else:
+            punct += 1
+            if state == "word":
+                longest = max(longest, length)
+            state = "idle"
+    return [numbers, words, punct, ctrl, longest]
+
+ORACLES = {
+    "memset": lambda: _words(bytes([0x5A] * 256)),
+    "memcpy": lambda: _xorshift32(0x12345678, 64),
+    "bubble_sort": lambda: _sorted_signed(0x2545F491, 32),
+    "insertion_sort": lambda: _sorted_signed(0x9E3779B9, 64),
+    "crc32": lambda: [zlib.crc32(_bytes(_xorshift32(0xDEADBEEF, 32)))],
+    "matmul": _matmul,
+    "fib": _fib,
+    "fsm": _fsm,
+}
+
+
+# --- Images ---
+def sources():
+    return sorted(KERNELS_DIR.glob("*.s"))
+
+def assemble_kernel(path):
+    return assemble(PRELUDE + path.read_text())
+
+def signature(memory, program): # Result region as words
+    base, end = program.symbols["result"], program.symbols["result_end"]
+    return [memory.load(a, "WT_WORD") for a in range(base, end, 4)]
+
+def build(names=None, log=print): # Assemble, run on the ISS, check the oracle, write <name>.hex/.json
+    for path in sources():
+        name = path.stem
+        if names and name not in names:
+            continue
+        program = assemble_kernel(path)
+        iss = Iss(program)
+        exit_code = iss.run()
+        words = signature(iss.memory, program)
+        if name in ORACLES and words != ORACLES[name]():
+            raise RuntimeError(f"{name}: ISS result differs from the Python oracle")
+        path.with_suffix(".hex").write_text(hex_image(program.text))
+        path.with_suffix(".json").write_text(json.dumps({
+            "instret": iss.instret,
+            "exit_code": exit_code,
+            "text_words": len(program.text),
+            "data": {f"{a:#x}": b for a, b in sorted(program.data.items()) if b},
+            "result": {"base": program.symbols["result"], "words": words},
+        }, indent=1))
+        log(f"{name}: {iss.instret} instructions, {len(program.text)} text words, {len(words)} result words")
+
+def load(name): # -> (text words, expected json)
+    words = [int(line, 16) for line in (KERNELS_DIR / f"{name}.hex").read_text().split()]
+    return words, json.loads((KERNELS_DIR / f"{name}.json").read_text())
+
+def names():
+    return sorted(p.stem for p in KERNELS_DIR.glob("*.hex"))
+
+def initial_memory(expected): # Data memory at reset, from a kernel's json
+    memory = Memory()
+    for addr, byte in expected["data"].items():
+        memory.bytes[int(addr, 16)] = byte
+    return memory
+
+
+# --- cocotb runner ---
+class ImemModel:
+    # IMEM side of the core's instruction port with imem.sv's timing: a PC is taken whenever
+    # the output register is free or being read, and its word is offered the next cycle
+    def __init__(self, dut, words, clock="clk"):
+        self.dut = dut
+        self.clk = getattr(dut, clock)
+        self.words = words
+        self.fetches = 0
+        self._task = None
+
+    def start(self):
+        self._task = cocotb.start_soon(self._run())
+        return self
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        d = self.dut
+        valid, data = 0, 0
+        d.instruction_valid_in.value = 0
+        d.instruction.value = 0
+        while True:
+            await FallingEdge(self.clk)
+            d.instruction_valid_in.value = valid
+            d.instruction.value = data
+            await ReadWrite() # pc_ready_in follows the core's instruction_ready_out, as in imem.sv
+            d.pc_ready_in.value = int(not valid or int(d.instruction_ready_out.value))
+
+            await ReadOnly()
+            sent = valid and int(d.instruction_ready_out.value)
+            if int(d.pc_valid_out.value) and (not valid or sent):
+                index = int(d.PC_F.value) >> 2
+                valid, data = 1, self.words[index] if index < len(self.words) else 0 # Past the image reads as 0, an illegal instruction
+                self.fetches += 1
+            elif sent:
+                valid = 0
+            await RisingEdge(self.clk)
+
+
+async def run_kernel(dut, name, dmem_timing=None): # -> result dict; fails the test on a wrong result
+    words, expected = load(name)
+    memory = initial_memory(expected)
+    imem = ImemModel(dut, words).start()
+    dmem = DmemModel(dut, memory=memory, **(dmem_timing or {})).start()
+
+    dut.async_rst_n.value = 0
+    await RisingEdge(dut.clk)
+    await FallingEdge(dut.clk)
+    dut.async_rst_n.value = 1
+
+    limit = MAX_CYCLES_PER_INSTR * expected["instret"]
+    start = time.perf_counter()
+    cycles = 0
+    seen = 0
+    while True:
+        await RisingEdge(dut.clk)
+        cycles += 1
+        if any(write and addr == TOHOST for write, addr, _, _ in dmem.requests[seen:]):
+            break
+        seen = len(dmem.requests)
+        assert cycles < limit, f"{name}: no store to TOHOST after {cycles} cycles ({imem.fetches} fetches)"
+    wall_s = time.perf_counter() - start
+    imem.stop()
+    dmem.stop()
+
+    result = expected["result"]
+    got = [memory.load(result["base"] + 4 * i, "WT_WORD") for i in range(len(result["words"]))]
+    wrong = [i for i, (g, e) in enumerate(zip(got, result["words"])) if g != e]
+    assert not wrong, f"{name}: {len(wrong)} result words differ, first at +{4 * wrong[0]:#x}: {got[wrong[0]]:#010x} != {result['words'][wrong[0]]:#010x}"
+
+    instret = expected["instret"] # Architectural count from the ISS: the core has no retire counter
+    return {
+        "cycles": cycles,
+        "instret": instret,
+        "cpi": cycles / instret,
+        "ipc": instret / cycles,
+        "fetches": imem.fetches,
+        "dmem_reads": dmem.reads,
+        "dmem_writes": dmem.writes,
+        "wall_s": wall_s,
+        "ips": instret / wall_s if wall_s else 0.0,
+    }
+
+
+# --- Reports ---
+def git_rev():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=rtl.REPO_ROOT, capture_output=True, text=True)
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=rtl.REPO_ROOT, capture_output=True, text=True)
+    except OSError:
+        return None
+    return out.stdout.strip() + ("-dirty" if dirty.stdout.strip() else "") if out.returncode == 0 else None
+
+def make_report(results, params=None, dmem_timing=None):
+    return {"rev": git_rev(), "params": params or {}, "dmem": dmem_timing or {}, "kernels": results}
+
+def write_report(path, results, params=None, dmem_timing=None, **fields): # Rewritten after every kernel, so a failing one keeps the others
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({**make_report(results, params, dmem_timing), **fields}, indent=1))
+
+def compare(base, new): # Per kernel CPI before/after and the change
+    lines = [f"{'kernel':16} {'cpi base':>9} {'cpi new':>9} {'change':>8} {'ips new':>10}"]
+    for name in sorted(set(base["kernels"]) | set(new["kernels"])):
+        a, b = base["kernels"].get(name), new["kernels"].get(name)
+        if not a or not b:
+            cpi = ["-" if r is None else f"{r['cpi']:.3f}" for r in (a, b)]
+            lines.append(f"{name:16} {cpi[0]:>9} {cpi[1]:>9}")
+            continue
+        lines.append(f"{name:16} {a['cpi']:9.3f} {b['cpi']:9.3f} {100 * (b['cpi'] - a['cpi']) / a['cpi']:+7.1f}% {b['ips']:10.0f}")
+    lines.append(f"revs: {base.get('rev')} -> {new.get('rev')}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m svtb.kernels")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("build", help="assemble, check on the ISS and write the .hex/.json images")
+    p.add_argument("names", nargs="*", help="default: every kernel")
+    p = sub.add_parser("iss", help="run one kernel on the ISS")
+    p.add_argument("name")
+    p = sub.add_parser("compare", help="CPI per kernel between two tb_core reports")
+    p.add_argument("base")
+    p.add_argument("new")
+    args = parser.parse_args(argv)
+
+    if args.cmd == "build":
+        build(args.names)
+    elif args.cmd == "iss":
+        program = assemble_kernel(KERNELS_DIR / f"{args.name}.s")
+        iss = Iss(program)
+        iss.run()
+        print(f"{args.name}: {iss.instret} instructions")
+        print(" ".join(f"{w:08x}" for w in signature(iss.memory, program)))
+    else:
+        print(compare(json.loads(open(args.base).read()), json.loads(open(args.new).read())))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,515 @@
+# Bit-parallel netlist evaluator
+#
+# Synthesizes a module with Yosys to simple gates (`synth -flatten -nofsm -noabc`, optionally ABC),
+# reads the JSON netlist and generates a straight-line NumPy function over uint64 bit-planes:
+# every net is one uint64 array whose bit k of word w is the value of that net in test vector
+# 64*w + k. One gate is one NumPy operation over the whole batch, so hundreds of millions of
+# vectors are evaluated in seconds.
+#
+# Flip-flops are cut: each register becomes a pseudo input (its current value, default 0)
+# and a pseudo output "<name>_next" (value after the next active edge; reset wins over enable,
+# asynchronous resets are treated like synchronous ones). Registers wider than 64 bits are
+# split into 32-bit slices "<name>[hi:lo]".
+#
+#   net = Netlist.build(TARGETS["ALU"])
+#   out = net(ALU_op=ops, A=a, B=b)          # uint64 arrays in, {"ALU_result": array} out
+#
+#   python -m svtb.netlist ALU --vectors 100000000
+#   python -m svtb.netlist mux_generic --exhaustive
+#
+# Yosys comes from `yosys` on PATH, otherwise `yowasp-yosys` (pip install yowasp-yosys).
+import argparse
+import hashlib
+import json
+import re
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from svtb import rtl, rv32i
+from svtb.regress import file_hash
+
+
+CACHE_DIR = rtl.REPO_ROOT / ".netlist_cache"
+CHUNK_WORDS = 1 << 14 # 1M vectors per evaluation chunk
+SLICE = 32
+
+_PIPELINE = rtl.RV32I_DIR
+TARGETS = { # name -> (top, sources)
+    "ALU": ("ALU", [rtl.TYPES_PKG, _PIPELINE / "regfile" / "rtl" / "ALU.sv"]),
+    "execute_stage": ("execute_stage", [
+        rtl.TYPES_PKG,
+        _PIPELINE / "regfile" / "rtl" / "ALU.sv",
+        _PIPELINE / "stages" / "execute_stage" / "rtl" / "execute_stage.sv",
+    ]),
+    "decode_stage": ("decode_stage", [rtl.TYPES_PKG, _PIPELINE / "regfile" / "rtl" / "regfile.sv", rtl.DECODE_STAGE]),
+    "mux_generic": ("mux_generic", [rtl.MODULES_DIR / "mux" / "mux_generic" / "rtl" / "mux_generic.sv"]),
+}
+
+
+# --- Yosys ---
+def find_yosys():
+    for tool in ("yosys", "yowasp-yosys"):
+        if shutil.which(tool):
+            return tool
+    raise RuntimeError("no yosys found: install yosys or `pip install yowasp-yosys`")
+
+def _readers(sources, top, params): # Frontends to try in order: slang (bundled or as plugin), then the built-in parser
+    files = " ".join(str(Path(s).resolve()) for s in sources)
+    overrides = " ".join(f"-G {k}={v}" for k, v in params.items())
+    chparam = "".join(f"; chparam -set {k} {v} {top}" for k, v in params.items())
+    return [
+        f"read_slang --threads 1 {overrides} {files} --top {top}",
+        f"plugin -i slang; read_slang --threads 1 {overrides} {files} --top {top}",
+        f"read_verilog -sv {files}{chparam}",
+    ]
+
+def synthesize(sources, top, params=None, abc=False, cache_dir=CACHE_DIR): # -> path of the JSON netlist (cached)
+    params = params or {}
+    # -nofsm: cut registers keep their RTL encoding instead of Yosys' one-hot recoding
+    synth = f"synth -flatten -nofsm -top {top}" + ("" if abc else " -noabc")
+    h = hashlib.sha256(json.dumps([top, params, synth]).encode())
+    for s in sources:
+        h.update(f"{Path(s).name}:{file_hash(s)}\n".encode())
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    name = f"{top}_{h.hexdigest()[:16]}.json"
+    if (cache_dir / name).exists():
+        return cache_dir / name
+
+    yosys = find_yosys()
+    errors = []
+    for reader in _readers(sources, top, params):
+        # Relative output path: yowasp-yosys can only write below its working directory
+        script = f"{reader}; {synth}; setundef -zero; opt_clean; write_json {name}"
+        proc = subprocess.run([yosys, "-q", "-p", script], cwd=cache_dir, capture_output=True, text=True)
+        if proc.returncode == 0 and (cache_dir / name).exists():
+            return cache_dir / name
+        errors.append((proc.stdout + proc.stderr).strip().splitlines()[-1:] or ["?"])
+    raise RuntimeError(f"yosys failed for {top}: " + " / ".join(e[0] for e in errors))
+
+
+# --- Bit-planes ---
+def words_for(n):
+    return max((n + 63) // 64, 1)
+
+def pack(values, width, n_words): # uint64 values -> (width, n_words) bit-planes
+    values = np.asarray(values, dtype=np.uint64)
+    if values.ndim == 0:
+        values = np.full(n_words * 64, values, dtype=np.uint64)
+    padded = np.zeros(n_words * 64, dtype=np.uint64)
+    padded[:len(values)] = values
+    planes = np.empty((width, n_words), dtype=np.uint64)
+    for b in range(width):
+        bits = ((padded >> np.uint64(b)) & np.uint64(1)).astype(np.uint8)
+        planes[b] = np.packbits(bits, bitorder="little").view("<u8")
+    return planes
+
+def unpack(planes, n): # (width, n_words) bit-planes -> n uint64 values
+    values = np.zeros(n, dtype=np.uint64)
+    for b, plane in enumerate(planes):
+        bits = np.unpackbits(np.ascontiguousarray(plane).view(np.uint8), bitorder="little")[:n]
+        values |= bits.astype(np.uint64) << np.uint64(b)
+    return values
+
+
+# --- Netlist ---
+_GATES = {
+    "$_BUF_": "{A}",
+    "$_NOT_": "~{A}",
+    "$_AND_": "{A} & {B}",
+    "$_NAND_": "~({A} & {B})",
+    "$_OR_": "{A} | {B}",
+    "$_NOR_": "~({A} | {B})",
+    "$_XOR_": "{A} ^ {B}",
+    "$_XNOR_": "~({A} ^ {B})",
+    "$_ANDNOT_": "{A} & ~{B}",
+    "$_ORNOT_": "{A} | ~{B}",
+    "$_MUX_": "{A} ^ (({A} ^ {B}) & {S})",
+    "$_NMUX_": "~({A} ^ (({A} ^ {B}) & {S}))",
+    "$_AOI3_": "~(({A} & {B}) | {C})",
+    "$_OAI3_": "~(({A} | {B}) & {C})",
+    "$_AOI4_": "~(({A} & {B}) | ({C} & {D}))",
+    "$_OAI4_": "~(({A} | {B}) & ({C} | {D}))",
+}
+
+_FF_RE = re.compile(r"\$_(DFF|DFFE|SDFF|SDFFE|SDFFCE)_([NP])((?:[NP][01])?)([NP]?)_")
+
+def _ff_kind(cell_type): # "$_DFFE_NN0P_" -> {reset: (active_high, value) or None, enable: active_high or None}
+    m = _FF_RE.fullmatch(cell_type)
+    if not m:
+        return None
+    kind, _, reset, enable = m.groups()
+    return {
+        "reset": (reset[0] == "P", int(reset[1])) if reset else None,
+        "enable": enable == "P" if enable else None,
+        "reset_needs_enable": kind == "SDFFCE",
+    }
+
+
+class Netlist:
+    def __init__(self, json_path, top):
+        with open(json_path) as f:
+            module = json.load(f)["modules"][top]
+        self.top = top
+        self.inputs = {}
+        self.outputs = {}
+        self._port_bits = {}
+        for name, port in module["ports"].items():
+            (self.inputs if port["direction"] == "input" else self.outputs)[name] = len(port["bits"])
+            self._port_bits[name] = port["bits"]
+        self.gates = 0
+        self.state = {}
+        self._generate(module)
+
+    @classmethod
+    def build(cls, target, params=None, abc=False):
+        top, sources = target
+        return cls(synthesize(sources, top, params, abc), top)
+
+    # --- Code generation ---
+    def _generate(self, module):
+        cells = list(module["cells"].values())
+        ffs = [c for c in cells if _ff_kind(c["type"])]
+        gates = [c for c in cells if not _ff_kind(c["type"])]
+        unknown = {c["type"] for c in gates if c["type"] not in _GATES}
+        if unknown:
+            raise ValueError(f"{self.top}: unsupported cells {sorted(unknown)}")
+
+        # Nets driven from outside the gate network: ports and cut flip-flop outputs
+        expr = {}
+        lines = []
+        for name, width in self.inputs.items():
+            lines.append(f"    P_{_ident(name)} = I[{name!r}]")
+            for k, bit in enumerate(self._port_bits[name]):
+                if isinstance(bit, int):
+                    expr[bit] = f"P_{_ident(name)}[{k}]"
+        state_bits = self._state_groups(module, ffs)
+        for name, bits in state_bits.items():
+            self.state[name] = len(bits)
+            lines.append(f"    P_{_ident(name)} = I[{name!r}]")
+            for k, bit in enumerate(bits):
+                expr[bit] = f"P_{_ident(name)}[{k}]"
+
+        def ref(bit):
+            if bit in ("1",):
+                return "O"
+            if not isinstance(bit, int):
+                return "Z" # 0, x and z all read as 0
+            return expr[bit]
+
+        # Topological order of the combinational gates
+        drivers = {c["connections"]["Y"][0]: c for c in gates}
+        order, done, visiting = [], set(expr), set()
+
+        def visit(bit):
+            stack = [(bit, False)]
+            while stack:
+                b, expanded = stack.pop()
+                if not isinstance(b, int) or b in done:
+                    continue
+                if expanded:
+                    done.add(b)
+                    order.append(drivers[b])
+                    continue
+                if b not in drivers:
+                    raise ValueError(f"{self.top}: net {b} has no driver")
+                if b in visiting:
+                    raise ValueError(f"{self.top}: combinational loop through net {b}")
+                visiting.add(b)
+                stack.append((b, True))
+                for pin, bits in drivers[b]["connections"].items():
+                    if pin != "Y":
+                        stack.append((bits[0], False))
+
+        sinks = [b for name in self.outputs for b in self._port_bits[name]]
+        for c in ffs:
+            sinks += [bits[0] for pin, bits in c["connections"].items() if pin in ("D", "E", "R")]
+        for b in sinks:
+            visit(b)
+
+        # Liveness: drop every temporary after its last use
+        last_use = {}
+        for i, c in enumerate(order):
+            for pin, bits in c["connections"].items():
+                if pin != "Y" and isinstance(bits[0], int):
+                    last_use[bits[0]] = i
+        keep = set(sinks)
+        for i, c in enumerate(order):
+            y = c["connections"]["Y"][0]
+            pins = {pin: ref(bits[0]) for pin, bits in c["connections"].items() if pin != "Y"}
+            expr[y] = f"n{y}"
+            lines.append(f"    n{y} = {_GATES[c['type']].format(**pins)}")
+            dead = [f"n{b}" for pin, bits in c["connections"].items()
+                    for b in bits[:1] if pin != "Y" and last_use.get(b) == i and b not in keep and expr.get(b, "").startswith("n")]
+            if dead:
+                lines.append(f"    del {', '.join(sorted(set(dead)))}")
+        self.gates = len(order)
+
+        # Outputs and next-state functions
+        results = []
+        for name in self.outputs:
+            results.append(f"{name!r}: [{', '.join(ref(b) for b in self._port_bits[name])}]")
+        for name, bits in state_bits.items():
+            nxt = []
+            for bit in bits:
+                c = self._ff_by_q[bit]
+                info = _ff_kind(c["type"])
+                d, q = ref(c["connections"]["D"][0]), ref(bit)
+                value = d
+                if info["reset"] and info["reset_needs_enable"]:
+                    value = _reset(value, ref(c["connections"]["R"][0]), *info["reset"])
+                if info["enable"] is not None:
+                    en = ref(c["connections"]["E"][0])
+                    en = en if info["enable"] else f"~{en}"
+                    value = f"({q} ^ (({q} ^ {value}) & {en}))"
+                if info["reset"] and not info["reset_needs_enable"]:
+                    value = _reset(value, ref(c["connections"]["R"][0]), *info["reset"])
+                nxt.append(value)
+            results.append(f"{name + '_next'!r}: [{', '.join(nxt)}]")
+        lines.append("    return {" + ", ".join(results) + "}")
+
+        self.source = "def _evaluate(I, Z, O):\n" + "\n".join(lines) + "\n"
+        scope = {}
+        exec(compile(self.source, f"<netlist {self.top}>", "exec"), scope)
+        self._evaluate = scope["_evaluate"]
+        self.outputs.update({f"{name}_next": width for name, width in self.state.items()})
+
+    def _state_groups(self, module, ffs): # Flip-flop Q bits grouped by the register they belong to
+        self._ff_by_q = {c["connections"]["Q"][0]: c for c in ffs}
+        owner = {}
+        for name, net in sorted(module["netnames"].items(), key=lambda kv: kv[1].get("hide_name", 0)):
+            for offset, bit in enumerate(net["bits"]):
+                if bit in self._ff_by_q and bit not in owner:
+                    owner[bit] = (name, offset)
+        groups = {}
+        for bit in self._ff_by_q:
+            name, offset = owner.get(bit, (f"ff{bit}", 0))
+            groups.setdefault(name, []).append((offset, bit))
+        state = {}
+        for name, bits in groups.items():
+            bits = [b for _, b in sorted(bits)]
+            if len(bits) <= 64:
+                state[name] = bits
+            else:
+                for lo in range(0, len(bits), SLICE):
+                    chunk = bits[lo:lo + SLICE]
+                    state[f"{name}[{lo + len(chunk) - 1}:{lo}]"] = chunk
+        return state
+
+    # --- Evaluation ---
+    def __call__(self, values=None, **kwargs): # {input: uint64 array or scalar} -> {output: uint64 array}
+        values = dict(values or {}, **kwargs)
+        widths = dict(self.inputs, **self.state)
+        unknown = set(values) - set(widths)
+        if unknown:
+            raise KeyError(f"{self.top}: no inputs {sorted(unknown)}")
+        too_wide = [n for n in list(widths) + list(self.outputs) if (widths.get(n) or self.outputs[n]) > 64]
+        if too_wide:
+            raise ValueError(f"{self.top}: ports wider than 64 bits are not supported ({too_wide})")
+        n = max((np.size(v) for v in values.values()), default=1)
+
+        out = {name: np.empty(n, dtype=np.uint64) for name in self.outputs}
+        chunk = CHUNK_WORDS * 64
+        for start in range(0, n, chunk):
+            stop = min(start + chunk, n)
+            n_words = words_for(stop - start)
+            planes = {}
+            for name, width in widths.items():
+                v = values.get(name, 0)
+                v = v[start:stop] if np.ndim(v) else v
+                planes[name] = pack(v, width, n_words)
+            result = self._evaluate(planes, np.zeros(n_words, np.uint64), np.full(n_words, ~np.uint64(0)))
+            for name, bit_planes in result.items():
+                out[name][start:stop] = unpack(bit_planes, stop - start)
+        return out
+
+
+def _reset(value, rst, active_high, reset_value):
+    rst = rst if active_high else f"~{rst}"
+    return f"({value} | {rst})" if reset_value else f"({value} & ~{rst})"
+
+def _ident(name):
+    return "".join(c if c.isalnum() else "_" for c in name)
+
+
+# --- Checks against the Python golden models ---
+def _bits(rng, n, width):
+    words = (rng.integers(0, 1 << 32, n, dtype=np.uint64) << np.uint64(32)) | rng.integers(0, 1 << 32, n, dtype=np.uint64)
+    return words if width >= 64 else words & np.uint64((1 << width) - 1)
+
+def _u32(rng, n):
+    return _bits(rng, n, 32)
+
+def _pick(rng, n, enum): # Mostly legal enum values, plus some of the encodings left over
+    values = np.array(sorted(enum.values()), dtype=np.uint64)
+    width = max(int(values.max()).bit_length(), 1)
+    legal = values[rng.integers(0, len(values), n)]
+    return np.where(rng.random(n) < 0.9, legal, rng.integers(0, 1 << width, n, dtype=np.uint64))
+
+def _alu_vectors(rng, n, params):
+    return {"ALU_op": _pick(rng, n, rv32i.ALU_OPS), "A": _u32(rng, n), "B": _u32(rng, n)}
+
+def _alu_expected(v, params):
+    return {"ALU_result": rv32i.alu_reference_batch(v["ALU_op"], v["A"], v["B"])}
+
+def _execute_vectors(rng, n, params):
+    v = {name: _u32(rng, n) for name in ("rs1_data_E", "rs2_data_E", "ALU_result_M", "ALU_result_W", "PC_E", "immediate_E")}
+    v.update({name: rng.integers(0, 2, n, dtype=np.uint64) for name in ("jump_E", "i_jump_E", "branch_E")})
+    v["ALU_op_E"] = _pick(rng, n, rv32i.ALU_OPS)
+    v["cond_code_E"] = _pick(rng, n, rv32i.COND_CODES)
+    for mux in ("forward_A", "forward_B", "ALU_operand_A", "ALU_operand_B"):
+        v[f"mux_{mux}_select_E"] = _pick(rng, n, rv32i.ENUMS[f"mux_{mux}_enum"])
+    return v
+
+def _forward(v, select, enum, rs_data): # Output of a forward mux (execute_stage, or decode_stage with EARLY_BRANCH)
+    names = {value: name for name, value in rv32i.ENUMS[enum].items()}
+    sources = {"RS1_DATA_D": rs_data, "RS2_DATA_D": rs_data, "ALU_RESULT_M": v.get("ALU_result_M", 0), "ALU_RESULT_W": v.get("ALU_result_W", 0)}
+    out = np.zeros(len(select), dtype=np.uint64)
+    for value, name in names.items():
+        source = sources.get(name.split("_", 3)[3])
+        if source is not None:
+            out = np.where(select == value, source, out)
+    return out
+
+def _execute_expected(v, params):
+    early = int(params.get("EARLY_BRANCH", 0))
+    fwd_a = _forward(v, v["mux_forward_A_select_E"], "mux_forward_A_enum", v["rs1_data_E"])
+    fwd_b = _forward(v, v["mux_forward_B_select_E"], "mux_forward_B_enum", v["rs2_data_E"])
+    a = np.where(v["mux_ALU_operand_A_select_E"] == rv32i.ENUMS["mux_ALU_operand_A_enum"]["MUX_ALU_OPERAND_A_PC"], v["PC_E"], fwd_a)
+    b = np.where(v["mux_ALU_operand_B_select_E"] == rv32i.ENUMS["mux_ALU_operand_B_enum"]["MUX_ALU_OPERAND_B_IMMEDIATE"], v["immediate_E"], fwd_b)
+    pc_source = rv32i.PC_source_reference_batch(v["jump_E"], v["i_jump_E"], v["branch_E"], v["cond_code_E"], fwd_a, fwd_b, early)
+    return {
+        "ALU_result_E": rv32i.alu_reference_batch(v["ALU_op_E"], a, b),
+        "mux_forward_B_out_E": fwd_b,
+        "PC_source_E": pc_source,
+        "fk_go_back_E": ((pc_source == 0) & (not early)).astype(np.uint64),
+    }
+
+_DECODE_PORTS = {"jump": "jump_D", "i_jump": "i_jump_D", "branch": "branch_D", "cond_code": "cond_code_D",
+                 "mux_ALU_operand_A_select": "mux_ALU_operand_A_select_D", "mux_ALU_operand_B_select": "mux_ALU_operand_B_select_D",
+                 "ALU_op": "ALU_op_D", "memory_transaction": "memory_transaction_D", "mem_write": "mem_write_D",
+                 "width_type": "width_type_D", "reg_write": "reg_write_D", "mux_writeback_select": "mux_writeback_select_D",
+                 "rs1_addr": "rs1_addr_D", "rs2_addr": "rs2_addr_D", "rd_addr": "rd_addr_D", "immediate": "immediate_D"}
+
+def _register(r): # State slice holding x<r> (regfile stores x1..x31 in rf[0..30])
+    return f"rf.rf[{32 * r - 1}:{32 * (r - 1)}]"
+
+def _decode_vectors(rng, n, params):
+    # Legal opcodes most of the time, register file contents random (one state slice per register)
+    opcodes = np.array(sorted(rv32i.OPCODES.values()), dtype=np.uint64)
+    instr = _u32(rng, n)
+    instr = np.where(rng.random(n) < 0.9, (instr & ~np.uint64(0x7F)) | opcodes[rng.integers(0, len(opcodes), n)], instr)
+    v = {"instruction": instr, "PC_D": _u32(rng, n), "ALU_result_M": _u32(rng, n), "ALU_result_W": _u32(rng, n)}
+    v.update({_register(r): _u32(rng, n) for r in range(1, 32)})
+    for mux in ("forward_A", "forward_B"):
+        v[f"mux_{mux}_select_D"] = _pick(rng, n, rv32i.ENUMS[f"mux_{mux}_enum"])
+    return v
+
+def _decode_expected(v, params):
+    ref = rv32i.decode_reference_batch(v["instruction"])
+    out = {port: ref[field] for field, port in _DECODE_PORTS.items()}
+    n = len(v["instruction"])
+    zeros = np.zeros(n, dtype=np.uint64)
+    regs = np.stack([zeros] + [v.get(_register(r), zeros) for r in range(1, 32)])
+    columns = np.arange(n)
+    out["rs1_data_D"] = regs[ref["rs1_addr"].astype(np.int64), columns]
+    out["rs2_data_D"] = regs[ref["rs2_addr"].astype(np.int64), columns]
+    out["predicted_PC_addr_D"] = (v.get("PC_D", zeros) + ref["immediate"]) & np.uint64(0xFFFFFFFF)
+
+    fwd_a = _forward(v, v.get("mux_forward_A_select_D", zeros), "mux_forward_A_enum", out["rs1_data_D"])
+    fwd_b = _forward(v, v.get("mux_forward_B_select_D", zeros), "mux_forward_B_enum", out["rs2_data_D"])
+    out["PC_source_D"] = rv32i.PC_source_D_reference_batch(ref["jump"], ref["i_jump"], ref["branch"], ref["cond_code"], fwd_a, fwd_b, int(params.get("EARLY_BRANCH", 0)))
+    out["fk_go_back_D"] = (out["PC_source_D"] != 0).astype(np.uint64)
+    out["branch_target_D"] = rv32i.branch_target_reference_batch(ref["i_jump"], v.get("PC_D", zeros), fwd_a, ref["immediate"])
+    return out
+
+def _decode_exhaustive(params): # Every (opcode, funct3, funct7) with the register fields and immediate bits zero
+    keys = np.arange(1 << 17, dtype=np.uint64)
+    instr = (keys & np.uint64(0x7F)) | (((keys >> np.uint64(7)) & np.uint64(7)) << np.uint64(12)) | ((keys >> np.uint64(10)) << np.uint64(25))
+    return {"instruction": instr}
+
+def _mux_shape(params):
+    return int(params.get("CHANNELS_COUNT", 4)), int(params.get("CHANNELS_WIDTH", 8))
+
+def _mux_vectors(rng, n, params):
+    count, width = _mux_shape(params)
+    select_width = max((count - 1).bit_length(), 1)
+    return {
+        "select": rng.integers(0, 1 << select_width, n, dtype=np.uint64),
+        "channels": _bits(rng, n, count * width),
+    }
+
+def _mux_expected(v, params):
+    count, width = _mux_shape(params)
+    select = v["select"]
+    channel = (v["channels"] >> (np.minimum(select, count - 1) * np.uint64(width))) & np.uint64((1 << width) - 1)
+    return {"channel_out": np.where(select < count, channel, np.uint64(0))}
+
+def _mux_exhaustive(params):
+    count, width = _mux_shape(params)
+    if count * width + max((count - 1).bit_length(), 1) > 24:
+        return None
+    select_width = max((count - 1).bit_length(), 1)
+    keys = np.arange(1 << (count * width + select_width), dtype=np.uint64)
+    return {"select": keys & np.uint64((1 << select_width) - 1), "channels": keys >> np.uint64(select_width)}
+
+CHECKS = { # target -> (random vectors, expected outputs, exhaustive vectors or None)
+    "ALU": (_alu_vectors, _alu_expected, None),
+    "execute_stage": (_execute_vectors, _execute_expected, None),
+    "decode_stage": (_decode_vectors, _decode_expected, _decode_exhaustive),
+    "mux_generic": (_mux_vectors, _mux_expected, _mux_exhaustive),
+}
+
+
+def compare(net, vectors, expected, log=print): # -> number of mismatching vectors
+    start = time.monotonic()
+    got = net(vectors)
+    elapsed = time.monotonic() - start
+    n = len(next(iter(vectors.values())))
+    bad = np.zeros(n, dtype=bool)
+    for name, value in expected.items():
+        differs = got[name] != value
+        for row in np.flatnonzero(differs)[:5]:
+            stim = ", ".join(f"{k}={int(v[row]):#x}" for k, v in vectors.items() if k in net.inputs)
+            log(f"  {name} = {int(got[name][row]):#x}, expected {int(value[row]):#x} ({stim})")
+        bad |= differs
+    log(f"{n} vectors in {elapsed:.2f} s ({n / max(elapsed, 1e-9) / 1e6:.1f} M vectors/s), {int(bad.sum())} mismatches")
+    return int(bad.sum())
+
+
+# --- CLI ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m svtb.netlist")
+    parser.add_argument("target", choices=sorted(TARGETS))
+    parser.add_argument("-n", "--vectors", type=int, default=1 << 20, help="random vectors to check")
+    parser.add_argument("--exhaustive", action="store_true", help="check the exhaustive vector set instead")
+    parser.add_argument("-P", "--param", action="append", default=[], help="toplevel parameter NAME=VALUE")
+    parser.add_argument("--abc", action="store_true", help="map with ABC (smaller netlist, slower synthesis)")
+    parser.add_argument("--seed", type=int, default=666)
+    parser.add_argument("--source", action="store_true", help="print the generated evaluator")
+    args = parser.parse_args(argv)
+
+    params = dict(p.split("=", 1) for p in args.param)
+    start = time.monotonic()
+    net = Netlist.build(TARGETS[args.target], params, args.abc)
+    print(f"{args.target}: {net.gates} gates, {sum(net.state.values())} state bits ({time.monotonic() - start:.1f} s to build)")
+    if args.source:
+        print(net.source)
+
+    generate, reference, exhaustive = CHECKS[args.target]
+    if args.exhaustive:
+        if exhaustive is None or exhaustive(params) is None:
+            parser.error(f"{args.target}: no exhaustive vector set for these parameters")
+        vectors = exhaustive(params)
+    else:
+        vectors = generate(np.random.default_rng(args.seed), args.vectors, params)
+    return 1 if compare(net, vectors, reference(vectors, params)) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
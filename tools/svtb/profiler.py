@@ -0,0 +1,290 @@
+# Testbench hot-path profiler
+#
+# Opt-in with SVTB_PROFILE=1 on tests decorated with @profiled; without it the decorator
+# returns the test unchanged. Per test, wall time is split into
+#   sim        simulator stepping: wall time outside every GPI callback into Python
+#   gpi        handle lookups (dut.x) and .value reads/writes, timed around each access
+#   scheduler  cocotb's own code (triggers, tasks, event loop), from stack samples
+#   user       testbench and svtb code, from stack samples
+# Callback time is measured exactly by wrapping the cocotb.simulator.register_*_callback
+# functions; the sampling thread (SAMPLE_S period) only splits the remaining Python time
+# between scheduler and user code. Per signal, lookups, reads, writes and their time are counted.
+#
+#   SVTB_PROFILE=1 make
+#   python -m svtb.profiler report sim/profile
+#   python -m svtb.profiler folded sim/profile -o tb.folded && flamegraph.pl tb.folded > tb.svg
+#
+# Each test writes profile/<test>.json and profile/<test>.folded (flamegraph.pl / speedscope
+# collapsed stacks, rooted at the test name and the time category).
+import argparse
+import functools
+import json
+import os
+import sys
+import sysconfig
+import threading
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+
+import cocotb
+import cocotb.handle
+import cocotb.simulator
+from cocotb.utils import get_sim_time
+
+
+PROFILE_ENV = "SVTB_PROFILE"
+PROFILE_DIR = "profile"
+SAMPLE_S = 0.0005
+MAX_DEPTH = 64
+
+_COCOTB_DIR = str(Path(cocotb.__file__).parent)
+_GPI_FILES = (str(Path(cocotb.handle.__file__)), str(Path(cocotb.__file__).parent / "types"))
+_STDLIB_DIR = sysconfig.get_paths()["stdlib"]
+_CALLBACKS = { # register function -> position of the Python callback among its arguments
+    "register_timed_callback": 1,
+    "register_value_change_callback": 1,
+    "register_readonly_callback": 0,
+    "register_rwsynch_callback": 0,
+    "register_nextstep_callback": 0,
+}
+
+_active = None # Profiler of the running test
+
+
+# --- Stack samples ---
+def _category(filename):
+    if filename.startswith(_GPI_FILES):
+        return "gpi"
+    if filename.startswith(_COCOTB_DIR):
+        return "scheduler"
+    return "user"
+
+def _classify(frame): # -> (category of the innermost non-stdlib frame, folded frames outermost first)
+    frames = []
+    category = None
+    while frame is not None and len(frames) < MAX_DEPTH:
+        filename = frame.f_code.co_filename
+        if category is None and not filename.startswith(_STDLIB_DIR):
+            category = _category(filename)
+        frames.append(f"{frame.f_code.co_name} ({Path(filename).name}:{frame.f_code.co_firstlineno})")
+        frame = frame.f_back
+    return category or "scheduler", frames[::-1]
+
+
+class Profiler:
+    def __init__(self, name, interval=SAMPLE_S):
+        self.name = name
+        self.interval = interval
+        self.thread_id = threading.get_ident()
+        self.stacks = Counter()
+        self.samples = Counter()
+        self.signals = defaultdict(lambda: {"lookups": 0, "reads": 0, "writes": 0, "gpi_s": 0.0})
+        self.callback_s = 0.0
+        self.callbacks = 0
+        self.gpi_s = 0.0
+        self._in_callback = False
+        self._gpi_depth = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample_loop, name="svtb-profiler", daemon=True)
+
+    def _sample_loop(self):
+        while not self._stop.wait(self.interval):
+            if not self._in_callback: # Simulator stepping, accounted for exactly
+                continue
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            category, frames = _classify(frame)
+            self.samples[category] += 1
+            self.stacks[";".join([self.name, category] + frames)] += 1
+
+    def start(self):
+        self.wall_start = time.perf_counter()
+        self.sim_start = get_sim_time("ns")
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        wall = time.perf_counter() - self.wall_start
+        python = min(self.callback_s, wall)
+        rest = max(python - self.gpi_s, 0.0)
+        sampled = self.samples["scheduler"] + self.samples["user"]
+        share = self.samples["user"] / sampled if sampled else 0.0
+        return {
+            "test": self.name,
+            "wall_s": wall,
+            "sim_ns": get_sim_time("ns") - self.sim_start,
+            "callbacks": self.callbacks,
+            "samples": sum(self.samples.values()),
+            "time_s": {
+                "sim": wall - python,
+                "gpi": min(self.gpi_s, python),
+                "scheduler": rest * (1 - share),
+                "user": rest * share,
+            },
+            "signals": dict(self.signals),
+        }
+
+    def folded(self, result): # Collapsed stacks; simulator stepping as a synthetic frame
+        lines = [f"{stack} {count}" for stack, count in self.stacks.most_common()]
+        sim_samples = int(result["time_s"]["sim"] / self.interval)
+        if sim_samples:
+            lines.append(f"{self.name};sim;[simulator] {sim_samples}")
+        return "\n".join(lines) + "\n"
+
+
+# --- Instrumentation ---
+def _timed_callback(func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        prof = _active
+        if prof is None or prof._in_callback:
+            return func(*args, **kwargs)
+        prof._in_callback = True
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            prof.callback_s += time.perf_counter() - start
+            prof.callbacks += 1
+            prof._in_callback = False
+
+    return wrapper
+
+def _register_wrapper(register, position):
+    @functools.wraps(register)
+    def wrapper(*args):
+        args = list(args)
+        args[position] = _timed_callback(args[position])
+        return register(*args)
+
+    wrapper.__wrapped_register__ = register
+    return wrapper
+
+def _timed_access(kind, key):
+    def decorate(access):
+        @functools.wraps(access)
+        def wrapper(self, *args):
+            prof = _active
+            if prof is None or prof._gpi_depth:
+                return access(self, *args)
+            prof._gpi_depth += 1
+            start = time.perf_counter()
+            try:
+                return access(self, *args)
+            finally:
+                elapsed = time.perf_counter() - start
+                prof._gpi_depth -= 1
+                prof.gpi_s += elapsed
+                stats = prof.signals[key(self, *args)]
+                stats[kind] += 1
+                stats["gpi_s"] += elapsed
+
+        return wrapper
+
+    return decorate
+
+def install(): # Patch the callback registration and handle access paths (idempotent)
+    for name, position in _CALLBACKS.items():
+        register = getattr(cocotb.simulator, name)
+        if not hasattr(register, "__wrapped_register__"):
+            setattr(cocotb.simulator, name, _register_wrapper(register, position))
+    value = cocotb.handle.ValueObjectBase.value
+    if not hasattr(value.fget, "__wrapped__"):
+        path = lambda handle, *_: handle._path
+        cocotb.handle.ValueObjectBase.value = property(
+            _timed_access("reads", path)(value.fget), _timed_access("writes", path)(value.fset), doc=value.__doc__,
+        )
+        getattr_ = cocotb.handle.HierarchyObject.__getattr__
+        cocotb.handle.HierarchyObject.__getattr__ = _timed_access(
+            "lookups", lambda handle, name: f"{handle._path}.{name}")(getattr_)
+
+
+# --- Decorator ---
+def enabled():
+    return os.environ.get(PROFILE_ENV, "0") not in ("", "0")
+
+def summary(result, top=5):
+    t = result["time_s"]
+    wall = max(result["wall_s"], 1e-12)
+    split = ", ".join(f"{k} {100 * v / wall:.0f}%" for k, v in t.items())
+    hot = sorted(result["signals"].items(), key=lambda kv: -kv[1]["gpi_s"])[:top]
+    signals = "; ".join(f"{n} {s['reads']}r/{s['writes']}w/{s['lookups']}l" for n, s in hot)
+    return f"{result['test']}: {result['wall_s']:.3f} s wall, {result['sim_ns']:g} ns sim ({split}); hottest: {signals}"
+
+def profiled(test_fn): # Decorator: profile the test when SVTB_PROFILE is set
+    if not enabled():
+        return test_fn
+
+    @functools.wraps(test_fn)
+    async def wrapper(dut, *args, **kwargs):
+        global _active
+        install()
+        prof = _active = Profiler(test_fn.__name__).start()
+        try:
+            await test_fn(dut, *args, **kwargs)
+        finally:
+            _active = None
+            result = prof.stop()
+            out = Path(PROFILE_DIR)
+            out.mkdir(exist_ok=True)
+            (out / f"{prof.name}.json").write_text(json.dumps(result, indent=1))
+            (out / f"{prof.name}.folded").write_text(prof.folded(result))
+            dut._log.info(summary(result))
+
+    return wrapper
+
+
+# --- CLI ---
+def _results(paths):
+    files = []
+    for p in map(Path, paths):
+        files += sorted(p.glob("*.json")) if p.is_dir() else [p]
+    return [json.loads(f.read_text()) for f in files]
+
+def report(results, top=10):
+    lines = [f"{'test':32} {'wall s':>8} {'sim':>6} {'gpi':>6} {'sched':>6} {'user':>6} {'callbacks':>10}"]
+    for r in results:
+        t, wall = r["time_s"], max(r["wall_s"], 1e-12)
+        lines.append(
+            f"{r['test']:32} {r['wall_s']:8.3f}"
+            + "".join(f" {100 * t[k] / wall:5.1f}%" for k in ("sim", "gpi", "scheduler", "user"))
+            + f" {r['callbacks']:10d}"
+        )
+    signals = defaultdict(Counter)
+    for r in results:
+        for name, s in r["signals"].items():
+            signals[name].update(s)
+    lines.append("")
+    lines.append(f"{'signal':40} {'lookups':>8} {'reads':>8} {'writes':>8} {'gpi ms':>8}")
+    for name, s in sorted(signals.items(), key=lambda kv: -kv[1]["gpi_s"])[:top]:
+        lines.append(f"{name:40} {s['lookups']:8d} {s['reads']:8d} {s['writes']:8d} {1000 * s['gpi_s']:8.2f}")
+    return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m svtb.profiler")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("report", help="time split per test and the hottest signals")
+    p.add_argument("paths", nargs="+", help="profile directories or JSON files")
+    p.add_argument("--top", type=int, default=10)
+    p = sub.add_parser("folded", help="concatenate collapsed stacks for flamegraph tools")
+    p.add_argument("paths", nargs="+", help="profile directories or .folded files")
+    p.add_argument("-o", "--out", required=True)
+    args = parser.parse_args(argv)
+
+    if args.cmd == "report":
+        print(report(_results(args.paths), args.top))
+    else:
+        files = []
+        for path in map(Path, args.paths):
+            files += sorted(path.glob("*.folded")) if path.is_dir() else [path]
+        Path(args.out).write_text("".join(f.read_text() for f in files))
+        print(f"{len(files)} profiles -> {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
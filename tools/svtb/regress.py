@@ -0,0 +1,244 @@
+# Incremental regression
+#
+# For every sim/Makefile (and sim_<variant>/Makefile, see svtb.sim) the inputs of the bench are
+# collected into a dependency graph:
+#   - VERILOG_SOURCES, plus the files defining any module/package they instantiate or import
+#   - the tb_*.py modules and every local Python module they import (tb/ dirs, tools/svtb)
+#   - the Makefile itself
+#   - the data the tbs replay: golden vectors and shrunk regressions next to their modules, and
+#     the fuzz corpus for benches importing svtb.fuzz
+# The content hashes of those files, the seed, the make parameters and the tool versions form
+# the cache key. Without --seed every bench runs with DEFAULT_SEED, the tbs' own default, so a
+# cached pass always names the seed it ran with. Benches whose key already has a passing result
+# are served from the cache, everything else is rerun. Failures are never cached.
+#
+#   python -m svtb.regress                    # run what changed
+#   python -m svtb.regress --graph ff/        # show the inputs of the matching benches
+#   python -m svtb.regress --seed 1 -p WIDTH=8 --force
+import argparse
+import ast
+import hashlib
+import json
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from svtb import rtl
+from svtb.fuzz import corpus_path
+from svtb.sim import find_benches, parse_results, run_make
+
+
+CACHE_FILE = rtl.REPO_ROOT / ".regress_cache" / "cache.json"
+DATA_GLOBS = ("golden/*.npz", "regressions/*.json") # svtb.golden and svtb.shrink layouts under tb/
+FUZZ_MODULE = rtl.REPO_ROOT / "tools" / "svtb" / "fuzz.py"
+DEFAULT_SEED = 666 # Same fallback as the tbs' os.environ.get("COCOTB_RANDOM_SEED", 666)
+
+
+# --- Dependency graph ---
+def sv_closure(sources, index): # VERILOG_SOURCES + files defining what they instantiate/import
+    seen = []
+    missing = set()
+    pending = [Path(s) for s in sources]
+    while pending:
+        path = pending.pop(0)
+        if path in seen:
+            continue
+        seen.append(path)
+        if not path.exists():
+            missing.add(str(path))
+            continue
+        for name in rtl.references(path, index):
+            pending.extend(index[name])
+    return seen, missing
+
+def python_closure(files, search_path): # tb modules + local modules they import, transitively
+    seen = []
+    pending = list(files)
+    while pending:
+        path = pending.pop(0)
+        if path in seen or not path.exists():
+            continue
+        seen.append(path)
+        tree = ast.parse(path.read_text(), filename=str(path))
+        names = []
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names += [a.name for a in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                names.append(node.module)
+                names += [f"{node.module}.{a.name}" for a in node.names]
+        for name in names:
+            rel = Path(*name.split("."))
+            for d in search_path:
+                for candidate in (d / rel.with_suffix(".py"), d / rel / "__init__.py"):
+                    if candidate.exists():
+                        pending.append(candidate)
+                        # Importing a submodule runs its package __init__ first
+                        for parent in list(candidate.relative_to(d).parents)[:-1]:
+                            pending.append(d / parent / "__init__.py")
+    return seen
+
+def data_files(test_files, python_files): # Replayed vectors live in the tb dir of the test modules
+    tb_dirs = sorted({f.parent for f in test_files})
+    files = [p for d in tb_dirs for pattern in DATA_GLOBS for p in sorted(d.glob(pattern))]
+    if FUZZ_MODULE in python_files and corpus_path().exists(): # test_fuzz_corpus replays the local corpus
+        files.append(corpus_path())
+    return files
+
+def bench_inputs(bench, index):
+    sv, missing = sv_closure(bench.sources, index)
+    tests = bench.test_files()
+    py = python_closure(tests, bench.pythonpath)
+    return {"sv": sv, "python": py, "makefile": [bench.makefile], "data": data_files(tests, py), "missing": sorted(missing)}
+
+
+# --- Keys ---
+def file_hash(path, _cache={}):
+    path = Path(path)
+    stat = path.stat()
+    memo = (str(path), stat.st_mtime_ns, stat.st_size)
+    if memo not in _cache:
+        _cache[memo] = hashlib.sha256(path.read_bytes()).hexdigest()
+    return _cache[memo]
+
+def tool_versions(): # Simulator and cocotb versions are part of every key
+    versions = {"python": sys.version.split()[0]}
+    try:
+        import cocotb
+        versions["cocotb"] = cocotb.__version__
+    except ImportError:
+        versions["cocotb"] = None
+    if shutil.which("iverilog"):
+        out = subprocess.run(["iverilog", "-V"], capture_output=True, text=True).stdout
+        versions["iverilog"] = out.splitlines()[0] if out else None
+    return versions
+
+def bench_key(inputs, seed, params, versions):
+    h = hashlib.sha256()
+    for group in ("sv", "python", "makefile", "data"):
+        for path in sorted(inputs[group]):
+            if Path(path).exists():
+                h.update(f"{group}:{_rel(path)}:{file_hash(path)}\n".encode())
+    h.update(json.dumps({"seed": seed, "params": params, "versions": versions}, sort_keys=True).encode())
+    return h.hexdigest()
+
+
+# --- Cache ---
+def load_cache(path=CACHE_FILE):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_cache(cache, path=CACHE_FILE):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w") as f:
+        json.dump(cache, f, indent=1)
+    tmp.replace(path)
+
+
+# --- Running ---
+def run_bench(bench, seed, params, timeout=None):
+    start = time.monotonic()
+    make_vars = dict(params, COCOTB_RANDOM_SEED=seed)
+    proc = run_make(bench, make_vars=make_vars, timeout=timeout)
+    cases = parse_results(bench.sim_dir / "results.xml")
+    passed = proc.returncode == 0 and bool(cases) and all(c["passed"] for c in cases)
+    return {
+        "passed": passed,
+        "tests": len(cases),
+        "failed": [c["name"] for c in cases if not c["passed"]],
+        "wall_s": round(time.monotonic() - start, 3),
+        "log_tail": "" if passed else (proc.stdout + proc.stderr)[-4000:],
+    }
+
+def regress(filters=(), seed=None, params=None, jobs=1, force=False, dry_run=False, log=print):
+    params = params or {}
+    seed = DEFAULT_SEED if seed is None else seed
+    benches = [b for b in find_benches() if not filters or any(f in b.name for f in filters)]
+    index = rtl.definition_index()
+    versions = tool_versions()
+    cache = load_cache()
+
+    todo = []
+    results = {}
+    for bench in benches:
+        inputs = bench_inputs(bench, index)
+        for m in inputs["missing"]:
+            log(f"[warn] {bench.name}: missing source {m}")
+        key = bench_key(inputs, seed, params, versions)
+        hit = cache.get(bench.name, {}).get(key)
+        if hit and hit["passed"] and not force:
+            results[bench.name] = dict(hit, cached=True)
+            log(f"[cached] {bench.name} ({hit['tests']} tests)")
+        else:
+            todo.append((bench, key))
+
+    if dry_run:
+        for bench, _ in todo:
+            log(f"[would run] {bench.name}")
+            results[bench.name] = {"passed": True, "tests": 0, "cached": False}
+        return results
+
+    def work(item):
+        bench, key = item
+        return bench, key, run_bench(bench, seed, params)
+
+    with ThreadPoolExecutor(max_workers=max(jobs, 1)) as pool:
+        for bench, key, result in pool.map(work, todo):
+            results[bench.name] = dict(result, cached=False)
+            status = "PASS" if result["passed"] else "FAIL"
+            log(f"[{status}] {bench.name} ({result['tests']} tests, {result['wall_s']} s)")
+            if not result["passed"]:
+                log(result["log_tail"])
+            if result["passed"]:
+                cache.setdefault(bench.name, {})[key] = {k: v for k, v in result.items() if k != "log_tail"}
+            save_cache(cache)
+    return results
+
+
+# --- CLI ---
+def _rel(path):
+    path = Path(path)
+    return path.relative_to(rtl.REPO_ROOT) if rtl.REPO_ROOT in path.parents else path
+
+def _params(items):
+    return dict(item.split("=", 1) for item in items)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m svtb.regress")
+    parser.add_argument("filters", nargs="*", help="substrings of bench paths (e.g. ff/ fetch_stage)")
+    parser.add_argument("--seed", type=int, help=f"COCOTB_RANDOM_SEED for every bench (default {DEFAULT_SEED})")
+    parser.add_argument("-p", "--param", action="append", default=[], help="make variable KEY=VALUE")
+    parser.add_argument("-j", "--jobs", type=int, default=1)
+    parser.add_argument("--force", action="store_true", help="ignore cached results")
+    parser.add_argument("--dry-run", action="store_true", help="only list what would rerun")
+    parser.add_argument("--graph", action="store_true", help="print the inputs of every bench")
+    args = parser.parse_args(argv)
+
+    if args.graph:
+        index = rtl.definition_index()
+        for bench in find_benches():
+            if args.filters and not any(f in bench.name for f in args.filters):
+                continue
+            inputs = bench_inputs(bench, index)
+            print(bench.name)
+            for group in ("sv", "python", "makefile", "data", "missing"):
+                for path in inputs[group]:
+                    print(f"  {group:<8} {_rel(path)}")
+        return 0
+
+    results = regress(args.filters, args.seed, _params(args.param), args.jobs, args.force, args.dry_run)
+    failed = [name for name, r in results.items() if not r["passed"]]
+    cached = sum(1 for r in results.values() if r.get("cached"))
+    print(f"{len(results)} benches, {cached} cached, {len(failed)} failed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+import re
+from pathlib import Path
+
+
+# --- Paths ---
+REPO_ROOT = Path(__file__).resolve().parents[2]
+MODULES_DIR = REPO_ROOT / "modules"
+RV32I_DIR = MODULES_DIR / "RV32" / "RV32I_pipelined"
+TYPES_PKG = RV32I_DIR / "utils" / "rv32i_types_pkg.sv"
+DECODE_STAGE = RV32I_DIR / "stages" / "decode_stage" / "rtl" / "decode_stage.sv"
+
+
+# --- Helpers ---
+def strip_comments(text): # Remove // and /* */ comments
+    text = re.sub(r"/\*.*?\*/", "", text, flags=re.S)
+    return re.sub(r"//[^\n]*", "", text)
+
+def parse_sv_int(literal): # 7'b0110011, 3'd0, 'h1F, 42 -> int
+    literal = literal.strip().replace("_", "")
+    m = re.fullmatch(r"(\d*)'([sS]?)([bBoOdDhH])([0-9a-fA-FxXzZ]+)", literal)
+    if m:
+        base = {"b": 2, "o": 8, "d": 10, "h": 16}[m.group(3).lower()]
+        return int(m.group(4), base)
+    return int(literal)
+
+
+# --- Enums ---
+_ENUM_RE = re.compile(r"typedef\s+enum\b[^{]*\{(?P<body>[^}]*)\}\s*(?P<name>\w+)\s*;", re.S)
+
+def parse_enums(path): # {enum_name: {member: value}} for every typedef enum in a file
+    enums = {}
+    for m in _ENUM_RE.finditer(strip_comments(Path(path).read_text())):
+        members = {}
+        value = 0
+        for item in m.group("body").split(","):
+            item = item.strip()
+            if not item:
+                continue
+            if "=" in item:
+                member, literal = (s.strip() for s in item.split("=", 1))
+                value = parse_sv_int(literal)
+            else:
+                member = item
+            members[member] = value
+            value += 1
+        enums[m.group("name")] = members
+    return enums
+
+def rv32i_enums(): # Enums of rv32i_types_pkg plus the ones local to decode_stage
+    enums = parse_enums(TYPES_PKG)
+    enums.update(parse_enums(DECODE_STAGE))
+    return enums
+
+
+# --- Modules ---
+_MODULE_RE = re.compile(r"\b(module|package)\s+(\w+)")
+_INSTANCE_RE = re.compile(r"\b([A-Za-z_]\w*)\s*(?:#|[A-Za-z_]\w*\s*\()")
+_PKG_REF_RE = re.compile(r"\b(\w+)\s*::")
+
+def sv_files(root=REPO_ROOT): # Every SystemVerilog source in the tree, build outputs excluded
+    return sorted(p for p in Path(root).rglob("*.sv") if "sim_build" not in p.parts)
+
+def definitions(path): # {"module": [names], "package": [names]} defined in a file
+    found = {"module": [], "package": []}
+    for kind, name in _MODULE_RE.findall(strip_comments(Path(path).read_text())):
+        found[kind].append(name)
+    return found
+
+def definition_index(root=REPO_ROOT): # module/package name -> [defining files]
+    index = {}
+    for path in sv_files(root):
+        defs = definitions(path)
+        for name in defs["module"] + defs["package"]:
+            index.setdefault(name, []).append(path)
+    return index
+
+def references(path, known): # Module instantiations and package imports in a file, among `known` names
+    text = strip_comments(Path(path).read_text())
+    own = set(definitions(path)["module"]) | set(definitions(path)["package"])
+    text = _MODULE_RE.sub(" ", text)
+    used = {tok for tok in _INSTANCE_RE.findall(text) if tok in known}
+    used |= {pkg for pkg in _PKG_REF_RE.findall(text) if pkg in known}
+    return sorted(used - own)
@@ -0,0 +1,406 @@
+# RV32I helpers shared by the testbenches: instruction fields and coverage models
+# Field helpers work on ints and on NumPy arrays alike, so coverage can bin in batch.
+import functools
+
+import numpy as np
+
+from svtb.coverage import Coverpoint, Cross, Covergroup, enum_bins
+from svtb.rtl import rv32i_enums
+
+
+ENUMS = rv32i_enums()
+OPCODES = ENUMS["opcode_enum"]
+IMMEDIATES = ENUMS["immediate_enum"]
+ALU_OPS = ENUMS["ALU_op_enum"]
+COND_CODES = ENUMS["cond_code_enum"]
+WIDTH_TYPES = ENUMS["width_type_enum"]
+
+# Immediate type built by decode_stage for every opcode
+OPCODE_IMMEDIATE = {
+    "OPCODE_R": "IMM_NONE",
+    "OPCODE_I_ALU": "IMM_I",
+    "OPCODE_I_LOAD": "IMM_I",
+    "OPCODE_S": "IMM_S",
+    "OPCODE_B": "IMM_B",
+    "OPCODE_J": "IMM_J",
+    "OPCODE_I_JUMP": "IMM_I",
+    "OPCODE_U": "IMM_U",
+    "OPCODE_U_PC": "IMM_U",
+}
+
+# Source registers every opcode reads (names of the field functions below)
+OPCODE_SOURCES = {
+    "OPCODE_R": ("rs1", "rs2"),
+    "OPCODE_I_ALU": ("rs1",),
+    "OPCODE_I_LOAD": ("rs1",),
+    "OPCODE_S": ("rs1", "rs2"),
+    "OPCODE_B": ("rs1", "rs2"),
+    "OPCODE_J": (),
+    "OPCODE_I_JUMP": ("rs1",),
+    "OPCODE_U": (),
+    "OPCODE_U_PC": (),
+}
+
+
+# --- Instruction fields ---
+def opcode(instr):
+    return instr & 0x7F
+
+def rd(instr):
+    return (instr >> 7) & 0x1F
+
+def funct3(instr):
+    return (instr >> 12) & 0x7
+
+def rs1(instr):
+    return (instr >> 15) & 0x1F
+
+def rs2(instr):
+    return (instr >> 20) & 0x1F
+
+def funct7(instr):
+    return (instr >> 25) & 0x7F
+
+def to_signed(value, width=32):
+    return value - ((value >> (width - 1)) & 1) * (1 << width)
+
+_IMMEDIATE_LUT = np.full(128, IMMEDIATES["IMM_NONE"], dtype=np.int64)
+for _op, _imm in OPCODE_IMMEDIATE.items():
+    _IMMEDIATE_LUT[OPCODES[_op]] = IMMEDIATES[_imm]
+
+def immediate_type(instr): # immediate_enum value decode_stage selects for an instruction
+    return _IMMEDIATE_LUT[opcode(instr)]
+
+
+# --- Encoding ---
+def encode(opcode, rd=0, funct3=0, rs1=0, rs2=0, funct7=0): # Raw field packing (R layout)
+    return (
+        ((funct7 & 0x7F) << 25) | ((rs2 & 0x1F) << 20) | ((rs1 & 0x1F) << 15)
+        | ((funct3 & 0x7) << 12) | ((rd & 0x1F) << 7) | (opcode & 0x7F)
+    )
+
+def encode_i(opcode, rd, funct3, rs1, imm):
+    return encode(opcode, rd, funct3, rs1) | ((imm & 0xFFF) << 20)
+
+def encode_s(opcode, funct3, rs1, rs2, imm):
+    return encode(opcode, imm & 0x1F, funct3, rs1, rs2, (imm >> 5) & 0x7F)
+
+def encode_b(opcode, funct3, rs1, rs2, imm):
+    return (
+        encode(opcode, 0, funct3, rs1, rs2)
+        | (((imm >> 12) & 1) << 31) | (((imm >> 5) & 0x3F) << 25)
+        | (((imm >> 1) & 0xF) << 8) | (((imm >> 11) & 1) << 7)
+    )
+
+def encode_u(opcode, rd, imm):
+    return encode(opcode, rd) | (imm & 0xFFFFF000)
+
+def encode_j(opcode, rd, imm):
+    return (
+        encode(opcode, rd)
+        | (((imm >> 20) & 1) << 31) | (((imm >> 1) & 0x3FF) << 21)
+        | (((imm >> 11) & 1) << 20) | (((imm >> 12) & 0xFF) << 12)
+    )
+
+
+# --- Reference models ---
+# Main decoder of decode_stage.sv:
+# opcode -> (immediate, jump, i_jump, branch, operand_A, operand_B, memory_transaction, mem_write, reg_write)
+_MAIN_DECODER = {
+    "OPCODE_R":      ("IMM_NONE", 0, 0, 0, "MUX_ALU_OPERAND_A_RS1", "MUX_ALU_OPERAND_B_RS2", 0, 0, 1),
+    "OPCODE_I_ALU":  ("IMM_I", 0, 0, 0, "MUX_ALU_OPERAND_A_RS1", "MUX_ALU_OPERAND_B_IMMEDIATE", 0, 0, 1),
+    "OPCODE_I_LOAD": ("IMM_I", 0, 0, 0, "MUX_ALU_OPERAND_A_RS1", "MUX_ALU_OPERAND_B_IMMEDIATE", 1, 0, 1),
+    "OPCODE_S":      ("IMM_S", 0, 0, 0, "MUX_ALU_OPERAND_A_RS1", "MUX_ALU_OPERAND_B_IMMEDIATE", 1, 1, 0),
+    "OPCODE_B":      ("IMM_B", 0, 0, 1, "MUX_ALU_OPERAND_A_PC", "MUX_ALU_OPERAND_B_IMMEDIATE", 0, 0, 0),
+    "OPCODE_J":      ("IMM_J", 1, 0, 0, "MUX_ALU_OPERAND_A_PC", "MUX_ALU_OPERAND_B_IMMEDIATE", 0, 0, 1),
+    "OPCODE_I_JUMP": ("IMM_I", 0, 1, 0, "MUX_ALU_OPERAND_A_RS1", "MUX_ALU_OPERAND_B_IMMEDIATE", 0, 0, 1),
+    "OPCODE_U":      ("IMM_U", 0, 0, 0, "MUX_ALU_OPERAND_A_RS1", "MUX_ALU_OPERAND_B_IMMEDIATE", 0, 0, 1),
+    "OPCODE_U_PC":   ("IMM_U", 0, 0, 0, "MUX_ALU_OPERAND_A_PC", "MUX_ALU_OPERAND_B_IMMEDIATE", 0, 0, 1),
+}
+_DEFAULT_DECODER = ("IMM_NONE", 0, 0, 0, "MUX_ALU_OPERAND_A_RS1", "MUX_ALU_OPERAND_B_RS2", 0, 0, 0)
+_OPCODE_NAMES = {v: k for k, v in OPCODES.items()}
+
+_R_ALU_OPS = {
+    (0, 0x00): "ALU_ADD", (0, 0x20): "ALU_SUB", (4, 0x00): "ALU_XOR", (6, 0x00): "ALU_OR",
+    (7, 0x00): "ALU_AND", (1, 0x00): "ALU_SLL", (5, 0x00): "ALU_SRL", (5, 0x20): "ALU_SRA",
+    (2, 0x00): "ALU_SLT", (3, 0x00): "ALU_SLTU",
+}
+_I_ALU_OPS = {0: "ALU_ADD", 4: "ALU_XOR", 6: "ALU_OR", 7: "ALU_AND", 2: "ALU_SLT", 3: "ALU_SLTU"}
+_BRANCH_CONDS = {
+    0: "COND_EQUALS", 1: "COND_NOT_EQUALS", 4: "COND_LOWER", 5: "COND_GREATER_OR_EQUAL",
+    6: "COND_LOWER_UNSIGNED", 7: "COND_GREATER_OR_EQUAL_UNSIGNED",
+}
+_LOAD_WIDTHS = {0: "WT_BYTE", 1: "WT_HALF_WORD", 2: "WT_WORD", 4: "WT_BYTE_UNSIGNED", 5: "WT_HALF_WORD_UNSIGNED"}
+_STORE_WIDTHS = {0: "WT_BYTE", 1: "WT_HALF_WORD", 2: "WT_WORD"}
+
+def immediate(instr, imm_type): # Immediate built by decode_stage, as a 32-bit unsigned value
+    sign = (instr >> 31) & 1
+    if imm_type == "IMM_I":
+        value = (instr >> 20) | (0xFFFFF000 if sign else 0)
+    elif imm_type == "IMM_S":
+        value = ((instr >> 25) << 5) | ((instr >> 7) & 0x1F) | (0xFFFFF000 if sign else 0)
+    elif imm_type == "IMM_B":
+        value = (
+            (((instr >> 7) & 1) << 11) | (((instr >> 25) & 0x3F) << 5)
+            | (((instr >> 8) & 0xF) << 1) | (0xFFFFF000 if sign else 0)
+        )
+    elif imm_type == "IMM_U":
+        value = instr & 0xFFFFF000
+    elif imm_type == "IMM_J":
+        value = (
+            (instr & 0xFF000) | (((instr >> 20) & 1) << 11)
+            | (((instr >> 21) & 0x3FF) << 1) | (0xFFF00000 if sign else 0)
+        )
+    else:
+        value = 0
+    return value & 0xFFFFFFFF
+
+def decode_reference(instr): # Control outputs of decode_stage.sv for one instruction (enum values)
+    name = _OPCODE_NAMES.get(opcode(instr))
+    f3, f7 = funct3(instr), funct7(instr)
+    imm, jump, i_jump, branch, mux_a, mux_b, mem_tx, mem_w, reg_w = _MAIN_DECODER.get(name, _DEFAULT_DECODER)
+
+    alu_op = "ALU_ADD"
+    if name == "OPCODE_R":
+        alu_op = _R_ALU_OPS.get((f3, f7), "ALU_ADD")
+    elif name == "OPCODE_I_ALU":
+        alu_op = _I_ALU_OPS.get(f3, "ALU_ADD")
+        if f3 == 1 and f7 == 0x00:
+            alu_op = "ALU_SLL"
+        elif f3 == 5 and f7 in (0x00, 0x20):
+            alu_op = "ALU_SRL" if f7 == 0x00 else "ALU_SRA"
+    elif name == "OPCODE_U":
+        alu_op = "ALU_OPERAND_B"
+
+    cond_code = _BRANCH_CONDS.get(f3, "COND_NONE") if name == "OPCODE_B" else "COND_NONE"
+    width_type = {"OPCODE_I_LOAD": _LOAD_WIDTHS, "OPCODE_S": _STORE_WIDTHS}.get(name, {}).get(f3, "WT_WORD")
+
+    writeback = "MUX_WB_ALU"
+    if name == "OPCODE_I_LOAD":
+        writeback = "MUX_WB_MEMORY"
+    elif name == "OPCODE_J" or (name == "OPCODE_I_JUMP" and f3 == 0):
+        writeback = "MUX_WB_PC_PLUS_4"
+
+    return {
+        "jump": jump,
+        "i_jump": i_jump,
+        "branch": branch,
+        "cond_code": COND_CODES[cond_code],
+        "mux_ALU_operand_A_select": ENUMS["mux_ALU_operand_A_enum"][mux_a],
+        "mux_ALU_operand_B_select": ENUMS["mux_ALU_operand_B_enum"][mux_b],
+        "ALU_op": ALU_OPS[alu_op],
+        "memory_transaction": mem_tx,
+        "mem_write": mem_w,
+        "width_type": WIDTH_TYPES[width_type],
+        "reg_write": reg_w,
+        "mux_writeback_select": ENUMS["mux_writeback_enum"][writeback],
+        "rs1_addr": rs1(instr),
+        "rs2_addr": rs2(instr),
+        "rd_addr": rd(instr),
+        "immediate": immediate(instr, imm),
+    }
+
+_ALU_NAMES = {v: k for k, v in ALU_OPS.items()}
+_COND_NAMES = {v: k for k, v in COND_CODES.items()}
+
+def alu_reference(alu_op, a, b): # ALU.sv on 32-bit unsigned operands
+    name = _ALU_NAMES.get(alu_op)
+    shamt = b & 0x1F
+    result = {
+        "ALU_ADD": lambda: a + b,
+        "ALU_SUB": lambda: a - b,
+        "ALU_XOR": lambda: a ^ b,
+        "ALU_OR": lambda: a | b,
+        "ALU_AND": lambda: a & b,
+        "ALU_SLL": lambda: a << shamt,
+        "ALU_SRL": lambda: a >> shamt,
+        "ALU_SRA": lambda: to_signed(a) >> shamt,
+        "ALU_SLT": lambda: int(to_signed(a) < to_signed(b)),
+        "ALU_SLTU": lambda: int(a < b),
+        "ALU_OPERAND_A": lambda: a,
+        "ALU_OPERAND_B": lambda: b,
+    }.get(name, lambda: 0)()
+    return result & 0xFFFFFFFF
+
+def compare_reference(cond_code, a, b): # RV32I branch condition on 32-bit unsigned operands
+    name = _COND_NAMES.get(cond_code)
+    sa, sb = to_signed(a), to_signed(b)
+    return {
+        "COND_EQUALS": a == b,
+        "COND_NOT_EQUALS": a != b,
+        "COND_LOWER": sa < sb,
+        "COND_GREATER_OR_EQUAL": sa >= sb,
+        "COND_LOWER_UNSIGNED": a < b,
+        "COND_GREATER_OR_EQUAL_UNSIGNED": a >= b,
+    }.get(name, False)
+
+def PC_source_reference(jump, i_jump, branch, cond_code, a, b, early_branch=0): # PC_source_E of execute_stage.sv
+    if early_branch: # Resolved in decode_stage
+        return 0b00
+    if jump or i_jump:
+        return 0b10
+    if branch and not compare_reference(cond_code, a, b):
+        return 0b01
+    return 0b00
+
+def PC_source_D_reference(jump, i_jump, branch, cond_code, a, b, early_branch=1): # PC_source_D of decode_stage.sv
+    return 0b10 if early_branch and (jump or i_jump or (branch and compare_reference(cond_code, a, b))) else 0b00
+
+def branch_target_reference(i_jump, pc, a, imm): # branch_target_D of decode_stage.sv
+    return (a + imm) & 0xFFFFFFFE if i_jump else (pc + imm) & 0xFFFFFFFF
+
+
+
+# --- Batch reference models (NumPy arrays of instructions / operands) ---
+_MASK32 = np.uint64(0xFFFFFFFF)
+
+def _u32(x):
+    return np.asarray(x, dtype=np.uint64) & _MASK32
+
+def _s32(x): # uint32 values as int64, sign extended
+    x = _u32(x).astype(np.int64)
+    return x - ((x >> 31) & 1) * (1 << 32)
+
+def alu_reference_batch(alu_op, a, b):
+    op, a, b = np.asarray(alu_op), _u32(a), _u32(b)
+    shamt = b & np.uint64(0x1F)
+    sa, sb = _s32(a), _s32(b)
+    results = {
+        "ALU_ADD": a + b,
+        "ALU_SUB": a - b,
+        "ALU_XOR": a ^ b,
+        "ALU_OR": a | b,
+        "ALU_AND": a & b,
+        "ALU_SLL": a << shamt,
+        "ALU_SRL": a >> shamt,
+        "ALU_SRA": (sa >> shamt.astype(np.int64)).astype(np.uint64),
+        "ALU_SLT": (sa < sb).astype(np.uint64),
+        "ALU_SLTU": (a < b).astype(np.uint64),
+        "ALU_OPERAND_A": a,
+        "ALU_OPERAND_B": b,
+    }
+    out = np.zeros(np.broadcast(op, a, b).shape, dtype=np.uint64)
+    for name, value in results.items():
+        out = np.where(op == ALU_OPS[name], value, out)
+    return out & _MASK32
+
+def compare_reference_batch(cond_code, a, b):
+    cond, a, b = np.asarray(cond_code), _u32(a), _u32(b)
+    sa, sb = _s32(a), _s32(b)
+    results = {
+        "COND_EQUALS": a == b,
+        "COND_NOT_EQUALS": a != b,
+        "COND_LOWER": sa < sb,
+        "COND_GREATER_OR_EQUAL": sa >= sb,
+        "COND_LOWER_UNSIGNED": a < b,
+        "COND_GREATER_OR_EQUAL_UNSIGNED": a >= b,
+    }
+    out = np.zeros(np.broadcast(cond, a, b).shape, dtype=bool)
+    for name, value in results.items():
+        out = np.where(cond == COND_CODES[name], value, out)
+    return out
+
+def PC_source_reference_batch(jump, i_jump, branch, cond_code, a, b, early_branch=0):
+    taken = compare_reference_batch(cond_code, a, b)
+    jumps = (np.asarray(jump) | np.asarray(i_jump)) != 0
+    pc_source = np.where(jumps, 0b10, np.where((np.asarray(branch) != 0) & ~taken, 0b01, 0b00)).astype(np.uint64)
+    return pc_source * np.uint64(not early_branch)
+
+def PC_source_D_reference_batch(jump, i_jump, branch, cond_code, a, b, early_branch=1):
+    taken = compare_reference_batch(cond_code, a, b)
+    redirect = ((np.asarray(jump) | np.asarray(i_jump)) != 0) | ((np.asarray(branch) != 0) & taken)
+    return np.where(redirect & bool(early_branch), 0b10, 0b00).astype(np.uint64)
+
+def branch_target_reference_batch(i_jump, pc, a, imm):
+    return np.where(np.asarray(i_jump) != 0, (_u32(a) + _u32(imm)) & np.uint64(0xFFFFFFFE), (_u32(pc) + _u32(imm)) & _MASK32)
+
+def immediate_batch(instr):
+    instr = _u32(instr)
+    sign = ((instr >> np.uint64(31)) & np.uint64(1)).astype(bool)
+    high = lambda mask: np.where(sign, np.uint64(mask), np.uint64(0))
+    field = lambda shift, bits: (instr >> np.uint64(shift)) & np.uint64((1 << bits) - 1)
+    values = {
+        "IMM_I": field(20, 12) | high(0xFFFFF000),
+        "IMM_S": (field(25, 7) << np.uint64(5)) | field(7, 5) | high(0xFFFFF000),
+        "IMM_B": (field(7, 1) << np.uint64(11)) | (field(25, 6) << np.uint64(5)) | (field(8, 4) << np.uint64(1)) | high(0xFFFFF000),
+        "IMM_U": instr & np.uint64(0xFFFFF000),
+        "IMM_J": (instr & np.uint64(0xFF000)) | (field(20, 1) << np.uint64(11)) | (field(21, 10) << np.uint64(1)) | high(0xFFF00000),
+    }
+    imm_type = immediate_type(instr.astype(np.int64))
+    out = np.zeros(instr.shape, dtype=np.uint64)
+    for name, value in values.items():
+        out = np.where(imm_type == IMMEDIATES[name], value, out)
+    return out & _MASK32
+
+@functools.lru_cache(maxsize=None)
+def _decode_table(): # decode_reference outputs for every (opcode, funct3, funct7); the rest is field extraction
+    keys = np.arange(1 << 17)
+    rows = [decode_reference(encode(int(k) & 0x7F, 0, (int(k) >> 7) & 0x7, 0, 0, int(k) >> 10)) for k in keys]
+    names = [n for n in rows[0] if n not in ("rs1_addr", "rs2_addr", "rd_addr", "immediate")]
+    return {n: np.array([r[n] for r in rows], dtype=np.uint64) for n in names}
+
+def decode_reference_batch(instr): # decode_reference over an array of instructions
+    instr = _u32(instr).astype(np.int64)
+    key = opcode(instr) | (funct3(instr) << 7) | (funct7(instr) << 10)
+    out = {name: column[key] for name, column in _decode_table().items()}
+    out["rs1_addr"] = rs1(instr).astype(np.uint64)
+    out["rs2_addr"] = rs2(instr).astype(np.uint64)
+    out["rd_addr"] = rd(instr).astype(np.uint64)
+    out["immediate"] = immediate_batch(instr)
+    return out
+
+# --- Operand classes ---
+# Relation between two 32-bit operands, signed and unsigned at once
+RELATIONS = {"EQ": 0, "SLT_ULT": 1, "SLT_UGT": 2, "SGT_ULT": 3, "SGT_UGT": 4}
+
+def operand_relation(a, b):
+    a = np.asarray(a, dtype=np.int64)
+    b = np.asarray(b, dtype=np.int64)
+    slt = to_signed(a) < to_signed(b)
+    ult = a < b
+    rel = np.where(slt, np.where(ult, 1, 2), np.where(ult, 3, 4))
+    return np.where(a == b, 0, rel)
+
+SHIFT_AMOUNTS = {"SHAMT_0": 0, "SHAMT_MID": (1, 30), "SHAMT_31": 31}
+
+
+# --- Coverage models ---
+FUNCT7_BINS = {"F7_0x00": 0x00, "F7_0x20": 0x20, "F7_OTHER": [(0x01, 0x1F), (0x21, 0x7F)]}
+FUNCT3_BINS = {f"F3_{v}": v for v in range(8)}
+
+def decode_covergroup(name="rv32i_decode"):
+    # Sampled columns: instruction, ALU_op, cond_code, width_type (decode_stage outputs)
+    points = [
+        Coverpoint("opcode", enum_bins(OPCODES), expr=lambda c: opcode(c["instruction"])),
+        Coverpoint("funct3", FUNCT3_BINS, expr=lambda c: funct3(c["instruction"])),
+        Coverpoint("funct7", FUNCT7_BINS, expr=lambda c: funct7(c["instruction"])),
+        Coverpoint("immediate_type", enum_bins(IMMEDIATES), expr=lambda c: immediate_type(c["instruction"])),
+        Coverpoint("ALU_op", enum_bins(ALU_OPS, ignore=("ALU_OPERAND_A", "ALU_NONE"))),
+        Coverpoint("cond_code", enum_bins(COND_CODES)),
+        Coverpoint("width_type", enum_bins(WIDTH_TYPES)),
+    ]
+    crosses = [
+        Cross("opcode_x_funct3_x_funct7", ["opcode", "funct3", "funct7"]),
+        Cross("opcode_x_ALU_op", ["opcode", "ALU_op"], bins=[
+            ("OPCODE_R", op) for op in ALU_OPS if op not in ("ALU_OPERAND_A", "ALU_OPERAND_B", "ALU_NONE")
+        ] + [
+            ("OPCODE_I_ALU", op) for op in ALU_OPS if op not in ("ALU_SUB", "ALU_OPERAND_A", "ALU_OPERAND_B", "ALU_NONE")
+        ]),
+    ]
+    return Covergroup(name, ["instruction", "ALU_op", "cond_code", "width_type"], points, crosses)
+
+def execute_covergroup(name="rv32i_execute"):
+    # Sampled columns: ALU_op, cond_code, operand_A, operand_B (forwarded operands of execute_stage)
+    shifts = ("ALU_SLL", "ALU_SRL", "ALU_SRA")
+    points = [
+        Coverpoint("ALU_op", enum_bins(ALU_OPS, ignore=("ALU_OPERAND_A", "ALU_NONE"))),
+        Coverpoint("cond_code", enum_bins(COND_CODES, ignore=("COND_NONE",))),
+        Coverpoint("shift_amount", SHIFT_AMOUNTS, expr=lambda c: c["operand_B"] & 0x1F),
+        Coverpoint("relation", RELATIONS, expr=lambda c: operand_relation(c["operand_A"], c["operand_B"])),
+    ]
+    crosses = [
+        Cross("shift_x_amount", ["ALU_op", "shift_amount"], bins=[(op, s) for op in shifts for s in SHIFT_AMOUNTS]),
+        Cross("cond_code_x_relation", ["cond_code", "relation"]),
+        Cross("compare_x_relation", ["ALU_op", "relation"], bins=[(op, r) for op in ("ALU_SLT", "ALU_SLTU") for r in RELATIONS]),
+    ]
+    return Covergroup(name, ["ALU_op", "cond_code", "operand_A", "operand_B"], points, crosses)
@@ -0,0 +1,234 @@
+# Stimulus minimization (delta debugging)
+#
+# Random tests draw their stimulus through stimulus(name, generate) and are decorated with
+# @record_stimulus. When such a test fails, its stimulus lists (instructions, stall patterns,
+# per-cycle input vectors, ...) are written to <sim>/stimulus/<test>.json. Setting
+# SVTB_STIMULUS=<file> makes stimulus() return the recorded lists instead of generating.
+#
+#   @cocotb.test()
+#   @record_stimulus
+#   async def test_random_backpressure(dut):
+#       ready = stimulus("ready", lambda: [random.random() < 0.5 for _ in range(256)])
+#
+# The shrinker reruns the failing test on reduced copies of the recording with ddmin, several
+# simulator processes at a time, until no single chunk can be removed, then saves the result
+# under <module>/tb/regressions/ where the testbench replays it as a regression test:
+#
+#   python -m svtb.shrink modules/RV32/RV32I_pipelined/pipe/sim/stimulus/test_random_backpressure.json -j 8
+import argparse
+import functools
+import hashlib
+import json
+import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+
+from svtb import rtl
+from svtb.farm import build, compile_env, sim_build
+from svtb.sim import Bench, parse_results, run_make
+
+
+STIMULUS_ENV = "SVTB_STIMULUS"
+STIMULUS_DIR = "stimulus"
+REGRESSIONS_DIR = "regressions"
+
+_recorded = {}
+_replay = None
+
+
+# --- Recording (inside tests) ---
+def _replayed():
+    if _replay is not None:
+        return _replay
+    path = os.environ.get(STIMULUS_ENV)
+    if path:
+        with open(path) as f:
+            return json.load(f)["stimulus"]
+    return None
+
+def stimulus(name, generate): # Recorded list when replaying, generate() otherwise
+    replayed = _replayed()
+    items = list(replayed[name]) if replayed is not None and name in replayed else list(generate())
+    _recorded[name] = items
+    return items
+
+@contextmanager
+def replaying(stim): # In-process replay of a saved stimulus dict
+    global _replay
+    _replay = stim
+    try:
+        yield
+    finally:
+        _replay = None
+
+def record_stimulus(test_fn): # Decorator: write the drawn stimulus out if the test fails
+    @functools.wraps(test_fn)
+    async def wrapper(dut, *args, **kwargs):
+        _recorded.clear()
+        try:
+            await test_fn(dut, *args, **kwargs)
+        except Exception as e:
+            if _replayed() is None and _recorded:
+                path = Path(STIMULUS_DIR) / f"{test_fn.__name__}.json"
+                path.parent.mkdir(parents=True, exist_ok=True)
+                with open(path, "w") as f:
+                    json.dump({
+                        "sim_dir": str(Path.cwd().resolve().relative_to(rtl.REPO_ROOT)),
+                        "test": test_fn.__name__,
+                        "seed": os.environ.get("COCOTB_RANDOM_SEED"),
+                        "error": f"{type(e).__name__}: {e}",
+                        "stimulus": _recorded,
+                    }, f)
+                dut._log.error(f"stimulus written to {path}, shrink with: python -m svtb.shrink {path.resolve()}")
+            raise
+
+    return wrapper
+
+def load_regressions(tb_dir, test): # [(path, stimulus)] saved by the shrinker for `test`
+    paths = sorted((Path(tb_dir) / REGRESSIONS_DIR).glob(f"{test}_*.json"))
+    return [(p, json.loads(p.read_text())["stimulus"]) for p in paths]
+
+
+# --- ddmin ---
+def _split(items, n):
+    size, extra = divmod(len(items), n)
+    chunks, start = [], 0
+    for i in range(n):
+        end = start + size + (i < extra)
+        chunks.append(items[start:end])
+        start = end
+    return chunks
+
+def ddmin(items, fails, jobs=1, log=print): # Zeller's ddmin; candidates of one round are evaluated in parallel
+    cache = {}
+
+    def first_failing(candidates):
+        with ThreadPoolExecutor(max_workers=max(jobs, 1)) as pool:
+            for start in range(0, len(candidates), max(jobs, 1)):
+                batch = candidates[start:start + max(jobs, 1)]
+                keys = [json.dumps(c) for c in batch]
+                todo = {k: c for k, c in zip(keys, batch) if k not in cache}
+                for k, result in zip(todo, pool.map(fails, todo.values())):
+                    cache[k] = result
+                for i, k in enumerate(keys):
+                    if cache[k]:
+                        return start + i
+        return None
+
+    if first_failing([[]]) is not None:
+        return []
+    n = 2
+    while len(items) >= 2:
+        chunks = _split(items, n)
+        complements = [sum(chunks[:i] + chunks[i + 1:], []) for i in range(n)] if n > 2 else []
+        found = first_failing(chunks + complements)
+        if found is not None and found < n:
+            items, n = chunks[found], 2
+        elif found is not None:
+            items, n = complements[found - n], max(n - 1, 2)
+        elif n >= len(items):
+            break
+        else:
+            n = min(2 * n, len(items))
+            continue
+        log(f"  -> {len(items)} items")
+    return items
+
+
+# --- Simulator runs ---
+class Reproducer:
+    # Runs one test of a bench against candidate stimuli; a candidate "fails" when the test
+    # fails again (and its log matches `match`, to stay on the original bug)
+    def __init__(self, bench, test, stimulus, params=None, match=None):
+        self.bench = bench
+        self.test = test
+        self.base = stimulus
+        self.params = params or {}
+        self.match = re.compile(match) if match else None
+        self.work_dir = bench.sim_dir / "shrink"
+        self.work_dir.mkdir(exist_ok=True)
+        self.env = compile_env(bench, self.params)
+        self.sim_build = sim_build(self.params)
+        self.runs = 0
+        build(bench, self.params)
+
+    def __call__(self, stim):
+        key = hashlib.sha1(json.dumps(stim, sort_keys=True).encode()).hexdigest()[:16]
+        stim_file = self.work_dir / f"{key}.json"
+        results = self.work_dir / f"{key}.xml"
+        with open(stim_file, "w") as f:
+            json.dump({"stimulus": stim}, f)
+        proc = run_make(
+            self.bench,
+            make_vars={
+                "SIM_BUILD": self.sim_build,
+                "COCOTB_TEST_FILTER": self.test,
+                "COCOTB_RESULTS_FILE": results,
+                "WAVES": 0,
+            },
+            env=dict(self.env, **{STIMULUS_ENV: str(stim_file), "WAVE_CAPTURE": "0"}),
+        )
+        self.runs += 1
+        cases = [c for c in parse_results(results) if c["name"] == self.test]
+        stim_file.unlink(missing_ok=True)
+        results.unlink(missing_ok=True)
+        failed = any(not c["passed"] for c in cases)
+        if failed and self.match:
+            failed = bool(self.match.search(proc.stdout + proc.stderr))
+        return failed
+
+    def with_field(self, field, items):
+        return dict(self.base, **{field: items})
+
+
+def shrink(record_path, fields=None, params=None, match=None, jobs=4, log=print):
+    with open(record_path) as f:
+        record = json.load(f)
+    bench = Bench(rtl.REPO_ROOT / record["sim_dir"] / "Makefile")
+    repro = Reproducer(bench, record["test"], record["stimulus"], params, match)
+
+    if not repro(repro.base):
+        raise RuntimeError(f"{record['test']} does not fail on the recorded stimulus")
+    fields = fields or sorted(repro.base, key=lambda k: -len(repro.base[k]))
+    before = {k: len(v) for k, v in repro.base.items()}
+    for field in fields:
+        log(f"[shrink] {field}: {len(repro.base[field])} items")
+        reduced = ddmin(repro.base[field], lambda items: repro(repro.with_field(field, items)), jobs, log)
+        repro.base = repro.with_field(field, reduced)
+
+    stim = repro.base
+    digest = hashlib.sha1(json.dumps(stim, sort_keys=True).encode()).hexdigest()[:8]
+    out = bench.module_dir / "tb" / REGRESSIONS_DIR / f"{record['test']}_{digest}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    with open(out, "w") as f:
+        json.dump({
+            "test": record["test"],
+            "error": record.get("error"),
+            "lengths": {k: [before[k], len(v)] for k, v in stim.items()},
+            "stimulus": stim,
+        }, f, indent=1)
+    log(f"{repro.runs} simulator runs, " + ", ".join(f"{k} {before[k]}->{len(v)}" for k, v in stim.items()))
+    log(f"saved {out.relative_to(rtl.REPO_ROOT)}")
+    return out
+
+
+# --- CLI ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m svtb.shrink")
+    parser.add_argument("record", help="stimulus JSON written by @record_stimulus")
+    parser.add_argument("-f", "--field", action="append", help="stimulus list to shrink (default: all, longest first)")
+    parser.add_argument("-P", "--param", action="append", default=[], help="toplevel parameter NAME=VALUE")
+    parser.add_argument("--match", help="regex the failing log must match, to stay on the same bug")
+    parser.add_argument("-j", "--jobs", type=int, default=4)
+    args = parser.parse_args(argv)
+
+    params = dict(p.split("=", 1) for p in args.param)
+    shrink(args.record, args.field, params, args.match, args.jobs)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+# Testbench discovery and simulator invocation through the sim/Makefile of every module
+#
+# A module may add builds of the same tb under other parameters as sim_<variant>/Makefile
+# (e.g. decode_stage/sim_early_branch, COMPILE_ARGS += -Pdecode_stage.EARLY_BRANCH=1); each
+# is its own bench, named <module>/sim_<variant>.
+import os
+import re
+import subprocess
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+from svtb.rtl import MODULES_DIR, REPO_ROOT
+
+
+SIM_DIR = "sim"
+
+
+# --- Makefiles ---
+_ASSIGN_RE = re.compile(r"^(?:export\s+)?([A-Za-z_][A-Za-z0-9_]*)\s*(\+=|\?=|:=|=)\s*(.*)$")
+_REF_RE = re.compile(r"\$[({]([A-Za-z_][A-Za-z0-9_]*)[)}]")
+
+def parse_makefile(path, overrides=None): # Variable assignments of a cocotb sim Makefile, $(PWD) = its dir
+    path = Path(path)
+    text = re.sub(r"\\\n", " ", path.read_text())
+    vars_ = {"PWD": str(path.parent), "CURDIR": str(path.parent)}
+    overrides = overrides or {}
+
+    def expand(value, depth=0):
+        value = re.sub(r"\$\(shell [^)]*\)", "", value)
+        if depth > 8:
+            return value
+        expanded = _REF_RE.sub(lambda m: vars_.get(m.group(1), ""), value)
+        return expanded if expanded == value else expand(expanded, depth + 1)
+
+    for line in text.splitlines():
+        line = line.split("#", 1)[0].rstrip()
+        m = _ASSIGN_RE.match(line.strip())
+        if not m or line.startswith("\t"):
+            continue
+        name, op, value = m.groups()
+        if name in overrides:
+            continue
+        value = expand(value.strip())
+        if op == "+=":
+            vars_[name] = (vars_.get(name, "") + " " + value).strip()
+        elif op == "?=":
+            vars_.setdefault(name, value)
+        else:
+            vars_[name] = value
+    vars_.update(overrides)
+    return vars_
+
+
+class Bench:
+    def __init__(self, makefile):
+        self.makefile = Path(makefile)
+        self.sim_dir = self.makefile.parent
+        self.module_dir = self.sim_dir.parent
+        self.name = str(self.module_dir.relative_to(REPO_ROOT))
+        if self.sim_dir.name != SIM_DIR:
+            self.name += f"/{self.sim_dir.name}"
+        self.vars = parse_makefile(self.makefile)
+        self.toplevel = self.vars.get("COCOTB_TOPLEVEL") or self.vars.get("TOPLEVEL", "")
+        self.test_modules = (self.vars.get("COCOTB_TEST_MODULES") or self.vars.get("MODULE", "")).replace(",", " ").split()
+        self.sources = [Path(os.path.normpath(s)) for s in self.vars.get("VERILOG_SOURCES", "").split()]
+        self.pythonpath = [Path(os.path.normpath(p)) for p in self.vars.get("PYTHONPATH", "").split(":") if p]
+
+    def __repr__(self):
+        return f"Bench({self.name})"
+
+    def test_files(self): # tb_*.py files named by COCOTB_TEST_MODULES
+        files = []
+        for module in self.test_modules:
+            for d in self.pythonpath:
+                f = d / (module.replace(".", "/") + ".py")
+                if f.exists():
+                    files.append(f)
+                    break
+        return files
+
+
+def _is_sim_dir(name): # sim/ or sim_<variant>/, not a simulator build dir
+    return name == SIM_DIR or (name.startswith(SIM_DIR + "_") and not name.startswith("sim_build"))
+
+def find_benches(root=MODULES_DIR): # Every module directory with a sim/Makefile, plus its sim_<variant>/ builds
+    return sorted(
+        (Bench(m) for m in Path(root).rglob("Makefile") if _is_sim_dir(m.parent.name) and not any(p.startswith("sim_build") for p in m.parts)),
+        key=lambda b: b.name,
+    )
+
+
+# --- Running ---
+def make_env(bench, env=None): # Makefiles rely on $(PWD), so it must point at the sim dir
+    full = dict(os.environ)
+    full.update(env or {})
+    full["PWD"] = str(bench.sim_dir)
+    return full
+
+def run_make(bench, make_vars=None, env=None, target=None, timeout=None):
+    cmd = ["make", "--no-print-directory"]
+    cmd += [f"{k}={v}" for k, v in (make_vars or {}).items()]
+    if target:
+        cmd.append(target)
+    return subprocess.run(
+        cmd, cwd=bench.sim_dir, env=make_env(bench, env),
+        capture_output=True, text=True, timeout=timeout,
+    )
+
+
+def parse_results(path): # cocotb results.xml -> [{name, classname, passed, skipped, time, sim_time_ns}]
+    path = Path(path)
+    if not path.exists():
+        return []
+    cases = []
+    for case in ET.parse(path).getroot().iter("testcase"):
+        cases.append({
+            "name": case.get("name"),
+            "classname": case.get("classname"),
+            "passed": case.find("failure") is None and case.find("error") is None,
+            "skipped": case.find("skipped") is not None,
+            "time": float(case.get("time", 0)),
+            "sim_time_ns": float(case.get("sim_time_ns", 0)),
+        })
+    return cases
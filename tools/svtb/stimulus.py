@@ -0,0 +1,199 @@
+# Coverage-directed stimulus generation
+#
+# Closed loop: read the holes of a Covergroup, solve for stimuli that hit them, let the
+# testbench apply them (it samples the DUT into the same Covergroup), repeat until the
+# coverage goals are met or the budget runs out.
+#
+# Solving is done offline and in bulk: a broad, structured candidate pool is generated,
+# run through a reference model, binned with the covergroup's own coverpoints (vectorized),
+# and greedily picked so that every applied stimulus closes as many holes as possible.
+#
+#   engine = CoverageDirected(cg, decode_space())
+#   for stim in engine:
+#       ...drive stim["instruction"], sample the DUT into cg...
+#
+# Compare against blind random on the reference model only (no simulator):
+#   python -m svtb.stimulus --space decode
+import argparse
+import random
+
+import numpy as np
+
+from svtb import rv32i
+
+
+# --- Spaces ---
+# A space bundles how to draw candidates and how the reference model maps them to covergroup columns
+class Space:
+    def __init__(self, name, covergroup, candidate, columns, blind):
+        self.name = name
+        self.covergroup = covergroup # () -> fresh Covergroup
+        self.candidate = candidate   # rng -> stimulus dict (structured, corner-biased)
+        self.columns = columns       # [stimulus] -> {column: array} through the reference model
+        self.blind = blind           # rng -> stimulus dict (plain uniform random)
+
+
+def _random_word(rng):
+    return rng.getrandbits(32)
+
+_CORNER_WORDS = (0x00000000, 0x00000001, 0x0000001F, 0x7FFFFFFF, 0x80000000, 0xFFFFFFFF)
+
+def _corner_word(rng): # Boundary values most of the time, uniform otherwise
+    return rng.choice(_CORNER_WORDS) if rng.random() < 0.5 else _random_word(rng)
+
+def _corner_operands(rng):
+    a = _corner_word(rng)
+    mode = rng.randrange(4)
+    if mode == 0:
+        b = a                                      # equal operands
+    elif mode == 1:
+        b = (a + rng.choice((1, -1))) & 0xFFFFFFFF # neighbours
+    elif mode == 2:
+        b = (a & ~0x1F) | rng.choice((0, 31, rng.randrange(1, 31))) # shift amount corners
+    else:
+        b = _corner_word(rng)
+    return (a, b) if rng.random() < 0.5 else (b, a)
+
+
+def _decode_candidate(rng):
+    opcode = rng.choice(list(rv32i.OPCODES.values())) if rng.random() < 0.95 else rng.randrange(128)
+    funct7 = rng.choice((0x00, 0x20, rng.randrange(128)))
+    instr = rng.getrandbits(32) & ~((0x7F << 25) | (0x7 << 12) | 0x7F)
+    return {"instruction": instr | rv32i.encode(opcode, funct3=rng.randrange(8), funct7=funct7)}
+
+def _decode_columns(stims):
+    decoded = [rv32i.decode_reference(s["instruction"]) for s in stims]
+    return {
+        "instruction": np.array([s["instruction"] for s in stims], dtype=np.int64),
+        "ALU_op": np.array([d["ALU_op"] for d in decoded], dtype=np.int64),
+        "cond_code": np.array([d["cond_code"] for d in decoded], dtype=np.int64),
+        "width_type": np.array([d["width_type"] for d in decoded], dtype=np.int64),
+    }
+
+def decode_space():
+    return Space(
+        "decode", rv32i.decode_covergroup, _decode_candidate, _decode_columns,
+        lambda rng: {"instruction": _random_word(rng)},
+    )
+
+
+_EXECUTE_ALU_OPS = [v for k, v in rv32i.ALU_OPS.items() if k != "ALU_NONE"]
+_EXECUTE_CONDS = list(rv32i.COND_CODES.values())
+
+def _execute_candidate(rng):
+    a, b = _corner_operands(rng)
+    return {
+        "ALU_op": rng.choice(_EXECUTE_ALU_OPS),
+        "cond_code": rng.choice(_EXECUTE_CONDS),
+        "operand_A": a,
+        "operand_B": b,
+    }
+
+def _execute_columns(stims):
+    return {c: np.array([s[c] for s in stims], dtype=np.int64) for c in ("ALU_op", "cond_code", "operand_A", "operand_B")}
+
+def execute_space():
+    return Space(
+        "execute", rv32i.execute_covergroup, _execute_candidate, _execute_columns,
+        lambda rng: {
+            "ALU_op": rng.choice(_EXECUTE_ALU_OPS),
+            "cond_code": rng.choice(_EXECUTE_CONDS),
+            "operand_A": _random_word(rng),
+            "operand_B": _random_word(rng),
+        },
+    )
+
+SPACES = {"decode": decode_space, "execute": execute_space}
+
+
+# --- Engine ---
+class CoverageDirected:
+    def __init__(self, covergroup, space, budget=100_000, pool=2048, batch=64, seed=None):
+        self.cg = covergroup
+        self.space = space
+        self.budget = budget # Max stimuli yielded
+        self.pool = pool     # Candidates solved per refill
+        self.batch = batch   # Stimuli yielded between hole re-reads
+        self.rng = random.Random(seed)
+        self.generated = 0
+
+    def _classify(self, stims): # Per candidate: set of (item, bin index) it would hit
+        columns = self.space.columns(stims)
+        indexes = {n: p.bin_indexes(columns) for n, p in self.cg.points.items()}
+        for n, x in self.cg.crosses.items():
+            indexes[n] = x.bin_indexes(indexes)
+        return indexes
+
+    def _solve(self, holes): # Greedy set cover of the current holes over a fresh candidate pool
+        stims = [self.space.candidate(self.rng) for _ in range(self.pool)]
+        indexes = self._classify(stims)
+        label_index = {n: {l: i for i, l in enumerate(i_.labels)} for n, i_ in self.cg.items.items()}
+        wanted = {}
+        for item, label in holes:
+            wanted.setdefault(item, set()).add(label_index[item][label])
+
+        hits = [set() for _ in stims]
+        for item, bins in wanted.items():
+            for k, b in enumerate(indexes[item].tolist()):
+                if b in bins:
+                    hits[k].add((item, b))
+
+        picked = []
+        open_holes = {(item, b) for item, bins in wanted.items() for b in bins}
+        while open_holes and len(picked) < self.batch:
+            best = max(range(len(stims)), key=lambda k: len(hits[k] & open_holes))
+            gain = hits[best] & open_holes
+            if not gain:
+                break # Remaining holes unreachable from this pool, retry on the next refill
+            picked.append(stims[best])
+            open_holes -= gain
+        return picked
+
+    def __iter__(self):
+        while self.generated < self.budget:
+            holes = self.cg.holes()
+            if not holes:
+                return
+            batch = self._solve(holes) or [self.space.candidate(self.rng) for _ in range(self.batch)]
+            for stim in batch:
+                if self.generated >= self.budget:
+                    return
+                self.generated += 1
+                yield stim
+
+
+def blind_random(covergroup, space, budget=100_000, batch=64, seed=None): # Baseline generator
+    rng = random.Random(seed)
+    generated = 0
+    while generated < budget and not covergroup.goals_met():
+        for _ in range(min(batch, budget - generated)):
+            generated += 1
+            yield space.blind(rng)
+
+
+# --- Offline comparison against the reference model ---
+def run_offline(space, generator_fn, budget, seed):
+    cg = space.covergroup()
+    count = 0
+    for stim in generator_fn(cg, space, budget=budget, seed=seed):
+        columns = space.columns([stim])
+        cg.sample(*(int(columns[c][0]) for c in cg.columns))
+        count += 1
+    return count, cg.coverage()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m svtb.stimulus")
+    parser.add_argument("--space", choices=sorted(SPACES), default="decode")
+    parser.add_argument("--budget", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=666)
+    args = parser.parse_args(argv)
+
+    space = SPACES[args.space]()
+    directed = lambda cg, sp, budget, seed: CoverageDirected(cg, sp, budget=budget, seed=seed)
+    for name, fn in (("blind random", blind_random), ("coverage directed", directed)):
+        count, pct = run_offline(space, fn, args.budget, args.seed)
+        print(f"{args.space:<8} {name:<18} {count:>8} stimuli  {pct:6.2f}% coverage")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,352 @@
+# Cycle-approximate timing model of the five-stage RV32I pipeline
+#
+# Replays an ISS trace (one entry per retired instruction) through F/D/E/M/W and computes the
+# cycle each instruction enters every stage from: one instruction per stage, in order; operands
+# forwarded from M/W or read back from the regfile; redirects taking effect through the fetch
+# PC mux (a taken prediction in decode the same cycle, a resolved redirect the next one, as
+# PC_source_E into reg_PC); IMEM/DMEM ready stalls; DMEM latency and memory_stage's store
+# buffer. Every stall cycle is charged to the cause that delayed the instruction, giving a CPI
+# stack per kernel. Wrong-path instructions are not modelled, only the cycles they cost.
+#
+#   python -m svtb.timing run                                         # CPI stacks, default pipeline
+#   python -m svtb.timing run crc32 fsm -P predictor=not_taken,taken,bimodal -P resolve_stage=D,E
+#   python -m svtb.timing run -P read_latency=1,2,4 -P store_buffer=0,4 -j 8 --json sweep.json
+#   python -m svtb.timing calibrate core/sim/bench/kernels.json --fit startup=0,1,2 --fit fetch_latency=1,2,3
+#
+# Calibration replays the kernels of a tb_core report (svtb.kernels) with its DMEM timing and
+# reports model against RTL cycles per kernel; --fit grid-searches the given parameters for the
+# lowest mean error. Parameter sets run in parallel processes, each tracing a kernel once.
+import argparse
+import functools
+import json
+import random
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from svtb import rv32i
+from svtb.farm import param_label, param_sets
+from svtb.iss import TOHOST, Iss
+
+
+DEFAULTS = {
+    "predictor": "taken",       # not_taken | taken (branches and jal to PC_D + imm, as mux_predictor) | btfn | bimodal | perfect
+    "bht_entries": 64,          # bimodal: 2-bit counters indexed by PC
+    "resolve_stage": "E",       # Where mispredictions redirect fetch: E (execute_stage) or D (decode_stage EARLY_BRANCH)
+    "forwarding": 1,            # 0: operands only through the regfile
+    "fetch_latency": 2,         # PC_F taken by IMEM -> instruction in decode (imem.sv output register + FD pipe)
+    "execute_latency": 1,
+    "mul_latency": 3,           # M extension, for traces that contain it
+    "div_latency": 34,
+    "read_latency": 1,          # DMEM, as svtb.dmem.DmemModel
+    "accept_cycles": 1,
+    "store_buffer": 4,          # memory_stage SB_DEPTH, 0 = STORE_BUFFER_EN=0
+    "write_combining": 1,
+    "imem_stall_prob": 0.0,     # Chance per cycle that IMEM/DMEM is not ready
+    "dmem_stall_prob": 0.0,
+    "startup": 1,               # Cycles from reset release to the first fetch
+    "seed": 0,
+}
+PREDICTORS = ("not_taken", "taken", "btfn", "bimodal", "perfect")
+CAUSES = ("mispredict", "jump", "taken_bubble", "raw", "load_use", "mul", "load", "store", "imem")
+
+_OP = {v: k for k, v in rv32i.OPCODES.items()}
+_SIZES = {0: 1, 1: 2, 2: 4, 4: 1, 5: 2} # funct3 -> access bytes
+
+
+def typed(key, value): # CLI string -> the type of the default
+    if key not in DEFAULTS:
+        raise ValueError(f"unknown parameter {key!r}, one of {', '.join(DEFAULTS)}")
+    return type(DEFAULTS[key])(value)
+
+def _check(p):
+    if p["predictor"] not in PREDICTORS:
+        raise ValueError(f"predictor {p['predictor']!r}, one of {', '.join(PREDICTORS)}")
+    if p["resolve_stage"] not in ("D", "E"):
+        raise ValueError(f"resolve_stage {p['resolve_stage']!r}, D or E")
+
+
+# --- Traces ---
+@functools.lru_cache(maxsize=None)
+def kernel_trace(name): # ISS trace of a kernel image, once per process
+    from svtb.kernels import initial_memory, load
+    words, expected = load(name)
+    iss = Iss(words, initial_memory(expected), trace=True)
+    iss.run()
+    return tuple(iss.trace)
+
+def _klass(t): # Trace class, with the M extension split out of OP
+    instr = t["instr"]
+    if instr & 0x7F == rv32i.OPCODES["OPCODE_R"] and rv32i.funct7(instr) == 1:
+        return "mul" if rv32i.funct3(instr) < 4 else "div"
+    return t["class"]
+
+def _byte_mask(addr, f3):
+    return ((1 << _SIZES.get(f3, 4)) - 1) << (addr & 3) & 0xF
+
+
+# --- Model ---
+class _Dmem:
+    # DMEM port and store buffer: one request per `accept_cycles`, loads before buffered stores,
+    # the buffer frozen while a read is outstanding, loads served from fully buffered bytes
+    def __init__(self, p, rng):
+        self.p = p
+        self.rng = rng
+        self.port_next = 0
+        self.buffer = deque() # [word, byte mask, cycle pushed]
+        self.last_fire = 0
+
+    def _fire(self, t): # -> cycle DMEM takes a request offered from t
+        t = max(t, self.port_next) + _stalls(self.rng, self.p["dmem_stall_prob"])
+        self.port_next = t + self.p["accept_cycles"]
+        self.last_fire = t
+        return t
+
+    def _drain_oldest(self):
+        word, mask, pushed = self.buffer.popleft()
+        return self._fire(pushed + 1)
+
+    def drain_until(self, t): # Buffered stores that reach DMEM before cycle t
+        while self.buffer and max(self.buffer[0][2] + 1, self.port_next) < t:
+            self._drain_oldest()
+
+    def drain(self): # -> cycle the last buffered store reaches DMEM
+        while self.buffer:
+            self._drain_oldest()
+        return self.last_fire
+
+    def load(self, m, addr, f3): # -> cycle the load leaves M
+        self.drain_until(m)
+        word, need = addr >> 2, _byte_mask(addr, f3)
+        have = 0
+        for w, mask, _ in self.buffer:
+            have |= mask if w == word else 0
+        if self.p["store_buffer"] and have & need == need:
+            return m + 1
+        ret = self._fire(m) + self.p["read_latency"]
+        self.port_next = max(self.port_next, ret + 1)
+        return ret + 1
+
+    def store(self, m, addr, f3): # -> cycle the store leaves M
+        word, mask = addr >> 2, _byte_mask(addr, f3)
+        if not self.p["store_buffer"]:
+            return self._fire(m) + 1
+        self.drain_until(m + 1)
+        # Not into an entry already on the port
+        on_port = len(self.buffer) == 1 and max(self.buffer[0][2] + 1, self.port_next) <= m
+        if self.p["write_combining"] and self.buffer and self.buffer[-1][0] == word and not on_port:
+            self.buffer[-1][1] |= mask
+            return m + 1
+        leave = m + 1
+        if len(self.buffer) >= self.p["store_buffer"]: # Full: accepted the cycle the oldest drains
+            leave = max(m, self._drain_oldest()) + 1
+        self.buffer.append([word, mask, leave - 1])
+        return leave
+
+
+def _stalls(rng, prob): # Not-ready cycles before a handshake completes
+    n = 0
+    while prob and rng.random() < prob:
+        n += 1
+    return n
+
+def _latest(*terms): # (cycle, cause) of the binding constraint; the first one wins ties
+    return max(terms, key=lambda term: term[0])
+
+def _predict(p, t, klass, bht): # -> predicted taken in decode
+    predictor = p["predictor"]
+    if klass == "jalr" or predictor in ("not_taken", "perfect"):
+        return predictor == "perfect" and t["taken"]
+    if klass == "jal" or predictor == "taken":
+        return True
+    if predictor == "btfn":
+        return rv32i.immediate(t["instr"], "IMM_B") >> 31 == 1 # Backward: negative offset
+    index = (t["pc"] >> 2) % p["bht_entries"]
+    taken = bht[index] >= 2
+    bht[index] = min(bht[index] + 1, 3) if t["taken"] else max(bht[index] - 1, 0)
+    return taken
+
+
+def simulate(trace, params=None): # -> {cycles, instret, cpi, ipc, stalls, stack}
+    p = dict(DEFAULTS, **(params or {}))
+    _check(p)
+    rng = random.Random(p["seed"])
+    dmem = _Dmem(p, rng)
+    bht = [1] * p["bht_entries"] # Weakly not taken
+    fl, el = p["fetch_latency"], p["execute_latency"]
+    dist = [fl + el + 2, el + 2, el + 1, 1, 0] # Stage entry -> W entry, no stalls
+
+    stalls = dict.fromkeys(CAUSES, 0)
+    prev = [-1] * 5 # Stage entry cycles of the previous instruction
+    ready = {} # register -> (cycle a consumer may read it in E (or D when resolving there), cause)
+    redirect = (0, "base") # Earliest fetch of the next instruction
+    end = 0
+    for i, t in enumerate(trace):
+        op = _OP[t["instr"] & 0x7F]
+        klass = _klass(t)
+        control = klass in ("branch", "jal", "jalr")
+        early = control and p["resolve_stage"] == "D"
+        sources = [t[s] for s in rv32i.OPCODE_SOURCES[op] if t[s]]
+        # Forwarded operands are read where they are used; without forwarding everyone reads the regfile in D
+        operand = _latest((0, "base"), *(ready.get(r, (0, "base")) for r in sources))
+
+        f = _latest((prev[0] + 1, "base"), redirect, (prev[1] + 1 - fl, "base"))
+        stall = _stalls(rng, p["imem_stall_prob"])
+        if stall:
+            f = (f[0] + stall, "imem")
+        d = _latest((f[0] + fl, "base"), (prev[1] + 1, "base"), (prev[2], "base"),
+                    operand if early or not p["forwarding"] else (0, "base"))
+        e = _latest((d[0] + 1, "base"), (prev[2] + 1, "base"), (prev[3], "base"),
+                    operand if p["forwarding"] and not early else (0, "base"))
+        latency = {"mul": p["mul_latency"], "div": p["div_latency"]}.get(klass, el)
+        m = _latest((e[0] + latency, "mul" if latency > el else "base"), (prev[3] + 1, "base"), (prev[4], "base"))
+        if klass == "load":
+            leave = (dmem.load(m[0], t["addr"], rv32i.funct3(t["instr"])), "load")
+        elif klass == "store":
+            leave = (dmem.store(m[0], t["addr"], rv32i.funct3(t["instr"])), "store")
+        else:
+            leave = (m[0] + 1, "base")
+        w = _latest(leave, (prev[4] + 1, "base"))
+        times = [f, d, e, m, w]
+
+        if i: # Charge the growth of the lateness against the previous retirement to each stage's binding cause
+            late = 0
+            for s, (cycle, cause) in enumerate(times):
+                now = max(cycle - (prev[4] + 1 - dist[s]), 0)
+                if now > late:
+                    stalls[cause] += now - late
+                    late = now
+        prev = [cycle for cycle, _ in times]
+
+        if t["rd"]: # Forwarded from M (ALU) or W (loads); the regfile is written on the W negedge, readable in D
+            forwarded = p["forwarding"] and klass != "load"
+            ready[t["rd"]] = (prev[3] if forwarded else prev[4], "load_use" if klass == "load" else "raw")
+
+        redirect = (0, "base")
+        if control:
+            predicted = _predict(p, t, klass, bht)
+            resolve = prev[1] if early or p["predictor"] == "perfect" else prev[2]
+            if predicted == t["taken"]:
+                if predicted and p["predictor"] != "perfect":
+                    redirect = (prev[1], "taken_bubble")
+            else:
+                redirect = (resolve + 1, "mispredict" if klass == "branch" else "jump")
+        if klass == "store" and t["addr"] == TOHOST:
+            end = dmem.drain() if p["store_buffer"] else dmem.last_fire
+
+    instret = len(trace)
+    cycles = p["startup"] + end + 1
+    fill = cycles - instret - sum(stalls.values())
+    return {
+        "cycles": cycles,
+        "instret": instret,
+        "cpi": cycles / instret,
+        "ipc": instret / cycles,
+        "stalls": stalls,
+        "stack": dict({"base": 1.0, "fill": fill / instret}, **{c: n / instret for c, n in stalls.items()}),
+    }
+
+
+# --- Sweeps ---
+def evaluate(job): # Pool worker: (kernel, params) -> (kernel, params, result)
+    name, params = job
+    return name, params, simulate(kernel_trace(name), params)
+
+def sweep(kernels, params_list, jobs=1): # -> [(kernel, params, result)] for every combination
+    work = [(name, params) for params in params_list for name in kernels]
+    if jobs <= 1 or len(work) == 1:
+        return [evaluate(job) for job in work]
+    # Chunks of one parameter set share a worker's traces
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(evaluate, work, chunksize=max(len(kernels), 1)))
+
+def grid(specs): # ["read_latency=1,2"] -> [{read_latency: 1}, {read_latency: 2}], typed
+    return [{k: typed(k, v) for k, v in combo.items()} for combo in param_sets(specs)]
+
+
+# --- Calibration ---
+def report_params(report): # DMEM timing the tb_core report ran with
+    return {k: typed(k, v) for k, v in report.get("dmem", {}).items() if k in DEFAULTS}
+
+def calibrate(report, params=None, fit_specs=(), jobs=1): # -> (best params, rows, mean |error|)
+    rtl = report["kernels"]
+    kernels = sorted(rtl)
+    base = dict(params or {}, **report_params(report))
+    candidates = [dict(base, **combo) for combo in grid(fit_specs)] if fit_specs else [base]
+    errors = {}
+    rows = {}
+    for name, params, result in sweep(kernels, candidates, jobs):
+        label = param_label(params)
+        error = (result["cycles"] - rtl[name]["cycles"]) / rtl[name]["cycles"]
+        errors.setdefault(label, (params, []))[1].append(abs(error))
+        rows.setdefault(label, []).append({
+            "kernel": name, "rtl_cycles": rtl[name]["cycles"], "model_cycles": result["cycles"],
+            "rtl_cpi": rtl[name]["cpi"], "model_cpi": result["cpi"], "error": error,
+        })
+    label, (best, errs) = min(errors.items(), key=lambda item: sum(item[1][1]) / len(item[1][1]))
+    return best, rows[label], sum(errs) / len(errs)
+
+
+# --- Reports ---
+def stack_table(results): # One line per (parameter set, kernel): CPI and its stack
+    shown = ["base", "fill"] + list(CAUSES)
+    lines = [f"{'params':32} {'kernel':16} {'cycles':>8} {'cpi':>6}  " + " ".join(f"{c[:8]:>8}" for c in shown)]
+    for name, params, r in results:
+        stack = " ".join(f"{r['stack'][c]:8.3f}" for c in shown)
+        lines.append(f"{param_label(params)[:32]:32} {name:16} {r['cycles']:8} {r['cpi']:6.3f}  {stack}")
+    return "\n".join(lines)
+
+def summary(results): # Mean CPI over the kernels per parameter set, best first
+    totals = {}
+    for _, params, r in results:
+        totals.setdefault(param_label(params), []).append(r["cpi"])
+    ranked = sorted(totals.items(), key=lambda item: sum(item[1]) / len(item[1]))
+    return "\n".join(f"{sum(cpis) / len(cpis):7.3f}  {label}" for label, cpis in ranked)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m svtb.timing")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("run", help="CPI stacks per kernel, for every combination of -P values")
+    p.add_argument("kernels", nargs="*", help="default: every kernel")
+    p.add_argument("-P", "--param", action="append", default=[], help="NAME=v1,v2,... (see DEFAULTS)")
+    p.add_argument("-j", "--jobs", type=int, default=1)
+    p.add_argument("--json", default=None, help="also write the results here")
+    p = sub.add_parser("calibrate", help="model against RTL cycles of a tb_core report")
+    p.add_argument("report")
+    p.add_argument("-P", "--param", action="append", default=[], help="NAME=value, fixed")
+    p.add_argument("--fit", action="append", default=[], help="NAME=v1,v2,... searched for the lowest error")
+    p.add_argument("-j", "--jobs", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    try:
+        if args.cmd == "run":
+            from svtb.kernels import names
+            results = sweep(args.kernels or names(), grid(args.param), args.jobs)
+        else:
+            fixed = grid(args.param)
+            if len(fixed) != 1:
+                parser.error("calibrate: -P takes one value per parameter")
+            report = json.loads(Path(args.report).read_text())
+            best, rows, error = calibrate(report, fixed[0], args.fit, args.jobs)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.cmd == "run":
+        print(stack_table(results))
+        if len({param_label(params) for _, params, _ in results}) > 1:
+            print("\nmean CPI per parameter set:\n" + summary(results))
+        if args.json:
+            Path(args.json).write_text(json.dumps([{"kernel": n, "params": pr, **r} for n, pr, r in results], indent=1))
+        return 0
+
+    print(f"{'kernel':16} {'rtl cyc':>8} {'model':>8} {'rtl cpi':>8} {'model':>7} {'error':>7}")
+    for row in rows:
+        print(f"{row['kernel']:16} {row['rtl_cycles']:8} {row['model_cycles']:8} {row['rtl_cpi']:8.3f} {row['model_cpi']:7.3f} {100 * row['error']:+6.1f}%")
+    print(f"mean |error| {100 * error:.1f}% with {param_label(best)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+# Hang watchdog for cocotb tests
+#
+# Runs the test body as a task next to a watcher and fails the test as soon as one of its
+# budgets runs out, instead of letting a deadlocked test spin until the global timeout:
+#   - sim_time: simulated time, as (value, unit)
+#   - wall_s: wall-clock seconds, checked every few hundred cycles
+#   - stall_cycles: cycles without forward progress, where progress is a handshake on any
+#     ready/valid interface of the toplevel (svtb.handshake) or a change of one of the
+#     `progress` signals (a commit counter, PC, ...)
+# The failure report lists every ready/valid pair with its current state, so a deadlock shows
+# which side is waiting for which. The test task is cancelled; clocks it started with
+# cocotb.start_soon end with the test as usual, and the rest of the suite keeps running.
+#
+#   @cocotb.test()
+#   @watchdog(sim_time=(50, "us"), wall_s=30, stall_cycles=1000, progress=["PC_F"])
+#   async def test_PC_counting(dut): ...
+#
+# WATCHDOG=0 disables it, WATCHDOG_SCALE=<factor> stretches every budget (waves, slow hosts).
+import functools
+import os
+import time
+
+import cocotb
+from cocotb.triggers import ClockCycles, First, Timer
+from cocotb.utils import get_sim_time
+
+from svtb.handshake import attach_monitors, release_monitors
+
+
+WATCHDOG_ENV = "WATCHDOG"
+SCALE_ENV = "WATCHDOG_SCALE"
+POLL_CYCLES = 256
+POLL_TIME = (1, "us") # Without a clock
+
+_running = set() # Watchdogs of the tests in progress
+
+
+class Watchdog:
+    def __init__(self, dut, sim_time=None, wall_s=None, stall_cycles=None, progress=(), clock="clk"):
+        scale = float(os.environ.get(SCALE_ENV, 1))
+        self.dut = dut
+        self.sim_time = (sim_time[0] * scale, sim_time[1]) if sim_time else None
+        self.wall_s = wall_s * scale if wall_s else None
+        self.stall_cycles = int(stall_cycles * scale) if stall_cycles else None
+        self.progress = [getattr(dut, name) for name in progress]
+        self.clk = getattr(dut, clock, None)
+        self.monitors = []
+        self.start = None
+
+    def _progress(self): # Anything that changes when the design moves forward
+        return (
+            sum(m.handshakes() for m in self.monitors),
+            tuple(str(h.value) for h in self.progress),
+        )
+
+    async def _watch(self): # -> reason the watchdog fired
+        poll = min(POLL_CYCLES, max(self.stall_cycles // 4, 1)) if self.stall_cycles else POLL_CYCLES
+        last, idle = self._progress(), 0
+        while True:
+            await (ClockCycles(self.clk, poll) if self.clk is not None else Timer(*POLL_TIME))
+            if self.wall_s and time.monotonic() - self.start > self.wall_s:
+                return f"wall-time budget of {self.wall_s:g} s exceeded"
+            if self.stall_cycles and self.clk is not None:
+                now = self._progress()
+                idle = 0 if now != last else idle + poll
+                last = now
+                if idle >= self.stall_cycles:
+                    return f"no forward progress for {idle} cycles"
+
+    def report(self, reason):
+        lines = [f"watchdog: {reason} at {get_sim_time('ns'):g} ns ({time.monotonic() - self.start:.1f} s wall)"]
+        lines += [f"  {m.status()}" for m in self.monitors]
+        lines += [f"  {h._name} = {h.value}" for h in self.progress]
+        if not self.monitors and not self.progress:
+            lines.append("  no ready/valid interfaces or progress signals to report")
+        return "\n".join(lines)
+
+    async def run(self, coro):
+        self.start = time.monotonic()
+        _running.add(self)
+        attached = False
+        try: # Shared with @protocol_checked when both are used
+            self.monitors = attach_monitors(self.dut)
+            attached = True
+        except ValueError: # No RTL declaration or clock to discover interfaces from
+            pass
+        try:
+            test = cocotb.start_soon(coro)
+            watch = cocotb.start_soon(self._watch())
+            budget = [Timer(*self.sim_time)] if self.sim_time else []
+            await First(test, watch, *budget)
+            if test.done():
+                watch.cancel()
+                return test.result()
+            reason = watch.result() if watch.done() else f"sim-time budget of {self.sim_time[0]:g} {self.sim_time[1]} exceeded"
+            watch.cancel()
+            test.cancel()
+            report = self.report(reason)
+            self.dut._log.error(report)
+            raise AssertionError(report)
+        finally:
+            _running.discard(self)
+            if attached:
+                release_monitors()
+
+
+def restart_wall_clocks(): # Post-fork hook: a forked child (svtb.checkpoint) gets its own wall_s budget
+    now = time.monotonic()
+    for dog in _running:
+        dog.start = now
+
+
+def watchdog(sim_time=None, wall_s=None, stall_cycles=None, progress=(), clock="clk"):
+    # Decorator for cocotb tests, see the module comment for the budgets
+    def decorator(test_fn):
+        if os.environ.get(WATCHDOG_ENV, "1") == "0":
+            return test_fn
+
+        @functools.wraps(test_fn)
+        async def wrapper(dut, *args, **kwargs):
+            dog = Watchdog(dut, sim_time, wall_s, stall_cycles, progress, clock)
+            return await dog.run(test_fn(dut, *args, **kwargs))
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,179 @@
+# Failure-window waveform capture
+#
+# Instead of dumping the whole run, a ring buffer keeps the last N cycles of a chosen
+# signal set and writes them to a change-only VCD (FST if vcd2fst is available) only
+# when the test fails. Run the simulator with WAVES=0 so no full dump is produced.
+#
+#   @cocotb.test()
+#   @capture_on_failure(["PC_F", "PC_plus_4_F", "reg_PC.*"])
+#   async def test_x(dut): ...
+#
+# Signals are dotted paths relative to the toplevel; components may use fnmatch patterns,
+# and "**" matches any number of hierarchy levels (e.g. "**.rf.write_*").
+# Environment: WAVE_CAPTURE=0 disables capture, WAVE_DEPTH overrides the cycle count.
+import fnmatch
+import functools
+import os
+import shutil
+import subprocess
+from collections import deque
+from pathlib import Path
+
+import cocotb
+from cocotb.handle import HierarchyObject
+from cocotb.triggers import ReadOnly, RisingEdge
+from cocotb.utils import get_sim_time
+
+
+DEFAULT_DEPTH = 512
+
+# Signal sets for the RV32I pipeline, from stage level up to core level
+PC_SIGNALS = ["PC_F", "PC_plus_4_F", "PC_source_E", "**.PC_F", "**.PC_source_E"]
+PIPE_SIGNALS = ["**.pipe_*.valid_in", "**.pipe_*.ready_out", "**.pipe_*.valid_out", "**.pipe_*.ready_in", "**.pipe_*.q"]
+REGFILE_WRITE_SIGNALS = ["**.rf.write_enable", "**.rf.write_addr", "**.rf.write_data"]
+PIPELINE_SIGNALS = PC_SIGNALS + PIPE_SIGNALS + REGFILE_WRITE_SIGNALS
+
+
+# --- Helpers ---
+def _children(handle):
+    if not isinstance(handle, HierarchyObject):
+        return []
+    return list(handle)
+
+def _name(handle):
+    return handle._name.split(".")[-1]
+
+def resolve_signals(dut, patterns): # Patterns -> {dotted path: handle}, in pattern order
+    found = {}
+
+    def walk(handle, path, parts):
+        if not parts:
+            if not isinstance(handle, HierarchyObject) or path:
+                found.setdefault(".".join(path), handle)
+            return
+        head, rest = parts[0], parts[1:]
+        if head == "**":
+            walk(handle, path, rest)
+            for child in _children(handle):
+                walk(child, path + [_name(child)], parts)
+            return
+        if not any(c in head for c in "*?["):
+            try:
+                walk(getattr(handle, head), path + [head], rest)
+            except AttributeError:
+                pass
+            return
+        for child in _children(handle):
+            if fnmatch.fnmatchcase(_name(child), head):
+                walk(child, path + [_name(child)], rest)
+
+    for pattern in patterns:
+        walk(dut, [], pattern.split("."))
+    return {path: h for path, h in found.items() if not isinstance(h, HierarchyObject)}
+
+def _bits(value, width): # Sampled value -> VCD binary string
+    text = str(value)
+    if len(text) == width and set(text) <= set("01xXzZuUwWlLhH-"):
+        return text.lower().replace("u", "x").replace("w", "x").replace("-", "x").replace("l", "0").replace("h", "1")
+    try:
+        return format(int(value) & ((1 << width) - 1), f"0{width}b")
+    except (TypeError, ValueError):
+        return "x" * width
+
+def _vcd_id(index): # Short printable VCD identifiers: !, ", #, ...
+    chars = []
+    index += 1
+    while index:
+        index, r = divmod(index - 1, 94)
+        chars.append(chr(33 + r))
+    return "".join(chars)
+
+
+# --- Capture ---
+class WaveCapture:
+    def __init__(self, dut, signals, clock=None, depth=None):
+        self.dut = dut
+        self.clock = clock if clock is not None else dut.clk
+        self.depth = int(os.environ.get("WAVE_DEPTH", depth or DEFAULT_DEPTH))
+        self.handles = resolve_signals(dut, signals)
+        self.widths = {path: max(len(h), 1) if hasattr(h, "__len__") else 1 for path, h in self.handles.items()}
+        self.ring = deque(maxlen=self.depth) # (sim time ps, [raw values])
+        self._task = None
+
+    def __len__(self):
+        return len(self.ring)
+
+    def start(self):
+        self._task = cocotb.start_soon(self._sample())
+        return self
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _sample(self): # One snapshot per rising edge, after the design settles
+        handles = list(self.handles.values())
+        ring = self.ring
+        while True:
+            await RisingEdge(self.clock)
+            await ReadOnly()
+            ring.append((get_sim_time("ps"), [h.value for h in handles]))
+
+    def dump(self, path): # Write the buffered window as a change-only VCD, FST when possible
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        vcd = path.with_suffix(".vcd")
+        paths = list(self.handles)
+        ids = [_vcd_id(i) for i in range(len(paths) + 1)]
+        clk_id = ids[-1]
+        top = _name(self.dut)
+
+        with open(vcd, "w") as f:
+            f.write("$timescale 1ps $end\n")
+            f.write(f"$scope module {top} $end\n")
+            f.write(f"$var wire 1 {clk_id} capture_clk $end\n")
+            for p, i in zip(paths, ids):
+                f.write(f"$var wire {self.widths[p]} {i} {p.replace('.', '__')} $end\n")
+            f.write("$upscope $end\n$enddefinitions $end\n")
+
+            last = [None] * len(paths)
+            for n, (t, values) in enumerate(self.ring):
+                f.write(f"#{t}\n1{clk_id}\n")
+                for k, v in enumerate(values):
+                    bits = _bits(v, self.widths[paths[k]])
+                    if bits != last[k]:
+                        last[k] = bits
+                        f.write(f"{bits}{ids[k]}\n" if len(bits) == 1 else f"b{bits} {ids[k]}\n")
+                if n + 1 < len(self.ring):
+                    f.write(f"#{(t + self.ring[n + 1][0]) // 2}\n0{clk_id}\n")
+
+        if shutil.which("vcd2fst") and path.suffix == ".fst":
+            subprocess.run(["vcd2fst", str(vcd), str(path)], check=False, capture_output=True)
+            if path.exists():
+                vcd.unlink()
+                return path
+        return vcd
+
+
+def capture_on_failure(signals, clock="clk", depth=None, out_dir="waves", fmt="fst"):
+    # Decorator for cocotb tests: run a WaveCapture and dump it only if the test raises
+    def decorator(test_fn):
+        if os.environ.get("WAVE_CAPTURE", "1") == "0":
+            return test_fn
+
+        @functools.wraps(test_fn)
+        async def wrapper(dut, *args, **kwargs):
+            capture = WaveCapture(dut, signals, getattr(dut, clock), depth).start()
+            try:
+                await test_fn(dut, *args, **kwargs)
+            except Exception as e:
+                path = capture.dump(Path(out_dir) / f"{test_fn.__name__}.{fmt}")
+                dut._log.error(f"{type(e).__name__}: last {len(capture)} cycles written to {path}")
+                raise
+            finally:
+                capture.stop()
+
+        return wrapper
+
+    return decorator
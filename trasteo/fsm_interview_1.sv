@@ -10,7 +10,7 @@ module fsm_interview_1
     output logic idle
 );
 
-typedef struct 
+typedef enum logic [1:0]
 {
     IDLE = 2'b00,
     ENABLE = 2'b01,
@@ -19,23 +19,19 @@ typedef struct
 
 state_t current, next_state;
 
-always_ff @(posegde clk)
+always_ff @(posedge clk)
 begin
     if(!sync_rst)
-    {
         current <= IDLE;
-    }
     else
-    {
         current <= next_state;
-    }    
 end
 
 always_comb
 begin
     case (current)
-        IDLE : next_state = if(ip_enable == 1) ? ENABLE : IDLE;
-        ENABLE : next_state = if(req_disable == 1) ? DISABLE : ENABLE;
+        IDLE : next_state = (ip_enable == 1) ? ENABLE : IDLE;
+        ENABLE : next_state = (req_disable == 1) ? DISABLE : ENABLE;
         DISABLE : next_state = IDLE;
         default: next_state = current;
     endcase
@@ -43,21 +39,12 @@ end
 
 always_comb
 begin
+    idle = 0;
+    ack = 0;
     if(current == IDLE)
-    {
         idle = 1;
-        ack = 0;
-    }
-    else if(current == ENABLE)
-    {
-        idle = 0;
-        ack = 0;
-    }
     else if(current == DISABLE)
-    {
-        idle = 0;
         ack = 1;
-    }
 end
 
 endmodule
\ No newline at end of file